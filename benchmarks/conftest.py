@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.db.backends.utils import CursorWrapper
+from django.test.utils import CaptureQueriesContext
+
+from bulk_tracker.signals import (
+    post_create_signal,
+    post_delete_signal,
+    post_update_signal,
+)
+
+
+pytest.importorskip("pytest_benchmark")
+
+# 1M rows takes minutes per case, so the sizes above BENCHMARK_MAX_ROWS are skipped
+SIZES = [1, 100, 10_000, 100_000, 1_000_000]
+MAX_ROWS = int(os.environ.get("BENCHMARK_MAX_ROWS", "10000"))
+
+
+def sizes():
+    return [
+        pytest.param(size, marks=pytest.mark.skipif(size > MAX_ROWS, reason="BENCHMARK_MAX_ROWS")) for size in SIZES
+    ]
+
+
+@dataclass
+class Measurement:
+    queries: int = 0
+    rows: int = 0
+    peak_memory: int = 0
+
+
+@contextmanager
+def measure():
+    """
+    Count the queries, the rows read from the database, and the peak memory allocated by Python while running.
+    The rows are counted where the cursors are fetched, so they include the rows returned by RETURNING.
+    """
+    measurement = Measurement()
+
+    def counting(method):
+        def fetch(self, *args):
+            result = getattr(self.cursor, method)(*args)
+            if method == "fetchone":
+                measurement.rows += result is not None
+            else:
+                measurement.rows += len(result)
+            return result
+
+        return fetch
+
+    with ExitStack() as stack:
+        # CursorWrapper delegates the fetches to the database cursor through __getattr__
+        for method in ("fetchone", "fetchmany", "fetchall"):
+            stack.enter_context(patch.object(CursorWrapper, method, counting(method), create=True))
+        queries = stack.enter_context(CaptureQueriesContext(connection))
+        tracemalloc.start()
+        try:
+            yield measurement
+            measurement.peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    measurement.queries = len(queries.captured_queries)
+
+
+def _noop_receiver(sender, objects, **kwargs):
+    pass
+
+
+@pytest.fixture(params=[False, True], ids=["no-listeners", "listeners"])
+def listeners(request):
+    """Whether receivers are connected to the tracking signals of every model"""
+    if request.param:
+        for signal in (post_create_signal, post_update_signal, post_delete_signal):
+            signal.connect(_noop_receiver)
+    yield request.param
+    for signal in (post_create_signal, post_update_signal, post_delete_signal):
+        signal.disconnect(_noop_receiver)
+
+
+@pytest.fixture
+def run(benchmark, transactional_db):
+    """
+    Benchmark `operation(*setup())`: `setup` runs before each round and isn't timed.
+    One more round runs first to record the number of queries, the rows read and the peak memory in the report,
+    since tracing the allocations would skew the timings.
+    """
+
+    def run(setup, operation, rounds=5):
+        args = setup()
+        with measure() as measurement:
+            operation(*args)
+        benchmark.extra_info.update(
+            queries=measurement.queries,
+            rows=measurement.rows,
+            peak_memory=measurement.peak_memory,
+            vendor=connection.vendor,
+        )
+        benchmark.pedantic(operation, setup=lambda: (setup(), {}), rounds=rounds, iterations=1)
+
+    return run
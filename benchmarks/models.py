@@ -0,0 +1,36 @@
+from django.db import models
+
+from bulk_tracker.models import BulkTrackerModel
+from bulk_tracker.tracker import FieldTracker
+
+
+class Narrow(BulkTrackerModel):
+    name = models.CharField(max_length=100)
+    value = models.IntegerField(default=0)
+
+    tracker = FieldTracker()
+
+
+class Wide(BulkTrackerModel):
+    name = models.CharField(max_length=100)
+    value = models.IntegerField(default=0)
+    # 20 more columns, so the cost of reading whole rows shows up
+    for i in range(20):
+        locals()[f"text_{i}"] = models.CharField(max_length=100, default="x" * 50)
+    del i
+
+    tracker = FieldTracker()
+
+
+class Parent(BulkTrackerModel):
+    name = models.CharField(max_length=100)
+
+    tracker = FieldTracker()
+
+
+class Child(BulkTrackerModel):
+    parent = models.ForeignKey(Parent, on_delete=models.CASCADE, related_name="children")
+    name = models.CharField(max_length=100)
+    value = models.IntegerField(default=0)
+
+    tracker = FieldTracker()
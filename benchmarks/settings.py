@@ -0,0 +1,35 @@
+import os
+
+
+INSTALLED_APPS = (
+    "bulk_tracker",
+    "bulk_tracker.outbox",
+    "bulk_tracker.changelog",
+    "benchmarks",
+)
+
+# SQLite by default, set DB_ENGINE=postgresql and DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+# to run against a local PostgreSQL
+if os.environ.get("DB_ENGINE") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "bulk_tracker_benchmarks"),
+            "USER": os.environ.get("DB_USER", "postgres"),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", "localhost"),
+            "PORT": os.environ.get("DB_PORT", "5432"),
+        },
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        },
+    }
+SECRET_KEY = "dummy"
+
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+USE_TZ = False
@@ -0,0 +1,132 @@
+"""
+The cost of the tracked operations, with and without receivers, run with
+    pytest benchmarks --ds=benchmarks.settings
+see benchmarks/README.md
+"""
+from __future__ import annotations
+
+from itertools import count
+
+import pytest
+from django.db.models import F
+
+from benchmarks.conftest import sizes
+from benchmarks.models import Child, Narrow, Parent, Wide
+
+
+# a different value every round, so every row changes
+values = count(1)
+
+
+def populate(model, size):
+    model.objects.all()._raw_delete(model.objects.db)
+    # the receivers of post_create_signal aren't called, they aren't what is being measured here
+    return model._base_manager.bulk_create([model(name=f"row {i}") for i in range(size)], batch_size=10_000)
+
+
+def populate_children(size):
+    Parent.objects.all()._raw_delete(Parent.objects.db)
+    parents = Parent._base_manager.bulk_create([Parent(name=f"parent {i}") for i in range(max(size // 10, 1))])
+    Child._base_manager.bulk_create(
+        [Child(parent=parents[i % len(parents)], name=f"child {i}") for i in range(size)], batch_size=10_000
+    )
+
+
+models = pytest.mark.parametrize("model", [Narrow, Wide], ids=["narrow", "wide"])
+
+
+@models
+@pytest.mark.parametrize("size", sizes())
+def test_update(run, listeners, model, size):
+    def setup():
+        populate(model, size)
+        return (model.objects.all(),)
+
+    run(setup, lambda queryset: queryset.update(value=next(values)))
+
+
+@models
+@pytest.mark.parametrize("size", sizes())
+def test_update_with_expression(run, listeners, model, size):
+    def setup():
+        populate(model, size)
+        return (model.objects.all(),)
+
+    run(setup, lambda queryset: queryset.update(value=F("value") + 1))
+
+
+@models
+@pytest.mark.parametrize("size", sizes())
+def test_bulk_update(run, listeners, model, size):
+    def setup():
+        populate(model, size)
+        objs = list(model.objects.all())
+        value = next(values)
+        for obj in objs:
+            obj.value = value
+        return (objs,)
+
+    run(setup, lambda objs: model.objects.bulk_update(objs, ["value"]))
+
+
+@models
+@pytest.mark.parametrize("size", sizes())
+def test_bulk_create(run, listeners, model, size):
+    def setup():
+        model.objects.all()._raw_delete(model.objects.db)
+        return ([model(name=f"row {i}") for i in range(size)],)
+
+    run(setup, lambda objs: model.objects.bulk_create(objs, batch_size=10_000))
+
+
+@models
+@pytest.mark.parametrize("size", sizes())
+def test_delete(run, listeners, model, size):
+    def setup():
+        populate(model, size)
+        return (model.objects.all(),)
+
+    run(setup, lambda queryset: queryset.delete())
+
+
+@pytest.mark.parametrize("size", sizes())
+def test_cascade_delete(run, listeners, size):
+    """Delete the parents of `size` children, 10 per parent"""
+
+    def setup():
+        populate_children(size)
+        return (Parent.objects.all(),)
+
+    run(setup, lambda queryset: queryset.delete())
+
+
+@models
+@pytest.mark.parametrize("size", sizes())
+def test_load(run, listeners, model, size):
+    """Load the rows as instances without changing them, i.e. a list endpoint, which is what the tracker costs most"""
+
+    def setup():
+        populate(model, size)
+        return (model.objects.all(),)
+
+    run(setup, lambda queryset: list(queryset))
+
+
+@models
+def test_save(run, listeners, model):
+    def setup():
+        (obj,) = populate(model, 1)
+        obj = model.objects.get(pk=obj.pk)  # so the tracker knows its values
+        obj.value = next(values)
+        return (obj,)
+
+    run(setup, lambda obj: obj.save(), rounds=50)
+
+
+@models
+def test_delete_single(run, listeners, model):
+    def setup():
+        (obj,) = populate(model, 1)
+        return (model.objects.get(pk=obj.pk),)
+
+    run(setup, lambda obj: obj.delete(), rounds=50)
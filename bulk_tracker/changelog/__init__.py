@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import threading
+from functools import partial
+from itertools import groupby
+from typing import Any
+
+# aliased since the `apps` submodule of this package shadows it once loaded
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, NotSupportedError, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.utils import truncate_name
+from django.db.models import BinaryField, Field, Model
+
+from bulk_tracker.dispatch import send_signal
+from bulk_tracker.helper_objects import (
+    CREATE,
+    DELETE,
+    PAYLOAD_PKS,
+    UPDATE,
+    ModifiedObject,
+)
+from bulk_tracker.signals import (
+    post_create_signal,
+    post_delete_signal,
+    post_update_signal,
+)
+from bulk_tracker.utils import build_instance
+
+
+"""
+Change data capture: the rows written to the tables of the models in the `BULK_TRACKER_CHANGELOG_MODELS` setting
+are captured by database triggers into the `ChangeLogEntry` table, with their old and new values,
+instead of being read by the ORM around each operation.
+The triggers are installed by the `InstallChangeLogTriggers` migration operation, see `bulk_tracker.operations`,
+and write to the table of this app, `bulk_tracker.changelog`, which has to be in `INSTALLED_APPS`.
+The tracked operations on these models run as they would without receivers, and schedule `drain_changelog()`
+once their transaction is committed. The writes that bypass them, i.e. raw SQL, are sent by the next drain.
+The entries don't record the transaction that wrote them, so a drain sends every pending entry, including the ones
+committed by other transactions or processes, from the `on_commit()` of the transaction that scheduled it.
+"""
+
+SIGNALS = {CREATE: post_create_signal, UPDATE: post_update_signal, DELETE: post_delete_signal}
+
+# the drain running in the current thread, the operations of its receivers are sent by its next batch
+_state = threading.local()
+# the callback draining the changelog of each database once committed, kept to find out whether it's scheduled
+_drains: dict[str, partial] = {}
+
+
+def uses_changelog(model: type[Model]) -> bool:
+    """Whether the changes of `model` are captured by the changelog triggers instead of the ORM"""
+    return model._meta.label in getattr(settings, "BULK_TRACKER_CHANGELOG_MODELS", ())
+
+
+def get_changelog_fields(model: type[Model]) -> list[Field]:
+    """
+    The fields whose columns the triggers write to the changelog, the binary ones are left out
+    since they can't be written as JSON, their fields are deferred in the instances that are sent.
+    """
+    return [field for field in model._meta.concrete_fields if not isinstance(field, BinaryField)]
+
+
+def schedule_drain(using: str | None = None) -> None:
+    """Drain the changelog of `using` once its transaction is committed, once per transaction"""
+    using = using or DEFAULT_DB_ALIAS
+    if getattr(_state, "draining", False):
+        return
+    drain = _drains.setdefault(using, partial(drain_changelog, using=using))
+    connection = transaction.get_connection(using)
+    # a rolled back savepoint discards the drain it scheduled along with the rows it would have sent
+    if not any(entry[1] is drain for entry in connection.run_on_commit):
+        transaction.on_commit(drain, using=using)
+
+
+def drain_changelog(batch_size: int = 100, using: str = DEFAULT_DB_ALIAS, limit: int | None = None) -> int:
+    """
+    Send the entries of the changelog in id order, `batch_size` entries per transaction, and delete them once sent.
+    The consecutive entries of the same model and operation are sent with a single signal, without `tracking_info_`,
+    only the receivers of `post_update_signal` get the rows whose values didn't change, if they want `payload="pks"`.
+    Like `drain_outbox()`, the entries of a batch are locked with `select_for_update(skip_locked=True)`, and a batch
+    whose receiver raises is rolled back to be sent again.
+    The entries aren't limited to the ones of the transaction that scheduled the drain, any pending entry is sent.
+    Stops when the changelog is empty or after `limit` entries, returns the number of sent entries.
+    """
+    # imported here since the managers import this module, which may be imported before the models are loaded
+    from bulk_tracker.changelog.models import ChangeLogEntry
+
+    if batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer.")
+    sent = 0
+    _state.draining = True
+    try:
+        while limit is None or sent < limit:
+            size = batch_size if limit is None else min(batch_size, limit - sent)
+            with transaction.atomic(using=using):
+                entries = list(
+                    ChangeLogEntry.objects.using(using).select_for_update(skip_locked=True).order_by("id")[:size]
+                )
+                if not entries:
+                    break
+                for (label, operation), group in groupby(entries, key=lambda entry: (entry.model, entry.operation)):
+                    send_entries(global_apps.get_model(label), operation, list(group), using)
+                ChangeLogEntry.objects.using(using).filter(id__in=[entry.id for entry in entries]).delete()
+            sent += len(entries)
+            if len(entries) < size:  # the changelog is empty, unless written since
+                break
+    finally:
+        _state.draining = False
+    return sent
+
+
+def send_entries(model: type[Model], operation: str, entries: list, using: str) -> None:
+    """Send the signal of `operation` with the rows of `entries`, the way the ORM would have sent them"""
+    signal = SIGNALS[operation]
+    subscription = signal.get_subscription(model)
+    if subscription is None:
+        return
+    columns = {field.column: field for field in get_changelog_fields(model)}
+    objects = []
+    for entry in entries:
+        old = decode_values(columns, entry.old_values)
+        new = decode_values(columns, entry.new_values)
+        if operation != UPDATE:
+            objects.append(ModifiedObject(build_instance(model, using, new or old), {}))
+            continue
+        changed = {
+            attname: value
+            for attname, value in old.items()
+            if new.get(attname) != value and (subscription.fields is None or attname in subscription.fields)
+        }
+        if subscription.payload == PAYLOAD_PKS:
+            changed = {}
+        elif not changed:
+            continue
+        objects.append(ModifiedObject(build_instance(model, using, new), changed))
+    if objects:
+        send_signal(signal, model, objects, None)
+
+
+def decode_values(columns: dict[str, Any], values: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    The values of a row image written by the triggers, keyed by column, as Python values keyed by attname.
+    The columns without a field in `columns`, i.e. dropped since the triggers were installed, are skipped.
+    """
+    if values is None:
+        return {}
+    return {
+        columns[column].attname: columns[column].to_python(value)
+        for column, value in values.items()
+        if column in columns
+    }
+
+
+def get_trigger_names(connection: BaseDatabaseWrapper, table: str) -> list[str]:
+    """The names of the triggers of `table`, one per operation on SQLite, a single one on PostgreSQL"""
+    operations = (CREATE, UPDATE, DELETE) if connection.vendor == "sqlite" else ("changelog",)
+    return [
+        truncate_name(f"bulk_tracker_{table}_{operation}", connection.ops.max_name_length()) for operation in operations
+    ]
+
+
+def get_install_sql(connection: BaseDatabaseWrapper, model: type[Model], changelog_table: str) -> list[str]:
+    """The statements creating the triggers writing the rows of `model` to `changelog_table`, replacing the old ones"""
+    quote = connection.ops.quote_name
+    table = model._meta.db_table
+    label = model._meta.label.replace("'", "''")
+    columns = [field.column for field in get_changelog_fields(model)]
+    target = ", ".join(quote(column) for column in ("model", "operation", "old_values", "new_values"))
+    insert = f"INSERT INTO {quote(changelog_table)} ({target})"
+    statements = get_uninstall_sql(connection, model)
+
+    if connection.vendor == "sqlite":
+
+        def image(row: str) -> str:
+            return "json_object(" + ", ".join(f"'{column}', {row}.{quote(column)}" for column in columns) + ")"
+
+        images = {CREATE: ("NULL", image("NEW")), UPDATE: (image("OLD"), image("NEW")), DELETE: (image("OLD"), "NULL")}
+        events = {CREATE: "INSERT", UPDATE: "UPDATE", DELETE: "DELETE"}
+        for name, operation in zip(get_trigger_names(connection, table), (CREATE, UPDATE, DELETE)):
+            old, new = images[operation]
+            statements.append(
+                f"CREATE TRIGGER {quote(name)} AFTER {events[operation]} ON {quote(table)} FOR EACH ROW BEGIN "
+                f"{insert} VALUES ('{label}', '{operation}', {old}, {new}); END"
+            )
+        return statements
+
+    if connection.vendor == "postgresql":
+        (name,) = get_trigger_names(connection, table)
+        # the arguments of the trigger are the label of the model, then the columns left out of the row images
+        excluded = [
+            field.column.replace("'", "''") for field in model._meta.concrete_fields if field.column not in columns
+        ]
+        arguments = ", ".join(f"'{argument}'" for argument in [label, *excluded])
+        new, old = "to_jsonb(NEW) - TG_ARGV[1:]", "to_jsonb(OLD) - TG_ARGV[1:]"
+        statements.append(
+            "CREATE OR REPLACE FUNCTION bulk_tracker_changelog() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP = 'INSERT' THEN {insert} VALUES (TG_ARGV[0], '{CREATE}', NULL, {new}); "
+            f"ELSIF TG_OP = 'UPDATE' THEN {insert} VALUES (TG_ARGV[0], '{UPDATE}', {old}, {new}); "
+            f"ELSE {insert} VALUES (TG_ARGV[0], '{DELETE}', {old}, NULL); "
+            "END IF; RETURN NULL; END; $$ LANGUAGE plpgsql"
+        )
+        statements.append(
+            f"CREATE TRIGGER {quote(name)} AFTER INSERT OR UPDATE OR DELETE ON {quote(table)} "
+            f"FOR EACH ROW EXECUTE PROCEDURE bulk_tracker_changelog({arguments})"
+        )
+        return statements
+
+    raise NotSupportedError(
+        f"The changelog triggers are only supported on SQLite and PostgreSQL, not {connection.vendor}."
+    )
+
+
+def get_uninstall_sql(connection: BaseDatabaseWrapper, model: type[Model]) -> list[str]:
+    """The statements dropping the triggers of `model`"""
+    quote = connection.ops.quote_name
+    table = model._meta.db_table
+    if connection.vendor == "postgresql":
+        return [
+            f"DROP TRIGGER IF EXISTS {quote(name)} ON {quote(table)}" for name in get_trigger_names(connection, table)
+        ]
+    return [f"DROP TRIGGER IF EXISTS {quote(name)}" for name in get_trigger_names(connection, table)]
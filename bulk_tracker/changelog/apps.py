@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ChangeLogConfig(AppConfig):
+    """The opt-in app of the `ChangeLogEntry` table, needed by `BULK_TRACKER_CHANGELOG_MODELS`"""
+
+    name = "bulk_tracker.changelog"
+    label = "bulk_tracker_changelog"
+    verbose_name = "Bulk tracker changelog"
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from bulk_tracker.changelog import drain_changelog
+
+
+class Command(BaseCommand):
+    help = "Send the tracking signals of the rows written to the changelog by its triggers, i.e. with raw SQL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Number of entries sent per transaction.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="The database holding the changelog.")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the changelog instead of stopping once it is empty.",
+        )
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to wait between polls with --loop.")
+
+    def handle(self, *args, batch_size, database, loop, interval, **options):
+        while True:
+            sent = drain_changelog(batch_size=batch_size, using=database)
+            if sent:
+                self.stdout.write(f"Sent {sent} entries.")
+            if not loop:
+                return
+            time.sleep(interval)
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-16 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogEntry",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("model", models.CharField(max_length=255)),
+                ("operation", models.CharField(max_length=16)),
+                ("old_values", models.JSONField(null=True)),
+                ("new_values", models.JSONField(null=True)),
+            ],
+            options={
+                "ordering": ("id",),
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class ChangeLogEntry(models.Model):
+    """
+    A row written by the changelog triggers of a model in `BULK_TRACKER_CHANGELOG_MODELS`, with its old and new values
+    keyed by column, and sent later by `drain_changelog()`, see `bulk_tracker.changelog`.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=255)
+    operation = models.CharField(max_length=16)
+    old_values = models.JSONField(null=True)
+    new_values = models.JSONField(null=True)
+
+    class Meta:
+        ordering = ("id",)
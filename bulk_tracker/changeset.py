@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.db.models import Model
+
+from bulk_tracker.helper_objects import CREATE, DELETE, UPDATE, ModifiedObject
+
+
+if TYPE_CHECKING:
+    import numpy
+    import pandas
+
+
+class ChangeSet:
+    """
+    The rows of a tracked operation as columns, sent as the `changeset` argument to the receivers that connected
+    with `changeset=True`.
+    `pks` are the pks of the rows in the same order as the objects sent with the signal,
+    `old` and `new` are the values of each field before and after the operation, keyed by field then aligned with
+    `pks`. `old` is empty for created rows, and `new` is empty for deleted rows.
+    The rows that changed each field are indexed, i.e. `changeset.changed_rows("status")`.
+    """
+
+    __slots__ = ("model", "pks", "old", "new", "changed")
+
+    def __init__(
+        self,
+        model: type[Model],
+        pks: list[Any],
+        old: dict[str, list[Any]],
+        new: dict[str, list[Any]],
+        changed: dict[str, list[int]],
+    ):
+        self.model = model
+        self.pks = pks
+        self.old = old
+        self.new = new
+        self.changed = changed
+
+    @classmethod
+    def from_objects(cls, model: type[Model], objects: list[ModifiedObject], kind: str) -> ChangeSet:
+        """
+        The ChangeSet of objects that were already sent one by one, `kind` is "create", "update" or "delete".
+        The values that are not in `changed_values` are read from the instances, which are materialized.
+        """
+        pks = [modified_object.pk for modified_object in objects]
+        instances = [modified_object.instance for modified_object in objects]
+        if kind == UPDATE:
+            keys = list(dict.fromkeys(key for modified_object in objects for key in modified_object.changed_values))
+        else:
+            keys = [field.attname for field in model._meta.concrete_fields]
+        # the values of the fields that aren't loaded are unknown
+        keys = [key for key in keys if all(_attname(model, key) in instance.__dict__ for instance in instances)]
+        values = {key: [instance.__dict__[_attname(model, key)] for instance in instances] for key in keys}
+        if kind == CREATE:
+            return cls(model, pks, {}, values, {key: list(range(len(pks))) for key in keys})
+        if kind == DELETE:
+            return cls(model, pks, values, {}, {key: list(range(len(pks))) for key in keys})
+        old = {key: [] for key in keys}
+        changed = {key: [] for key in keys}
+        for row, modified_object in enumerate(objects):
+            for key in keys:
+                if key in modified_object.changed_values:
+                    old[key].append(modified_object.changed_values[key])
+                    changed[key].append(row)
+                else:
+                    old[key].append(values[key][row])
+        return cls(model, pks, old, values, changed)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def __repr__(self):
+        return f"<ChangeSet of {len(self)} {self.model.__name__} rows, fields={self.fields!r}>"
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self.changed)
+
+    def changed_rows(self, field: str) -> list[int]:
+        """The positions in `pks` of the rows whose `field` changed, given by name or attname"""
+        return self.changed.get(field) or self.changed.get(_attname(self.model, field), [])
+
+    def changed_pks(self, field: str) -> list[Any]:
+        """The pks of the rows whose `field` changed"""
+        return [self.pks[row] for row in self.changed_rows(field)]
+
+    def columns(self) -> dict[str, list[Any]]:
+        """The columns keyed as `pk`, `old__<field>` and `new__<field>`"""
+        columns = {"pk": self.pks}
+        columns.update((f"old__{field}", values) for field, values in self.old.items())
+        columns.update((f"new__{field}", values) for field, values in self.new.items())
+        return columns
+
+    def to_numpy(self) -> dict[str, numpy.ndarray]:
+        """The `columns()` as NumPy arrays, which requires numpy"""
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError("ChangeSet.to_numpy() requires numpy to be installed.") from e
+        return {name: numpy.asarray(values) for name, values in self.columns().items()}
+
+    def to_pandas(self) -> pandas.DataFrame:
+        """The `columns()` as a DataFrame indexed by pk, which requires pandas"""
+        try:
+            import pandas
+        except ImportError as e:
+            raise ImportError("ChangeSet.to_pandas() requires pandas to be installed.") from e
+        columns = self.columns()
+        index = pandas.Index(columns.pop("pk"), name="pk")
+        return pandas.DataFrame(columns, index=index)
+
+
+def _attname(model: type[Model], key: str) -> str:
+    return model._meta.get_field(key).attname
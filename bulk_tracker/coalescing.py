@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from functools import partial
+from threading import local
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Model
+from django.dispatch import Signal
+
+from bulk_tracker.dispatch import get_dispatcher
+from bulk_tracker.helper_objects import (
+    CREATE,
+    DELETE,
+    UPDATE,
+    ModifiedObject,
+    TrackingInfo,
+)
+from bulk_tracker.utils import build_instance
+
+
+_state = local()
+
+
+@dataclass
+class _Operation:
+    kind: str
+    signal: Signal
+    model: type[Model]
+    objects: list[ModifiedObject]
+    tracking_info_: TrackingInfo
+    committed: bool = False
+
+
+class CoalescingBuffer:
+    """
+    Collects the tracked operations of a transaction on one database,
+    and sends their net effect once per model, signal and `TrackingInfo` when the transaction is committed.
+    The `TrackingInfo`s are compared by value, but `dispatch`, so `TrackingInfo(coalesce=True)` can be given anew
+    to every operation. The operations given different ones aren't merged, their receivers get each one of them.
+
+    Every operation registers its own `on_commit` marker, so the operations that are rolled back with a savepoint
+    are dropped, and the buffer keeps its `flush()` as the last `on_commit` callback of the transaction.
+    """
+
+    def __init__(self, using: str | None):
+        self.using = using
+        self.operations: list[_Operation] = []
+
+    @classmethod
+    def get(cls, using: str | None = None) -> CoalescingBuffer:
+        """The buffer of the current transaction on `using`"""
+        buffers = _state.__dict__.setdefault("buffers", {})
+        buffer = buffers.get(using)
+        # a rolled back transaction discards the flush without calling it, leaving its buffer behind
+        if buffer is None or not buffer.is_pending():
+            buffer = buffers[using] = cls(using)
+        return buffer
+
+    def add(
+        self,
+        kind: str,
+        signal: Signal,
+        model: type[Model],
+        objects: list[ModifiedObject],
+        tracking_info_: TrackingInfo,
+    ) -> None:
+        operation = _Operation(kind, signal, model, objects, tracking_info_)
+        self.operations.append(operation)
+        transaction.on_commit(partial(setattr, operation, "committed", True), using=self.using)
+
+        connection = transaction.get_connection(self.using)
+        connection.run_on_commit = [entry for entry in connection.run_on_commit if entry[1] != self.flush]
+        transaction.on_commit(self.flush, using=self.using)
+        # the flush is not bound to the current savepoint, so rolling it back doesn't drop the operations before it
+        connection.run_on_commit[-1] = (set(), *connection.run_on_commit[-1][1:])
+
+    def is_pending(self) -> bool:
+        return any(entry[1] == self.flush for entry in transaction.get_connection(self.using).run_on_commit)
+
+    def flush(self) -> None:
+        effects: list[tuple[tuple, NetEffect]] = []
+        for operation in self.operations:
+            if not operation.committed:
+                continue
+            # the TrackingInfos hold dicts and model instances, so they are compared instead of hashed
+            key = (operation.model, _get_values(operation.tracking_info_))
+            effect = next((effect for effect_key, effect in effects if effect_key == key), None)
+            if effect is None:
+                effect = NetEffect(operation.model, operation.tracking_info_)
+                effects.append((key, effect))
+            effect.add(operation.kind, operation.signal, operation.objects)
+        self.operations = []
+        for _key, effect in effects:
+            effect.send()
+
+
+def _get_values(tracking_info_: TrackingInfo) -> tuple:
+    """The values of the fields of `tracking_info_` but `dispatch`, which only decides how its signals are sent"""
+    return tuple(getattr(tracking_info_, field.name) for field in fields(tracking_info_) if field.name != "dispatch")
+
+
+class NetEffect:
+    """
+    The net effect of several operations on the rows of one model:
+    - create followed by updates is a create, of the created instance holding the updated values
+    - several updates are one update, keeping the oldest old value of every field,
+      and dropping the fields that got back to their old value
+    - update followed by delete is a delete
+    - create followed by delete is nothing
+    """
+
+    def __init__(self, model: type[Model], tracking_info_: TrackingInfo):
+        self.model = model
+        self.tracking_info_ = tracking_info_
+        self.rows: dict[Any, tuple[str, ModifiedObject]] = {}
+        self.signals: dict[str, Signal] = {}
+        # objects created on a database that doesn't return their pks can't be matched with later operations
+        self.created_without_pk: list[ModifiedObject] = []
+
+    def add(self, kind: str, signal: Signal, objects: list[ModifiedObject]) -> None:
+        self.signals[kind] = signal
+        for modified_object in objects:
+            pk = modified_object.pk
+            if pk is None:
+                self.created_without_pk.append(modified_object)
+                continue
+            previous_kind, previous = self.rows.get(pk, (None, None))
+            if kind == DELETE and previous_kind == CREATE:
+                del self.rows[pk]
+            elif kind == UPDATE and previous_kind == CREATE:
+                self.rows[pk] = (CREATE, ModifiedObject(self._apply_update(previous.instance, modified_object), {}))
+            elif kind == UPDATE and previous_kind == UPDATE:
+                changed_values = {**modified_object.changed_values, **previous.changed_values}
+                instance = modified_object.instance
+                changed_values = {
+                    key: old_value
+                    for key, old_value in changed_values.items()
+                    if not self._has_value(instance, key, old_value)
+                }
+                if changed_values:
+                    self.rows[pk] = (UPDATE, modified_object.with_changed_values(changed_values))
+                else:
+                    del self.rows[pk]
+            else:
+                self.rows[pk] = (kind, modified_object)
+
+    def _apply_update(self, instance: Model, modified_object: ModifiedObject) -> Model:
+        # the updated instance may only hold the updated fields, the created one holds all of them
+        values = self._get_loaded_values(instance)
+        values.update(self._get_loaded_values(modified_object.instance))
+        return build_instance(self.model, instance._state.db, values)
+
+    def _get_loaded_values(self, instance: Model) -> dict[str, Any]:
+        return {
+            field.attname: instance.__dict__[field.attname]
+            for field in self.model._meta.concrete_fields
+            if field.attname in instance.__dict__
+        }
+
+    @staticmethod
+    def _has_value(instance: Model, key: str, value: Any) -> bool:
+        # only compare loaded values, reading a deferred field would hit the database
+        attname = instance._meta.get_field(key).attname
+        return attname in instance.__dict__ and instance.__dict__[attname] == value
+
+    def send(self) -> None:
+        for kind in (CREATE, UPDATE, DELETE):
+            objects = [modified_object for row_kind, modified_object in self.rows.values() if row_kind == kind]
+            if kind == CREATE:
+                objects = self.created_without_pk + objects
+            if not objects:
+                continue
+            get_dispatcher(self.tracking_info_).dispatch(self.signals[kind], self.model, objects, self.tracking_info_)
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from copy import deepcopy
+from functools import reduce
+from operator import or_
 
 from _operator import attrgetter
 from django.db import transaction
-from django.db.models import signals, sql
+from django.db.models import QuerySet, signals, sql
 from django.db.models.deletion import Collector
 
-from bulk_tracker.helper_objects import TrackingInfo
+from bulk_tracker.changelog import schedule_drain, uses_changelog
+from bulk_tracker.helper_objects import DELETE, TrackingInfo
+from bulk_tracker.instrumentation import CAPTURE, registry
+from bulk_tracker.queries import delete_by_pks, raw_delete_capturing, update_by_pks
 from bulk_tracker.signals import post_delete_signal, send_post_delete_signal
+from bulk_tracker.utils import (
+    build_detached_instance,
+    get_snapshot_attnames,
+    snapshot_instance,
+)
 
 
 class BulkTrackerCollector(Collector):
@@ -31,13 +40,16 @@ class BulkTrackerCollector(Collector):
             instance = list(instances)[0]
             if self.can_fast_delete(instance):
                 to_be_deleted = None
-                if post_delete_signal.has_listeners(model):
-                    to_be_deleted = deepcopy(instance)
+                subscription = _get_subscription(model)
+                if subscription:
+                    with registry.phase(CAPTURE, model, DELETE, self.using):
+                        to_be_deleted = snapshot_instance(instance, subscription.instance_fields)
                 with transaction.mark_for_rollback_on_error(self.using):
                     count = sql.DeleteQuery(model).delete_batch([instance.pk], self.using)
                 if to_be_deleted:
-                    send_post_delete_signal([to_be_deleted], model, tracking_info_)
+                    send_post_delete_signal([to_be_deleted], model, tracking_info_, using=self.using)
                 setattr(instance, model._meta.pk.attname, None)
+                self._schedule_changelog_drain()
                 return count, {model._meta.label: count}
 
         with transaction.atomic(using=self.using, savepoint=False):
@@ -56,18 +68,29 @@ class BulkTrackerCollector(Collector):
             bulk_tracker_deletes = defaultdict(list)
             # fast deletes
             for qs in self.fast_deletes:
-                if post_delete_signal.has_listeners(qs.model):
-                    bulk_tracker_deletes[qs.model].extend(deepcopy(qs))
-
-                count = qs._raw_delete(using=self.using)
+                subscription = _get_subscription(qs.model)
+                if subscription:
+                    # keep the single statement of the fast delete, reading the deleted rows with RETURNING if possible
+                    attnames = get_snapshot_attnames(qs.model, subscription.instance_fields)
+                    # the capture is the DELETE itself with RETURNING, so its queries aren't counted as extra ones
+                    with registry.phase(CAPTURE, qs.model, DELETE, self.using, count_queries=False):
+                        count, rows = raw_delete_capturing(qs, attnames, self.using)
+                        bulk_tracker_deletes[qs.model].extend(
+                            build_detached_instance(qs.model, self.using, dict(zip(attnames, row))) for row in rows
+                        )
+                else:
+                    count = qs._raw_delete(using=self.using)
                 if count:
                     deleted_counter[qs.model._meta.label] += count
 
             # update fields
-            for model, instances_for_fieldvalues in self.field_updates.items():
-                for (field, value), instances in instances_for_fieldvalues.items():
-                    query = sql.UpdateQuery(model)
-                    query.update_batch([obj.pk for obj in instances], {field.name: value}, self.using)
+            for field, value, querysets, instances in self._get_field_updates():
+                if querysets:
+                    # a plain update, like the one of the instances
+                    QuerySet.update(reduce(or_, querysets), **{field.name: value})
+                if instances:
+                    pks = list({obj.pk: None for obj in instances})
+                    update_by_pks(type(instances[0]), pks, {field.name: value}, self.using)
 
             # reverse instance collections
             for instances in self.data.values():
@@ -75,13 +98,15 @@ class BulkTrackerCollector(Collector):
 
             # delete instances
             for model, instances in self.data.items():
-                query = sql.DeleteQuery(model)
                 pk_list = [obj.pk for obj in instances]
-                count = query.delete_batch(pk_list, self.using)
+                count = delete_by_pks(model, pk_list, self.using)
                 if count:
                     deleted_counter[model._meta.label] += count
-                if post_delete_signal.has_listeners(model):
-                    bulk_tracker_deletes[model].extend(deepcopy(instances))
+                subscription = _get_subscription(model)
+                if subscription:
+                    attnames = subscription.instance_fields
+                    with registry.phase(CAPTURE, model, DELETE, self.using):
+                        bulk_tracker_deletes[model].extend(snapshot_instance(obj, attnames) for obj in instances)
 
                 if not model._meta.auto_created:
                     origin = {}
@@ -95,14 +120,50 @@ class BulkTrackerCollector(Collector):
                             **origin,
                         )
             for model, objs in bulk_tracker_deletes.items():
-                send_post_delete_signal(objs, model, tracking_info_)
+                send_post_delete_signal(objs, model, tracking_info_, using=self.using)
 
         # update collected instances
-        for instances_for_fieldvalues in self.field_updates.values():
-            for (field, value), instances in instances_for_fieldvalues.items():
-                for obj in instances:
-                    setattr(obj, field.attname, value)
+        for field, value, _querysets, instances in self._get_field_updates():
+            for obj in instances:
+                setattr(obj, field.attname, value)
         for model, instances in self.data.items():
             for instance in instances:
                 setattr(instance, model._meta.pk.attname, None)
+        self._schedule_changelog_drain()
         return sum(deleted_counter.values()), dict(deleted_counter)
+
+    def _get_field_updates(self):
+        """
+        The field updates as `(field, value, querysets, instances)`.
+        They are stored as `{model: {(field, value): instances}}` before Django 4.2, and as
+        `{(field, value): [instances or queryset, ...]}` since, where the querysets that weren't evaluated are updated
+        as a whole.
+        """
+        for key, updates in self.field_updates.items():
+            if not isinstance(key, tuple):
+                for (field, value), instances in updates.items():
+                    yield field, value, [], list(instances)
+                continue
+            field, value = key
+            querysets = []
+            instances = []
+            for objs in updates:
+                if isinstance(objs, QuerySet) and objs._result_cache is None:
+                    querysets.append(objs)
+                else:
+                    instances.extend(objs)
+            yield field, value, querysets, instances
+
+    def _schedule_changelog_drain(self) -> None:
+        """Send the rows deleted or updated in the models captured by the changelog triggers once committed"""
+        models = {*self.data, *(qs.model for qs in self.fast_deletes)}
+        models.update(field.model for field, *_updates in self._get_field_updates())
+        if any(uses_changelog(model) for model in models):
+            schedule_drain(self.using)
+
+
+def _get_subscription(model):
+    # the rows of the models captured by the changelog triggers are sent by `drain_changelog()`
+    if uses_changelog(model):
+        return None
+    return post_delete_signal.get_subscription(model)
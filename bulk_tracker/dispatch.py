@@ -0,0 +1,474 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import cProfile
+import io
+import logging
+import multiprocessing
+import pstats
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from threading import BoundedSemaphore, Condition, Lock, Thread
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Model
+from django.dispatch import Signal
+
+from bulk_tracker.changeset import ChangeSet
+from bulk_tracker.helper_objects import (
+    CREATE,
+    DELETE,
+    UPDATE,
+    ModifiedObject,
+    TrackingInfo,
+)
+from bulk_tracker.instrumentation import (
+    DEFAULT_BUCKETS,
+    DISPATCH,
+    PAYLOAD_OBJECTS,
+    PAYLOAD_VALUES,
+    Histogram,
+    registry,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+logger = logging.getLogger("bulk_tracker.dispatch")
+
+DISPATCH_INLINE = "inline"
+DISPATCH_THREAD = "thread"
+DISPATCH_PROCESS = "process"
+DISPATCH_ASYNCIO = "asyncio"
+DISPATCH_OUTBOX = "outbox"
+DISPATCH_PROFILE = "profile"
+
+# what a dispatcher does with a signal when `max_pending` signals are already waiting or running
+OVERFLOW_BLOCK = "block"  # wait for a slot
+OVERFLOW_DROP = "drop"  # log and drop the signal
+OVERFLOW_INLINE = "inline"  # send it in the calling thread
+OVERFLOWS = (OVERFLOW_BLOCK, OVERFLOW_DROP, OVERFLOW_INLINE)
+
+# the signals a process pool can send, they are passed to the worker processes by name
+SIGNAL_KINDS = {"post_create_signal": CREATE, "post_update_signal": UPDATE, "post_delete_signal": DELETE}
+SIGNAL_NAMES = tuple(SIGNAL_KINDS)
+
+
+def send_signal(
+    signal: Signal,
+    model: type[Model],
+    objects: list[ModifiedObject],
+    tracking_info_: TrackingInfo | None,
+    changeset: ChangeSet | None = None,
+    **kwargs,
+):
+    if tracking_info_ and tracking_info_.is_robust:
+        method = signal.send_robust
+    else:
+        method = signal.send
+    kwargs.update(_changeset_kwargs(signal, model, objects, changeset))
+    if not registry.enabled:
+        return method(sender=model, objects=objects, tracking_info_=tracking_info_, **kwargs)
+    kind = _record_payload(signal, model, objects)
+    with registry.phase(DISPATCH, model, kind):
+        return method(sender=model, objects=objects, tracking_info_=tracking_info_, **kwargs)
+
+
+async def asend_signal(
+    signal: Signal,
+    model: type[Model],
+    objects: list[ModifiedObject],
+    tracking_info_: TrackingInfo | None,
+    changeset: ChangeSet | None = None,
+):
+    robust = tracking_info_ and tracking_info_.is_robust
+    if hasattr(signal, "asend"):
+        method = signal.asend_robust if robust else signal.asend
+    else:  # `asend()` was added in Django 5.0
+        method = sync_to_async(signal.send_robust if robust else signal.send)
+    kwargs = _changeset_kwargs(signal, model, objects, changeset)
+    if not registry.enabled:
+        return await method(sender=model, objects=objects, tracking_info_=tracking_info_, **kwargs)
+    kind = _record_payload(signal, model, objects)
+    with registry.phase(DISPATCH, model, kind):
+        return await method(sender=model, objects=objects, tracking_info_=tracking_info_, **kwargs)
+
+
+def _record_payload(signal: Signal, model: type[Model], objects: list[ModifiedObject]) -> str:
+    kind = SIGNAL_KINDS[get_signal_name(signal)]
+    registry.record(PAYLOAD_OBJECTS, len(objects), model, kind)
+    registry.record(
+        PAYLOAD_VALUES, sum(len(modified_object.changed_values) for modified_object in objects), model, kind
+    )
+    return kind
+
+
+def _changeset_kwargs(signal: Signal, model: type[Model], objects: list[ModifiedObject], changeset: ChangeSet | None):
+    # the signals that didn't get a ChangeSet when their objects were built, i.e. the coalesced ones and the outbox,
+    # get one built from their objects if a receiver wants it
+    if changeset is None:
+        subscription = signal.get_subscription(model)
+        if subscription is None or not subscription.changeset:
+            return {}
+        changeset = ChangeSet.from_objects(model, objects, SIGNAL_KINDS[get_signal_name(signal)])
+    return {"changeset": changeset}
+
+
+class Dispatcher:
+    """
+    Sends the tracking signals once their operation is committed.
+    Subclass it and pass an instance as `TrackingInfo(dispatch=...)` to plug in another backend.
+    A `transactional` dispatcher is called right away in the transaction of the operation instead of on commit,
+    with the alias of its database as the `using` keyword argument.
+    """
+
+    transactional = False
+
+    def dispatch(
+        self,
+        signal: Signal,
+        model: type[Model],
+        objects: list[ModifiedObject],
+        tracking_info_: TrackingInfo | None,
+        changeset: ChangeSet | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait for the signals being sent, returns whether all of them were sent before `timeout`"""
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting signals, and if `wait`, drain the pending ones before returning"""
+
+
+class InlineDispatcher(Dispatcher):
+    """Sends the signals in the thread that committed the operation, this is the default"""
+
+    def dispatch(self, signal, model, objects, tracking_info_, changeset=None) -> None:
+        send_signal(signal, model, objects, tracking_info_, changeset)
+
+
+class BoundedDispatcher(Dispatcher):
+    """
+    Sends the signals off the committing thread, with at most `max_pending` of them waiting or running at once.
+    When they are all taken, `overflow` decides whether to block until one is sent, drop the signal,
+    or send it inline.
+    The receivers' exceptions are logged, since nobody is waiting for them.
+    """
+
+    def __init__(self, max_pending: int = 1000, overflow: str = OVERFLOW_BLOCK):
+        if max_pending <= 0:
+            raise ValueError("max_pending must be a positive integer.")
+        if overflow not in OVERFLOWS:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOWS)}, got {overflow!r}.")
+        self.overflow = overflow
+        self._slots = BoundedSemaphore(max_pending)
+        self._pending: set[Future] = set()
+        self._idle = Condition()
+        self._is_shutdown = False
+
+    def dispatch(self, signal, model, objects, tracking_info_, changeset=None) -> None:
+        if self._is_shutdown:
+            # signals committed while shutting down are still delivered
+            send_signal(signal, model, objects, tracking_info_, changeset)
+            return
+        if not self._slots.acquire(blocking=self.overflow == OVERFLOW_BLOCK):
+            if self.overflow == OVERFLOW_DROP:
+                logger.warning("Dropped %s of %s, the dispatcher is full", get_signal_name(signal), model.__name__)
+            else:
+                send_signal(signal, model, objects, tracking_info_, changeset)
+            return
+        try:
+            future = self._submit(signal, model, objects, tracking_info_, changeset)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._idle:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+
+    def _submit(self, signal, model, objects, tracking_info_, changeset) -> Future:
+        raise NotImplementedError
+
+    def _done(self, future: Future) -> None:
+        self._slots.release()
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Error sending a tracking signal", exc_info=future.exception())
+        with self._idle:
+            self._pending.discard(future)
+            self._idle.notify_all()
+
+    def drain(self, timeout: float | None = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout=timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._is_shutdown = True
+        if wait:
+            self.drain()
+
+
+class ThreadDispatcher(BoundedDispatcher):
+    """Sends the signals in a pool of `max_workers` threads"""
+
+    def __init__(self, max_workers: int | None = None, max_pending: int = 1000, overflow: str = OVERFLOW_BLOCK):
+        super().__init__(max_pending, overflow)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk_tracker")
+
+    def _submit(self, signal, model, objects, tracking_info_, changeset) -> Future:
+        return self.executor.submit(_send_in_worker, signal, model, objects, tracking_info_, changeset)
+
+    def shutdown(self, wait: bool = True) -> None:
+        super().shutdown(wait)
+        self.executor.shutdown(wait=wait)
+
+
+class ProcessDispatcher(BoundedDispatcher):
+    """
+    Sends the signals in a pool of `max_workers` processes, for receivers doing CPU heavy work.
+    The processes are spawned and set Django up from `DJANGO_SETTINGS_MODULE`, so the receivers they run are
+    the ones connected when the apps are loaded, i.e. in `AppConfig.ready()`.
+    The objects and the `TrackingInfo` are pickled, the signal and the model are passed by name,
+    and a `dispatch` given as a `Dispatcher`, which holds locks and pools, is dropped from the `TrackingInfo`.
+    """
+
+    def __init__(self, max_workers: int | None = None, max_pending: int = 1000, overflow: str = OVERFLOW_BLOCK):
+        super().__init__(max_pending, overflow)
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"), initializer=_setup_process
+        )
+
+    def _submit(self, signal, model, objects, tracking_info_, changeset) -> Future:
+        if tracking_info_ is not None and isinstance(tracking_info_.dispatch, Dispatcher):
+            tracking_info_ = replace(tracking_info_, dispatch=None)
+        return self.executor.submit(
+            _send_in_process, get_signal_name(signal), model._meta.label, objects, tracking_info_, changeset
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        super().shutdown(wait)
+        self.executor.shutdown(wait=wait)
+
+
+class AsyncioDispatcher(BoundedDispatcher):
+    """
+    Sends the signals with `asend()` on an event loop running in its own thread,
+    so the async receivers of all the signals run concurrently.
+    """
+
+    def __init__(self, max_pending: int = 1000, overflow: str = OVERFLOW_BLOCK):
+        super().__init__(max_pending, overflow)
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self.loop.run_forever, name="bulk_tracker_loop", daemon=True)
+        self.thread.start()
+
+    def _submit(self, signal, model, objects, tracking_info_, changeset) -> Future:
+        return asyncio.run_coroutine_threadsafe(
+            asend_signal(signal, model, objects, tracking_info_, changeset), self.loop
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        super().shutdown(wait)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if wait:
+            self.thread.join()
+
+
+class ProfilingDispatcher(Dispatcher):
+    """
+    Sends the signals in the committing thread like `InlineDispatcher`, calling the receivers one by one
+    to time each of them. Their durations are observed in `histograms`, keyed by receiver name,
+    and recorded as `receiver_seconds` in the instrumentation registry.
+    A call taking more than `budget` seconds is passed to `on_slow(receiver_name, duration, signal, model, objects)`,
+    or logged as a warning if it isn't given.
+    With `profile`, the receivers that were over budget are run under cProfile from then on, and the statistics
+    of their calls that are over budget again are kept in `profiles` and logged.
+    """
+
+    def __init__(
+        self,
+        budget: float | None = 0.1,
+        on_slow: Callable[..., None] | None = None,
+        profile: bool = False,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.budget = budget
+        self.on_slow = on_slow
+        self.profile = profile
+        self.buckets = buckets
+        self.lock = Lock()
+        self.histograms: dict[str, Histogram] = {}
+        self.profiles: dict[str, pstats.Stats] = {}
+        self.slow_receivers: set[str] = set()
+
+    def dispatch(self, signal, model, objects, tracking_info_, changeset=None) -> list:
+        named = {"objects": objects, "tracking_info_": tracking_info_}
+        named.update(_changeset_kwargs(signal, model, objects, changeset))
+        robust = tracking_info_ and tracking_info_.is_robust
+        if not registry.enabled:
+            return self._send(signal, model, named, robust)
+        kind = _record_payload(signal, model, objects)
+        with registry.phase(DISPATCH, model, kind):
+            return self._send(signal, model, named, robust)
+
+    def _send(self, signal: Signal, model: type[Model], named: dict, robust: bool) -> list:
+        """`signal.send()`, or `signal.send_robust()` if `robust`, timing every receiver"""
+        responses = []
+        for receiver in _get_live_receivers(signal, model):
+            try:
+                response = self._call(receiver, signal, model, named)
+            except Exception as err:
+                if not robust:
+                    raise
+                logger.error("Error calling %s in ProfilingDispatcher", get_receiver_name(receiver), exc_info=err)
+                response = err
+            responses.append((receiver, response))
+        return responses
+
+    def _call(self, receiver, signal: Signal, model: type[Model], named: dict):
+        name = get_receiver_name(receiver)
+        profiler = cProfile.Profile() if self.profile and name in self.slow_receivers else None
+        call = async_to_sync(receiver) if asyncio.iscoroutinefunction(receiver) else receiver
+        start = perf_counter()
+        try:
+            if profiler is None:
+                return call(signal=signal, sender=model, **named)
+            return profiler.runcall(call, signal=signal, sender=model, **named)
+        finally:
+            duration = perf_counter() - start
+            self._observe(name, duration, signal, model, named["objects"], profiler)
+
+    def _observe(self, name: str, duration: float, signal, model, objects, profiler: cProfile.Profile | None) -> None:
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+        histogram.observe(duration)
+        if registry.enabled:
+            registry.record("receiver_seconds", duration, model, SIGNAL_KINDS[get_signal_name(signal)], receiver=name)
+        if self.budget is None or duration <= self.budget:
+            return
+
+        self.slow_receivers.add(name)
+        if profiler is not None:
+            stats = self.profiles[name] = pstats.Stats(profiler, stream=io.StringIO())
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(20)
+            logger.warning("Profile of %s, which took %.3fs:\n%s", name, duration, stats.stream.getvalue())
+        if self.on_slow is not None:
+            self.on_slow(name, duration, signal, model, objects)
+        else:
+            logger.warning(
+                "%s took %.3fs for %d %s objects, over the budget of %.3fs.",
+                name,
+                duration,
+                len(objects),
+                model._meta.label,
+                self.budget,
+            )
+
+
+def _get_live_receivers(signal: Signal, sender: type[Model]) -> list:
+    receivers = signal._live_receivers(sender)
+    if isinstance(receivers, tuple):  # Django 5.0+ keeps the sync and the async receivers apart
+        sync_receivers, async_receivers = receivers
+        return [*sync_receivers, *async_receivers]
+    return receivers
+
+
+def get_receiver_name(receiver) -> str:
+    """The dotted path of a receiver, i.e. `myapp.receivers.on_post_update`"""
+    return f"{getattr(receiver, '__module__', None)}.{getattr(receiver, '__qualname__', repr(receiver))}"
+
+
+def _outbox_dispatcher(**options) -> Dispatcher:
+    # the outbox needs the models, which can't be imported before the apps are loaded
+    from bulk_tracker.outbox import OutboxDispatcher
+
+    return OutboxDispatcher(**options)
+
+
+DISPATCHERS: dict[str, Callable[..., Dispatcher]] = {
+    DISPATCH_INLINE: InlineDispatcher,
+    DISPATCH_THREAD: ThreadDispatcher,
+    DISPATCH_PROCESS: ProcessDispatcher,
+    DISPATCH_ASYNCIO: AsyncioDispatcher,
+    DISPATCH_OUTBOX: _outbox_dispatcher,
+    DISPATCH_PROFILE: ProfilingDispatcher,
+}
+
+_dispatchers: dict[str, Dispatcher] = {}
+_dispatchers_lock = Lock()
+
+
+def get_dispatcher(tracking_info_: TrackingInfo | None = None) -> Dispatcher:
+    """
+    The dispatcher of an operation, `TrackingInfo(dispatch=...)` if given,
+    otherwise the `BULK_TRACKER_DISPATCH` setting, which defaults to "inline".
+    The dispatchers are created on first use with the options of their mode in `BULK_TRACKER_DISPATCHERS`,
+    i.e. `BULK_TRACKER_DISPATCHERS = {"thread": {"max_workers": 4, "max_pending": 100, "overflow": "drop"}}`
+    """
+    mode = tracking_info_.dispatch if tracking_info_ and tracking_info_.dispatch else None
+    if isinstance(mode, Dispatcher):
+        return mode
+    mode = mode or getattr(settings, "BULK_TRACKER_DISPATCH", DISPATCH_INLINE)
+    try:
+        return _dispatchers[mode]
+    except KeyError:
+        pass
+    if mode not in DISPATCHERS:
+        raise ValueError(f"dispatch must be one of {', '.join(DISPATCHERS)} or a Dispatcher, got {mode!r}.")
+    with _dispatchers_lock:
+        if mode not in _dispatchers:
+            options = getattr(settings, "BULK_TRACKER_DISPATCHERS", {}).get(mode, {})
+            _dispatchers[mode] = DISPATCHERS[mode](**options)
+        return _dispatchers[mode]
+
+
+@atexit.register
+def shutdown_dispatchers(wait: bool = True) -> None:
+    """Drain and stop the dispatchers that were created, this is called when the interpreter exits"""
+    with _dispatchers_lock:
+        dispatchers = list(_dispatchers.values())
+        _dispatchers.clear()
+    for dispatcher in dispatchers:
+        dispatcher.shutdown(wait=wait)
+
+
+def get_signal_name(signal: Signal) -> str:
+    """The name of a tracking signal in `bulk_tracker.signals`"""
+    from bulk_tracker import signals
+
+    for name in SIGNAL_NAMES:
+        if getattr(signals, name) is signal:
+            return name
+    raise ValueError(f"{signal!r} is not one of the tracking signals.")
+
+
+def _send_in_worker(signal, model, objects, tracking_info_, changeset):
+    try:
+        return send_signal(signal, model, objects, tracking_info_, changeset)
+    finally:
+        # the worker threads are not request threads, nothing else closes the connections the receivers open
+        close_old_connections()
+
+
+def _setup_process() -> None:
+    import django
+
+    django.setup()
+
+
+def _send_in_process(signal_name: str, model_label: str, objects: list[ModifiedObject], tracking_info_, changeset):
+    from bulk_tracker import signals
+
+    signal = getattr(signals, signal_name)
+    _send_in_worker(signal, apps.get_model(model_label), objects, tracking_info_, changeset)
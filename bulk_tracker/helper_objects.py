@@ -1,20 +1,96 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from django.db import models
 from django.db.models import Model
 
 
+if TYPE_CHECKING:
+    from bulk_tracker.dispatch import Dispatcher
+    from bulk_tracker.loaders import InstanceLoader
+    from bulk_tracker.predicates import Predicate
+
 _T = TypeVar("_T", bound=models.Model)
 User = TypeVar("User", bound=models.Model)
 
+# the kinds of tracked operations
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+PAYLOAD_PKS = "pks"
+PAYLOAD_DIFF = "diff"
+PAYLOAD_INSTANCES = "instances"
+# from the lightest to the heaviest
+PAYLOADS = (PAYLOAD_PKS, PAYLOAD_DIFF, PAYLOAD_INSTANCES)
+
 
-@dataclass
 class ModifiedObject(Generic[_T]):
-    instance: _T
-    changed_values: dict[str, Any]
+    """
+    An object affected by a tracked operation, with the old values of its changed fields in `changed_values`.
+    It can be built from its pk and a `loader` instead of its instance, which is then materialized the first time
+    it is accessed, so receivers that only read `changed_values` never pay for building the instances.
+    """
+
+    __slots__ = ("pk", "changed_values", "_instance", "_loader")
+
+    def __init__(
+        self,
+        instance: _T | None = None,
+        changed_values: dict[str, Any] | None = None,
+        *,
+        pk: Any = None,
+        loader: InstanceLoader | None = None,
+    ):
+        if instance is None and loader is None:
+            raise TypeError("ModifiedObject() needs an instance or a loader.")
+        self._instance = instance
+        self._loader = loader
+        self.pk = pk if instance is None else instance.pk
+        self.changed_values = {} if changed_values is None else changed_values
+
+    @property
+    def instance(self) -> _T:
+        if self._instance is None:
+            self._instance = self._loader.load(self.pk)
+            self._loader = None
+        return self._instance
+
+    @instance.setter
+    def instance(self, instance: _T) -> None:
+        self._instance = instance
+        self._loader = None
+        self.pk = instance.pk
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    def with_changed_values(self, changed_values: dict[str, Any]) -> ModifiedObject[_T]:
+        """A copy of this object with other `changed_values`, sharing its instance or its loader"""
+        copy = self.__class__.__new__(self.__class__)
+        copy._instance = self._instance
+        copy._loader = self._loader
+        copy.pk = self.pk
+        copy.changed_values = changed_values
+        return copy
+
+    def __eq__(self, other):
+        if not isinstance(other, ModifiedObject):
+            return NotImplemented
+        return (self.instance, self.changed_values) == (other.instance, other.changed_values)
+
+    __hash__ = None
+
+    def __repr__(self):
+        instance = repr(self._instance) if self.is_loaded else f"<not loaded, pk={self.pk!r}>"
+        return f"ModifiedObject(instance={instance}, changed_values={self.changed_values!r})"
+
+    def __reduce__(self):
+        # the loaders hold querysets and connections, so the instance is materialized to be pickled
+        return self.__class__, (self.instance, self.changed_values)
 
 
 @dataclass
@@ -25,3 +101,52 @@ class TrackingInfo:
     system: str | None = None
     kwargs: dict[str, Any] = field(default_factory=dict)
     is_robust: bool = False
+    use_returning: bool = False
+    chunk_size: int | None = None
+    transaction_per_chunk: bool = False
+    coalesce: bool = False
+    dispatch: str | Dispatcher | None = None
+    use_update_from: bool = False
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """
+    What the receivers of a signal for one model declared they need, see `TrackerSignal.get_subscription()`.
+    `fields` are the attnames of the fields they declared, or None if any of them needs all the fields.
+    `payload` is the heaviest payload any of them declared:
+    - "pks": only the pks of the affected rows, `changed_values` is always empty
+    - "diff": the pks, the changed values, and the values of the fields they declared
+    - "instances": instances holding the values of all their fields
+    `changeset` is whether any of them wants the `ChangeSet` of the operation too.
+    `predicates` are the predicates of their rows if they all declared one, the other rows don't need to be tracked,
+    or None if any of them gets all the rows.
+    """
+
+    fields: frozenset[str] | None
+    payload: str
+    changeset: bool = False
+    predicates: tuple[Predicate, ...] | None = None
+
+    def is_interested(self, model: type[Model], kwargs: dict[str, Any]) -> bool:
+        """Whether any receiver needs to know about an update of the fields in `kwargs`"""
+        return self.fields is None or any(model._meta.get_field(key).attname in self.fields for key in kwargs)
+
+    def get_tracked(self, model: type[Model], kwargs: dict[str, Any]) -> dict[str, Any]:
+        """The items of `kwargs` whose old and new values have to be captured and diffed"""
+        if self.payload == PAYLOAD_PKS:
+            return {}
+        return {
+            key: value
+            for key, value in kwargs.items()
+            if self.fields is None or model._meta.get_field(key).attname in self.fields
+        }
+
+    @property
+    def instance_fields(self) -> frozenset[str] | None:
+        """The attnames the instances sent to the receivers must hold besides the pk, None for all of them"""
+        if self.payload == PAYLOAD_PKS:
+            return frozenset()
+        if self.payload == PAYLOAD_INSTANCES:
+            return None
+        return self.fields
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import logging
+import socket
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Any
+
+from django.db import connections
+from django.db.models import Model
+
+
+# the phases of a tracked operation that are timed, recorded as `<phase>_seconds`
+CAPTURE = "capture"
+DIFF = "diff"
+DISPATCH = "dispatch"
+
+"""
+The metrics recorded for each model and operation ("create", "update" or "delete"),
+tagged with the `database` alias of the operation, except the dispatch and payload ones recorded after its commit:
+- queries: the queries issued to capture the values of the rows, besides the operation itself
+- rows_captured: the rows whose values were captured
+- rows_changed: the rows sent with the signal
+- capture_seconds, diff_seconds, dispatch_seconds: the time spent capturing the values, diffing them,
+  and sending the signal to its receivers
+- payload_objects, payload_values: the objects sent with the signal and the changed values they hold
+"""
+QUERIES = "queries"
+ROWS_CAPTURED = "rows_captured"
+ROWS_CHANGED = "rows_changed"
+PAYLOAD_OBJECTS = "payload_objects"
+PAYLOAD_VALUES = "payload_values"
+
+
+class Sink:
+    """Receives the metrics of the tracked operations, add one with `registry.add_sink()`"""
+
+    def record(self, metric: str, value: float, tags: dict[str, str]) -> None:
+        raise NotImplementedError
+
+
+class MemorySink(Sink):
+    """Keeps the sum and the number of the recorded values of each metric and tags"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sums: dict[tuple[str, tuple], float] = defaultdict(float)
+        self.counts: dict[tuple[str, tuple], int] = defaultdict(int)
+
+    def record(self, metric: str, value: float, tags: dict[str, str]) -> None:
+        key = (metric, tuple(sorted(tags.items())))
+        with self.lock:
+            self.sums[key] += value
+            self.counts[key] += 1
+
+    def total(self, metric: str, **tags: str) -> float:
+        """The sum of the values of `metric` recorded with all of `tags`, i.e. `total("queries", model="app.Post")`"""
+        with self.lock:
+            return sum(
+                value
+                for (name, key_tags), value in self.sums.items()
+                if name == metric and tags.items() <= dict(key_tags).items()
+            )
+
+    def reset(self) -> None:
+        with self.lock:
+            self.sums.clear()
+            self.counts.clear()
+
+
+class LoggingSink(Sink):
+    """Logs every recorded value to the `bulk_tracker.metrics` logger"""
+
+    def __init__(self, logger: logging.Logger | str = "bulk_tracker.metrics", level: int = logging.DEBUG):
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+
+    def record(self, metric: str, value: float, tags: dict[str, str]) -> None:
+        if self.logger.isEnabledFor(self.level):
+            tags_str = " ".join(f"{key}={tag}" for key, tag in tags.items())
+            self.logger.log(self.level, "%s=%s %s", metric, value, tags_str)
+
+
+class StatsdSink(Sink):
+    """
+    Sends the recorded values to a statsd server over UDP, the durations as timers in milliseconds and
+    the others as counters. The tags are sent in the DogStatsD format, `|#model:app.Post,operation:update`.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 8125, prefix: str = "bulk_tracker"):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def record(self, metric: str, value: float, tags: dict[str, str]) -> None:
+        if metric.endswith("_seconds"):
+            line = f"{self.prefix}.{metric[: -len('_seconds')]}:{value * 1000:.3f}|ms"
+        else:
+            line = f"{self.prefix}.{metric}:{value:g}|c"
+        if tags:
+            line += "|#" + ",".join(f"{key}:{tag}" for key, tag in tags.items())
+        try:
+            self.socket.sendto(line.encode(), self.address)
+        except OSError:  # the metrics must never break the operation
+            pass
+
+
+class PrometheusSink(MemorySink):
+    """
+    Keeps the recorded values like `MemorySink`, and renders them in the Prometheus text format with `render()`,
+    the durations as summaries and the others as counters.
+    """
+
+    def __init__(self, prefix: str = "bulk_tracker"):
+        super().__init__()
+        self.prefix = prefix
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            metrics = sorted({metric for metric, _tags in self.sums})
+            for metric in metrics:
+                name = f"{self.prefix}_{metric}"
+                if metric.endswith("_seconds"):
+                    lines.append(f"# TYPE {name} summary")
+                    series = [("_sum", self.sums), ("_count", self.counts)]
+                else:
+                    lines.append(f"# TYPE {name}_total counter")
+                    series = [("_total", self.sums)]
+                for suffix, values in series:
+                    for (key_metric, tags), value in sorted(values.items()):
+                        if key_metric == metric:
+                            labels = ",".join(f'{key}="{tag}"' for key, tag in tags)
+                            lines.append(f"{name}{suffix}{{{labels}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+# the upper bounds of the buckets of `Histogram`, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    """
+    The number of observed values in each bucket, a value is counted in the first bucket whose upper bound is
+    greater than or equal to it, or in the last one, which has no bound.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.lock = threading.Lock()
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def __repr__(self):
+        return f"<Histogram count={self.count} sum={self.sum:g} max={self.max:g}>"
+
+    def observe(self, value: float) -> None:
+        with self.lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """The upper bound of the bucket holding the `q` quantile, or the maximum if it is in the last one"""
+        with self.lock:
+            rank = q * self.count
+            seen = 0
+            for bound, count in zip(self.buckets, self.counts):
+                seen += count
+                if count and seen >= rank:
+                    return bound
+            return self.max
+
+
+class InstrumentationRegistry:
+    """
+    Sends the metrics of the tracked operations to its sinks.
+    Nothing is measured while it has no sink, the hooks only check `enabled`.
+    """
+
+    def __init__(self):
+        self.sinks: list[Sink] = []
+        self.enabled = False
+
+    def add_sink(self, sink: Sink) -> None:
+        self.sinks.append(sink)
+        self.enabled = True
+
+    def remove_sink(self, sink: Sink) -> None:
+        self.sinks.remove(sink)
+        self.enabled = bool(self.sinks)
+
+    def record(self, metric: str, value: float, model: type[Model], operation: str, **tags: str) -> None:
+        tags = {"model": model._meta.label, "operation": operation, **tags}
+        for sink in self.sinks:
+            try:
+                sink.record(metric, value, tags)
+            except Exception:
+                logging.getLogger("bulk_tracker.metrics").exception("Error recording %s in %r", metric, sink)
+
+    def phase(
+        self, phase: str, model: type[Model], operation: str, using: str | None = None, count_queries: bool = True
+    ):
+        """
+        Time the code run in this context as `<phase>_seconds`,
+        and if `using` is given, tag it with the `database` and count the queries it runs on it as `queries`.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(phase, model, operation, using, count_queries)
+
+    @contextmanager
+    def _phase(
+        self, phase: str, model: type[Model], operation: str, using: str | None, count_queries: bool
+    ) -> Iterator[None]:
+        tags = {} if using is None else {"database": using}
+        counting = using is not None and count_queries
+        queries = 0
+
+        def count_query(execute, sql: str, params: Any, many: bool, context: dict):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = perf_counter()
+        with connections[using].execute_wrapper(count_query) if counting else nullcontext():
+            yield
+        self.record(f"{phase}_seconds", perf_counter() - start, model, operation, **tags)
+        if counting:
+            self.record(QUERIES, queries, model, operation, **tags)
+
+
+registry = InstrumentationRegistry()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from django.db.models import Model, QuerySet
+
+from bulk_tracker.queries import fetch_by_pks
+from bulk_tracker.utils import build_instance
+
+
+class InstanceLoader:
+    """Materializes the instances of the `ModifiedObject`s sharing it, the first time each of them is accessed"""
+
+    def load(self, pk: Any) -> Model:
+        raise NotImplementedError
+
+
+class ValuesLoader(InstanceLoader):
+    """
+    Builds the instances from values that are already known, keyed by pk then by attname,
+    the fields without a value are deferred. No query is made.
+    """
+
+    def __init__(self, model: type[Model], using: str, values: dict[Any, dict[str, Any]]):
+        self.model = model
+        self.using = using
+        self.values = values
+
+    def load(self, pk: Any) -> Model:
+        return build_instance(self.model, self.using, {self.model._meta.pk.attname: pk, **self.values[pk]})
+
+
+class DatabaseLoader(InstanceLoader):
+    """
+    Fetches the instances of `pks` from `queryset` in a single query, the first time any of them is accessed.
+    The instances hold the values the rows have when they are accessed, not when the operation ran.
+    """
+
+    def __init__(self, queryset: QuerySet, pks: Sequence[Any]):
+        self.queryset = queryset
+        self.pks = pks
+        self.instances: dict[Any, Model] | None = None
+
+    def load(self, pk: Any) -> Model:
+        if self.instances is None:
+            self.instances = {instance.pk: instance for instance in fetch_by_pks(self.queryset, self.pks)}
+        if pk in self.instances:
+            return self.instances[pk]
+        # the row was deleted in the meantime, only its pk is known
+        model = self.queryset.model
+        return build_instance(model, self.queryset.db, {model._meta.pk.attname: pk})
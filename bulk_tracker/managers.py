@@ -1,21 +1,59 @@
 from __future__ import annotations
 
-from django.db import connections, transaction
-from django.db.models import Expression, Manager, QuerySet
+import inspect
+from contextlib import nullcontext
+from functools import partial
+from typing import Any
+
+from django.db import connections, router, transaction
+from django.db.models import Expression, F, Field, Manager, QuerySet
 from django.db.models.expressions import Case, Value, When
 from django.db.models.functions import Cast
 
+from bulk_tracker.changelog import schedule_drain, uses_changelog
 from bulk_tracker.collector import BulkTrackerCollector
-from bulk_tracker.helper_objects import TrackingInfo
+from bulk_tracker.helper_objects import (
+    CREATE,
+    PAYLOAD_INSTANCES,
+    PAYLOAD_PKS,
+    UPDATE,
+    Subscription,
+    TrackingInfo,
+)
+from bulk_tracker.instrumentation import CAPTURE, DIFF, registry
+from bulk_tracker.predicates import get_capture_filter
+from bulk_tracker.queries import (
+    can_update_returning,
+    fetch_values_by_keys,
+    fetch_values_by_pks,
+    get_max_query_params,
+    staged_pks,
+    supports_update_from,
+    update_from_values,
+    update_returning,
+)
 from bulk_tracker.signals import (
+    post_create_signal,
     post_update_signal,
+    run_and_asend,
     send_post_create_signal,
-    send_post_update_signal,
+    send_post_update_signal_from_values,
+)
+from bulk_tracker.utils import (
+    get_key_values,
+    get_new_values,
+    get_old_values,
+    get_unique_keys,
+    get_update_fields,
 )
-from bulk_tracker.utils import get_old_values
 
 
 class BulkTrackerQuerySet(QuerySet):
+    @property
+    def _write_db(self) -> str:
+        """The database writes go to, `self.db` is only the write database once `_for_write` is set"""
+        return self._db or router.db_for_write(self.model, **self._hints)
+
     def update(self, *, tracking_info_: TrackingInfo | None = None, **kwargs):
         """
         This will be the single place for updating objects
@@ -23,29 +61,160 @@ class BulkTrackerQuerySet(QuerySet):
         because in my opinion they are bad practice, and prevent developers from supporting bulk operations
         instead this will send `post_update_signal` with all the changed objects and their old_values
 
-        if `post_update_signal` has listeners this will result in an extra 2 queries in order to retrieve the diff.
+        if `post_update_signal` has listeners this will result in an extra 2 queries in order to retrieve the diff,
+        or only 1 if all the values are literals, since the new values are known without asking the database.
+        Only the fields the receivers declared are captured, and if none of them is updated nothing is tracked.
+        With `TrackingInfo(use_returning=True)` on backends that support it, the old and new values are read
+        by the UPDATE statement itself, so no extra query is needed.
+        With `TrackingInfo(chunk_size=...)` the rows are captured, updated and diffed `chunk_size` rows at a time.
+        The models of `BULK_TRACKER_CHANGELOG_MODELS` are captured by their triggers, see `bulk_tracker.changelog`.
         """
-        signal_has_listener = post_update_signal.has_listeners(sender=self.model)
-        # if the model doesn't have any listener on this signal, don't bother doing anything
-        if not signal_has_listener:
+        if uses_changelog(self.model):
+            result = super().update(**kwargs)
+            schedule_drain(self.db)
+            return result
+        subscription = post_update_signal.get_subscription(self.model)
+        # if the model doesn't have any listener on this signal, or none of them is interested in the updated fields,
+        # don't bother doing anything
+        if subscription is None or not subscription.is_interested(self.model, kwargs):
             return super().update(**kwargs)
 
+        self._not_support_combined_queries("update")
+        if self.query.is_sliced:
+            raise TypeError("Cannot update a query once a slice has been taken.")
+        # the rows are captured from, and the chunks committed on, the database written to, not a read replica
+        self._for_write = True
+        if tracking_info_ and tracking_info_.chunk_size is not None:
+            return self._update_in_chunks(kwargs, subscription, tracking_info_)
+        result, _pks = self._tracked_update(kwargs, subscription, tracking_info_)
+        return result
+
+    def _tracked_update(
+        self, kwargs, subscription: Subscription, tracking_info_: TrackingInfo | None, limit: int | None = None
+    ):
+        """
+        Update this queryset and send `post_update_signal` with the diff,
+        or only the first `limit` rows of it in pk order if `limit` is given.
+        Returns the number of updated rows and the pks of the captured rows.
+        """
+        tracked = subscription.get_tracked(self.model, kwargs)
+        capture_filter = True
+        if limit is None and subscription.predicates is not None and not (tracking_info_ and tracking_info_.coalesce):
+            # every receiver filters the rows with a predicate, the ones none of them can match aren't captured
+            capture_filter = get_capture_filter(subscription.predicates, self.model, kwargs)
+            if capture_filter is False:
+                return super().update(**kwargs), []
+        if tracking_info_ and tracking_info_.use_returning and can_update_returning(self, kwargs):
+            # the captured rows are the updated ones, the predicates are only evaluated once their values are known
+            return self._update_returning(kwargs, tracked, subscription.payload, tracking_info_, limit)
+
         # if we have listeners:
-        # 1- we will consume the queryset
-        old_values = {}
-        pks = []
-        for obj in self:
-            pks.append(obj.pk)
-            old_values[obj.pk] = get_old_values(obj, kwargs)
+        # 1- we will capture the old values of the tracked fields only, or only the pks for `payload="pks"`
+        if limit is not None:
+            capture = self.order_by("pk")[:limit]
+        elif capture_filter is not True:
+            capture = self.filter(capture_filter)
+        else:
+            capture = self
+        with registry.phase(CAPTURE, self.model, UPDATE, self.db):
+            old_values = get_old_values(capture, tracked)
+        pks = list(old_values)
+
+        if limit is None:
+            result = super().update(**kwargs)
+        else:
+            result = 0
+            with staged_pks(self.db, self.model, pks) as lookups:
+                for lookup in lookups:
+                    result += super(BulkTrackerQuerySet, self.filter(pk__in=lookup)).update(**kwargs)
 
-        # 2- create a new queryset based on the PK.
+        # 2- if every value is a literal, the new values are already known.
+        # otherwise read the new values of the tracked fields based on the PK.
         # because the user may be updating the same value as the criteria which will lead to an empty queryset if we
         # loop on `self` again. i.e. `Post.objects.filter(title="The Midnight Wolf").update(title="The Sunset Wolf")`
-        queryset = self.model.objects.filter(pk__in=pks).only(*kwargs.keys())
+        new_values = get_new_values(self.model, tracked)
+        if new_values is not None:
+            new_values_by_pk = dict.fromkeys(pks, new_values)
+        elif pks:
+            attnames = [field.attname for field in get_update_fields(self.model, tracked).values()]
+            with registry.phase(CAPTURE, self.model, UPDATE, self.db):
+                new_values_by_pk = fetch_values_by_pks(self.model.objects.using(self.db), pks, attnames)
+        else:
+            new_values_by_pk = {}
+        # 3- the instances are only built when the receivers access them
+        send_post_update_signal_from_values(
+            self.model,
+            self.db,
+            old_values,
+            new_values_by_pk,
+            tracking_info_,
+            send_unchanged=subscription.payload == PAYLOAD_PKS,
+            queryset=self.model.objects.using(self.db) if subscription.payload == PAYLOAD_INSTANCES else None,
+        )
+        return result, pks
 
-        result = super().update(**kwargs)
-        send_post_update_signal(queryset, self.model, old_values, tracking_info_)
-        return result
+    def _update_returning(
+        self, kwargs, tracked, payload: str, tracking_info_: TrackingInfo | None, limit: int | None = None
+    ):
+        self._for_write = True
+        old_fields = list(get_update_fields(self.model, tracked).values())
+        if payload == PAYLOAD_INSTANCES:
+            new_fields = [field for field in self.model._meta.concrete_fields if not field.primary_key]
+        else:
+            new_fields = old_fields
+        if connections[self.db].features.has_select_for_update:
+            # the captured rows are locked with `FOR UPDATE`, which is only allowed inside a transaction
+            context = transaction.atomic(using=self.db, savepoint=False)
+        else:
+            context = transaction.mark_for_rollback_on_error(using=self.db)
+        # the capture is the UPDATE itself with RETURNING, so its queries aren't counted as extra ones
+        with context, registry.phase(CAPTURE, self.model, UPDATE, self.db, count_queries=False):
+            queryset = self if limit is None else self.order_by("pk")[:limit]
+            rows = update_returning(queryset, kwargs, old_fields, new_fields)
+        self._result_cache = None
+
+        old_attnames = [field.attname for field in old_fields]
+        attnames = [field.attname for field in new_fields]
+        old_values = {}
+        new_values = {}
+        for pk, old, new in rows:
+            old_values[pk] = dict(zip(old_attnames, old))
+            new_values[pk] = dict(zip(attnames, new))
+        send_post_update_signal_from_values(
+            self.model, self.db, old_values, new_values, tracking_info_, send_unchanged=payload == PAYLOAD_PKS
+        )
+        return len(rows), list(old_values)
+
+    def _update_in_chunks(self, kwargs, subscription: Subscription, tracking_info_: TrackingInfo):
+        """
+        Walk the queryset in pk order using keyset pagination, and capture, update and diff `chunk_size` rows
+        at a time, sending one `post_update_signal` per chunk.
+        Everything runs in a single transaction unless `TrackingInfo(transaction_per_chunk=True)`,
+        in which case each chunk is committed on its own and its signal is sent right after.
+        """
+        chunk_size = tracking_info_.chunk_size
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be a positive integer.")
+        if tracking_info_.transaction_per_chunk:
+            outer, inner = nullcontext, partial(transaction.atomic, using=self.db)
+        else:
+            outer, inner = partial(transaction.atomic, using=self.db), nullcontext
+
+        result = 0
+        queryset = self
+        with outer():
+            while True:
+                with inner():
+                    updated, pks = queryset._tracked_update(kwargs, subscription, tracking_info_, limit=chunk_size)
+                result += updated
+                if len(pks) < chunk_size:
+                    return result
+                # the rows of this chunk are excluded by their pk, whether they still match the filters or not
+                queryset = self.filter(pk__gt=max(pks))
+
+    async def aupdate(self, *, tracking_info_: TrackingInfo | None = None, **kwargs):
+        """The async `update()`, sending `post_update_signal` with `asend()`"""
+        return await run_and_asend(self._write_db, self.update, tracking_info_=tracking_info_, **kwargs)
 
     def create(self, *, tracking_info_: TrackingInfo | None = None, **kwargs):
         """
@@ -63,6 +232,12 @@ class BulkTrackerQuerySet(QuerySet):
     ) -> None:
         """
         Update the given fields in each of the given objects in the database.
+
+        if `post_update_signal` has listeners interested in the fields, the old values of all the objects are read
+        in a single query, and only the rows and fields that changed are written.
+        One `post_update_signal` is sent for the whole call, with the new values taken from the objects,
+        so the rows aren't read again after the update.
+        If any of the values is an expression, each batch is updated and tracked by `update()` instead.
         """
         if batch_size is not None and batch_size < 0:
             raise ValueError("Batch size must be a positive integer.")
@@ -78,10 +253,24 @@ class BulkTrackerQuerySet(QuerySet):
             raise ValueError("bulk_update() cannot be used with primary key fields.")
         if not objs:
             return
+        self._for_write = True
+        subscription = post_update_signal.get_subscription(self.model)
+        # the models captured by the changelog triggers are updated by `update()`, which schedules their drain
+        if (
+            subscription is not None
+            and not uses_changelog(self.model)
+            and subscription.is_interested(self.model, dict.fromkeys(f.attname for f in fields))
+        ):
+            new_values = self._get_bulk_update_values(objs, fields)
+            if new_values is not None:
+                self._tracked_bulk_update(new_values, fields, batch_size, subscription, tracking_info_)
+                return
+
         # PK is used twice in the resulting update query, once in the filter
         # and once in the WHEN. Each field will also have one CAST.
         max_batch_size = connections[self.db].ops.bulk_batch_size(["pk", "pk"] + fields, objs)
         batch_size = min(batch_size, max_batch_size) if batch_size else max_batch_size
+
         requires_casting = connections[self.db].features.requires_casted_case_in_updates
         batches = (objs[i : i + batch_size] for i in range(0, len(objs), batch_size))
         updates = []
@@ -101,9 +290,124 @@ class BulkTrackerQuerySet(QuerySet):
             updates.append(([obj.pk for obj in batch_objs], update_kwargs))
         with transaction.atomic(using=self.db, savepoint=False):
             for pks, update_kwargs in updates:
-                self.filter(pk__in=pks).update(tracking_info_=tracking_info_, **update_kwargs)
+                with staged_pks(self.db, self.model, pks) as lookups:
+                    for lookup in lookups:
+                        self.filter(pk__in=lookup).update(tracking_info_=tracking_info_, **update_kwargs)
+
+    def _get_bulk_update_values(self, objs, fields: list[Field]) -> dict[Any, dict[str, Any]] | None:
+        """
+        The values of `fields` of `objs` as they will be stored, `{pk: {attname: value}}`,
+        or None if any of them is an expression that is only known to the database.
+        If an object is given twice, the first one wins, the same as in the CASE statement.
+        """
+        new_values = {}
+        for obj in objs:
+            values = get_new_values(self.model, {field.attname: getattr(obj, field.attname) for field in fields})
+            if values is None:
+                return None
+            new_values.setdefault(obj.pk, values)
+        return new_values
 
-    def bulk_create(self, *args, tracking_info_: TrackingInfo | None = None, **kwargs):
+    def _tracked_bulk_update(
+        self,
+        new_values: dict[Any, dict[str, Any]],
+        fields: list[Field],
+        batch_size: int | None,
+        subscription: Subscription,
+        tracking_info_: TrackingInfo | None,
+    ) -> int:
+        """
+        Diff `new_values` against the values read in one query, update the changed fields of the changed rows
+        in batches of at most `batch_size` rows, and send a single `post_update_signal`.
+        The batches are CASE/WHEN statements, or `UPDATE ... FROM` a VALUES list with
+        `TrackingInfo(use_update_from=True)` where supported.
+        Returns the number of updated rows.
+        """
+        attnames = [field.attname for field in fields]
+        connection = connections[self.db]
+        use_update_from = (
+            tracking_info_ is not None
+            and tracking_info_.use_update_from
+            and supports_update_from(connection)
+            # multi-table inheritance updates touch more than one table, which can't be done in a single statement
+            and all(field.model._meta.concrete_model is self.model._meta.concrete_model for field in fields)
+        )
+        if use_update_from:
+            max_batch_size = get_max_query_params(connection) // (len(fields) + 1)
+        else:
+            # PK is used twice in the resulting update query, once in the filter
+            # and once in the WHEN. Each field will also have one CAST.
+            max_batch_size = connection.ops.bulk_batch_size(["pk", "pk"] + fields, list(new_values))
+        batch_size = min(batch_size, max_batch_size) if batch_size else max_batch_size
+
+        result = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            # the rows that don't match the queryset anymore are neither updated nor sent
+            with registry.phase(CAPTURE, self.model, UPDATE, self.db):
+                old_values = fetch_values_by_pks(self, list(new_values), attnames)
+            changed = {}  # {pk: attnames of the changed fields}
+            with registry.phase(DIFF, self.model, UPDATE, self.db, count_queries=False):
+                for pk, old in old_values.items():
+                    changed_attnames = {attname for attname in attnames if new_values[pk][attname] != old[attname]}
+                    if changed_attnames:
+                        changed[pk] = changed_attnames
+            changed_pks = list(changed)
+            for i in range(0, len(changed_pks), batch_size):
+                pks = changed_pks[i : i + batch_size]
+                batch_fields = [field for field in fields if any(field.attname in changed[pk] for pk in pks)]
+                if use_update_from:
+                    # every row of the batch gets all the fields, the ones that didn't change are set to the value
+                    # that was just read
+                    rows = [(pk, [new_values[pk][field.attname] for field in batch_fields]) for pk in pks]
+                    result += update_from_values(self.model, self.db, batch_fields, rows)
+                else:
+                    result += self._update_changed_fields(new_values, changed, pks, batch_fields)
+
+            tracked = subscription.get_tracked(self.model, dict.fromkeys(attnames))
+            send_post_update_signal_from_values(
+                self.model,
+                self.db,
+                {pk: {attname: old_values[pk][attname] for attname in tracked} for pk in changed_pks},
+                {pk: new_values[pk] for pk in changed_pks},
+                tracking_info_,
+                send_unchanged=subscription.payload == PAYLOAD_PKS,
+                # the objects may hold values of other fields that weren't saved, so they aren't sent as they are
+                queryset=self.model.objects.using(self.db) if subscription.payload == PAYLOAD_INSTANCES else None,
+            )
+        return result
+
+    def _update_changed_fields(
+        self, new_values: dict[Any, dict[str, Any]], changed: dict[Any, set[str]], pks: list, fields: list[Field]
+    ) -> int:
+        """Update `fields` of the rows of `pks` with a CASE/WHEN per field that only covers the rows it changed in"""
+        requires_casting = connections[self.db].features.requires_casted_case_in_updates
+        update_kwargs = {}
+        for field in fields:
+            when_statements = [
+                When(pk=pk, then=Value(new_values[pk][field.attname], output_field=field))
+                for pk in pks
+                if field.attname in changed[pk]
+            ]
+            # the rows where only the other fields changed keep their value
+            case_statement = Case(*when_statements, default=F(field.attname), output_field=field)
+            if requires_casting:
+                case_statement = Cast(case_statement, output_field=field)
+            update_kwargs[field.attname] = case_statement
+        result = 0
+        with staged_pks(self.db, self.model, pks) as lookups:
+            for lookup in lookups:
+                result += super(BulkTrackerQuerySet, self.filter(pk__in=lookup)).update(**update_kwargs)
+        return result
+
+    async def abulk_update(
+        self, objs, fields, batch_size=None, *args, tracking_info_: TrackingInfo | None = None, **kwargs
+    ) -> None:
+        """The async `bulk_update()`, sending `post_update_signal` with `asend()`"""
+        return await run_and_asend(
+            self._write_db, self.bulk_update, objs, fields, batch_size, *args, tracking_info_=tracking_info_, **kwargs
+        )
+
+    def bulk_create(self, objs, *args, tracking_info_: TrackingInfo | None = None, **kwargs):
         """
         Insert each of the instances into the database. Do *not* call
         save() on each of the instances, do not send any pre/post_save
@@ -111,10 +415,129 @@ class BulkTrackerQuerySet(QuerySet):
         autoincrement field (except if features.can_return_rows_from_bulk_insert=True).
         Multi-table models are not supported.
         Will send `post_create_signal` with the created objects
+
+        With `ignore_conflicts=True` or `update_conflicts=True`, the rows the objects conflict with are read before
+        the insert, so `post_create_signal` is only sent with the inserted objects,
+        and `post_update_signal` with the updated ones and their old values. The ignored objects aren't sent.
+        """
+        objs = list(objs)
+        if uses_changelog(self.model):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            schedule_drain(self.db)
+            return objs
+        options = inspect.signature(QuerySet.bulk_create).bind(self, objs, *args, **kwargs).arguments
+        if not options.get("ignore_conflicts") and not options.get("update_conflicts"):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            send_post_create_signal(objs, self.model, tracking_info_, using=self.db)
+            return objs
+        return self._tracked_upsert(objs, args, kwargs, options, tracking_info_)
+
+    def _tracked_upsert(self, objs, args, kwargs, options, tracking_info_: TrackingInfo | None):
+        """
+        `bulk_create()` with conflicts, where each object is either inserted, updated or ignored.
+        The objects whose key is already in the table are the ones that conflict. Their keys, and the old values
+        of the tracked `update_fields`, are read in one query per key before the insert, in the same transaction.
+        With `update_conflicts` the key is `unique_fields`, otherwise any unique key of the model.
+        A row inserted by another transaction between the read and the insert is seen as inserted.
+        """
+        create_subscription = post_create_signal.get_subscription(self.model)
+        update_subscription = None
+        tracked = {}
+        if options.get("update_conflicts"):
+            update_attnames = dict.fromkeys(
+                self.model._meta.get_field(name).attname for name in options["update_fields"]
+            )
+            update_subscription = post_update_signal.get_subscription(self.model)
+            if update_subscription is not None and update_subscription.is_interested(self.model, update_attnames):
+                tracked = update_subscription.get_tracked(self.model, update_attnames)
+            else:
+                update_subscription = None
+        if create_subscription is None and update_subscription is None:
+            return super().bulk_create(objs, *args, **kwargs)
+
+        if options.get("update_conflicts") and options.get("unique_fields"):
+            opts = self.model._meta
+            keys = [
+                tuple(
+                    opts.pk.attname if name == "pk" else opts.get_field(name).attname
+                    for name in options["unique_fields"]
+                )
+            ]
+        else:
+            # MySQL doesn't take `unique_fields`, any unique key can conflict
+            keys = get_unique_keys(self.model)
+        self._for_write = True
+        table = self.model._base_manager.using(self.db).all()
+        with transaction.atomic(using=self.db, savepoint=False):
+            conflicts = {}  # {id(obj): (pk, {attname: old_value})}
+            with registry.phase(CAPTURE, self.model, CREATE, self.db):
+                for key in keys:
+                    key_values = {}
+                    for obj in objs:
+                        value = None if id(obj) in conflicts else get_key_values(obj, key)
+                        if value is not None:
+                            key_values.setdefault(value, []).append(obj)
+                    if not key_values:
+                        continue
+                    for value, row in fetch_values_by_keys(table, key, list(key_values), list(tracked)).items():
+                        for obj in key_values.get(value, ()):
+                            conflicts[id(obj)] = row
+
+            result = super().bulk_create(objs, *args, **kwargs)
+
+            inserted = [obj for obj in objs if id(obj) not in conflicts]
+            if create_subscription is not None and inserted:
+                with registry.phase(CAPTURE, self.model, CREATE, self.db):
+                    self._set_inserted_pks([obj for obj in inserted if obj.pk is None], keys)
+                send_post_create_signal(inserted, self.model, tracking_info_, using=self.db)
+            if update_subscription is not None:
+                old_values = {}
+                new_values = {}
+                for obj in objs:
+                    if id(obj) in conflicts:
+                        pk, old = conflicts[id(obj)]
+                        old_values[pk] = old
+                        new_values[pk] = get_new_values(
+                            self.model, {attname: getattr(obj, attname) for attname in tracked}
+                        )
+                if None in new_values.values():  # some values are expressions
+                    attnames = [self.model._meta.get_field(key).attname for key in tracked]
+                    new_values = fetch_values_by_pks(table, list(old_values), attnames)
+                if old_values:
+                    send_post_update_signal_from_values(
+                        self.model,
+                        self.db,
+                        old_values,
+                        new_values,
+                        tracking_info_,
+                        send_unchanged=update_subscription.payload == PAYLOAD_PKS,
+                        queryset=self.model.objects.using(self.db)
+                        if update_subscription.payload == PAYLOAD_INSTANCES
+                        else None,
+                    )
+        return result
+
+    def _set_inserted_pks(self, objs, keys: list[tuple[str, ...]]) -> None:
         """
-        objs = super().bulk_create(*args, **kwargs)
-        send_post_create_signal(objs, self.model, tracking_info_)
-        return objs
+        Set the pks the database didn't return for the inserted `objs`, i.e. with `ignore_conflicts`,
+        by reading them by the first other key the objects have values for.
+        """
+        table = self.model._base_manager.using(self.db).all()
+        for key in keys:
+            if not objs or key == (self.model._meta.pk.attname,):
+                continue
+            by_key = {}
+            for obj in objs:
+                value = get_key_values(obj, key)
+                if value is not None:
+                    by_key[value] = obj
+            for value, (pk, _values) in fetch_values_by_keys(table, key, list(by_key), []).items():
+                by_key[value].pk = pk
+            objs = [obj for obj in objs if obj.pk is None]
+
+    async def abulk_create(self, *args, tracking_info_: TrackingInfo | None = None, **kwargs):
+        """The async `bulk_create()`, sending `post_create_signal` with `asend()`"""
+        return await run_and_asend(self._write_db, self.bulk_create, *args, tracking_info_=tracking_info_, **kwargs)
 
     def delete(self, *, tracking_info_: TrackingInfo | None = None, **kwarg):
         """
@@ -154,6 +577,10 @@ class BulkTrackerQuerySet(QuerySet):
         self._result_cache = None
         return deleted, _rows_count
 
+    async def adelete(self, *, tracking_info_: TrackingInfo | None = None):
+        """The async `delete()`, sending `post_delete_signal` with `asend()`"""
+        return await run_and_asend(self._write_db, self.delete, tracking_info_=tracking_info_)
+
 
 class BulkTrackerManager(Manager.from_queryset(BulkTrackerQuerySet)):
     pass
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from django.db import models, router
-from model_utils import FieldTracker
 
+from bulk_tracker.changelog import schedule_drain, uses_changelog
 from bulk_tracker.collector import BulkTrackerCollector
 from bulk_tracker.helper_objects import TrackingInfo
 from bulk_tracker.managers import BulkTrackerManager
-from bulk_tracker.signals import send_post_create_signal, send_post_update_signal
+from bulk_tracker.signals import (
+    post_update_signal,
+    run_and_asend,
+    send_post_create_signal,
+    send_post_update_signal,
+)
+from bulk_tracker.tracker import FieldTracker
 
 
 class BulkTrackerModel(models.Model):
@@ -22,21 +28,79 @@ class BulkTrackerModel(models.Model):
         return updated
 
     def save(self, tracking_info_: TrackingInfo | None = None, **kwargs):
-        if hasattr(self, "tracker") and self.tracker:
-            changed = self.tracker.changed()
-            super().save(**kwargs)
-            if not self._is_created and changed:
-                send_post_update_signal(
-                    [self], model=self.__class__, old_values={self.pk: changed}, tracking_info_=tracking_info_
-                )
-            elif self._is_created:
-                send_post_create_signal([self], model=self.__class__, tracking_info_=tracking_info_)
-
-        else:
+        """
+        Save the instance and send `post_create_signal` or `post_update_signal` with the fields that changed.
+        The tracker is only read when `post_update_signal` has receivers, and only for the `update_fields` if given.
+        When none of the `update_fields` changed, and none of them is set on save like `auto_now`,
+        the UPDATE is skipped altogether, as with `save(update_fields=[])`.
+        """
+        if not (hasattr(self, "tracker") and self.tracker):
             raise AttributeError(
                 f"Model {self.__class__} doesn't have tracker, please add `tracker = FieldTracker()` to your model"
             )
 
+        model = self.__class__
+        if uses_changelog(model):
+            super().save(**kwargs)
+            schedule_drain(self._state.db)
+            return
+        update_fields = kwargs.get("update_fields")
+        changed = {}
+        update_subscription = post_update_signal.get_subscription(model)
+        if update_subscription is not None:
+            changed = self.tracker.changed()
+            if update_fields is not None or update_subscription.fields is not None:
+                attnames = self._get_update_attnames(update_fields, update_subscription.fields)
+                changed = {attname: value for attname, value in changed.items() if attname in attnames}
+            if not changed and update_fields and self._can_skip_update(update_fields, update_subscription.fields):
+                kwargs["update_fields"] = []
+                return super().save(**kwargs)
+
+        self._is_created = False
+        super().save(**kwargs)
+        using = self._state.db  # the database the row was saved to, whether given as `using` or chosen by the routers
+        if self._is_created:
+            send_post_create_signal([self], model=model, tracking_info_=tracking_info_, using=using)
+        elif changed:
+            send_post_update_signal(
+                [self], model=model, old_values={self.pk: changed}, tracking_info_=tracking_info_, using=using
+            )
+
+    def _get_update_attnames(self, update_fields, fields: frozenset[str] | None) -> set[str]:
+        """The attnames of `update_fields`, or of all the fields, that are in `fields` if given"""
+        if update_fields is None:
+            attnames = {field.attname for field in self._meta.concrete_fields}
+        else:
+            attnames = {self._meta.get_field(name).attname for name in update_fields}
+        return attnames if fields is None else attnames & fields
+
+    def _can_skip_update(self, update_fields, fields: frozenset[str] | None) -> bool:
+        """
+        Whether the instance is saved already, and every field of `update_fields` is known not to have changed:
+        it was tracked since the instance was loaded or saved, the changes of the receivers' `fields` weren't
+        dropped from `changed()`, and it isn't set on save like `auto_now`.
+        """
+        if self._state.adding or self.pk is None:
+            return False
+        tracker = type(self).tracker
+        if isinstance(tracker, FieldTracker):
+            # the fields assigned before the receivers needed them may have changed
+            tracked = tracker.get_tracked(type(self)) - self.tracker.get_untracked()
+        else:  # django-model-utils' tracker
+            tracked = {self._meta.get_field(name).attname for name in tracker.fields}
+        if fields is not None:
+            tracked &= fields
+        for name in update_fields:
+            field = self._meta.get_field(name)
+            if field.attname not in tracked or getattr(field, "auto_now", False):
+                return False
+        return True
+
+    async def asave(self, tracking_info_: TrackingInfo | None = None, **kwargs):
+        """The async `save()`, sending `post_create_signal` or `post_update_signal` with `asend()`"""
+        using = kwargs.get("using") or router.db_for_write(self.__class__, instance=self)
+        return await run_and_asend(using, self.save, tracking_info_=tracking_info_, **kwargs)
+
     def delete(self, using=None, keep_parents=False, tracking_info_: TrackingInfo | None = None):
         if self.pk is None:
             raise ValueError(
@@ -50,3 +114,10 @@ class BulkTrackerModel(models.Model):
             collector = BulkTrackerCollector(using=using)
         collector.collect([self], keep_parents=keep_parents)
         return collector.delete(tracking_info_=tracking_info_)
+
+    async def adelete(self, using=None, keep_parents=False, tracking_info_: TrackingInfo | None = None):
+        """The async `delete()`, sending `post_delete_signal` with `asend()`"""
+        db = using or router.db_for_write(self.__class__, instance=self)
+        return await run_and_asend(
+            db, self.delete, using=using, keep_parents=keep_parents, tracking_info_=tracking_info_
+        )
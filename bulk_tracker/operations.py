@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.db.migrations.operations.base import Operation
+
+from bulk_tracker.changelog import get_install_sql, get_uninstall_sql
+
+
+class InstallChangeLogTriggers(Operation):
+    """
+    Install the triggers writing the rows of a model to the changelog, i.e. in a migration of its app depending on
+    `("bulk_tracker_changelog", "0001_initial")`: `operations = [InstallChangeLogTriggers("Order")]`.
+    The triggers capture the columns the model has in this migration, so it has to be added again after its fields
+    change. They are only installed on SQLite and PostgreSQL.
+    """
+
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._install(app_label, schema_editor, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._uninstall(app_label, schema_editor, from_state)
+
+    def describe(self):
+        return f"Install the changelog triggers of {self.model_name}"
+
+    @property
+    def migration_name_fragment(self):
+        return f"install_changelog_triggers_{self.model_name.lower()}"
+
+    def _install(self, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            changelog_table = state.apps.get_model("bulk_tracker_changelog", "ChangeLogEntry")._meta.db_table
+            for statement in get_install_sql(schema_editor.connection, model, changelog_table):
+                schema_editor.execute(statement, params=None)
+
+    def _uninstall(self, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            for statement in get_uninstall_sql(schema_editor.connection, model):
+                schema_editor.execute(statement, params=None)
+
+
+class RemoveChangeLogTriggers(InstallChangeLogTriggers):
+    """Remove the changelog triggers of a model, the reverse of `InstallChangeLogTriggers`"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._uninstall(app_label, schema_editor, from_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._install(app_label, schema_editor, to_state)
+
+    def describe(self):
+        return f"Remove the changelog triggers of {self.model_name}"
+
+    @property
+    def migration_name_fragment(self):
+        return f"remove_changelog_triggers_{self.model_name.lower()}"
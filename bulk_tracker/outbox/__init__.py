@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any
+
+# aliased since the `apps` submodule of this package shadows it once loaded
+from django.apps import apps as global_apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Model
+from django.dispatch import Signal
+
+from bulk_tracker.dispatch import Dispatcher, get_signal_name, send_signal
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.utils import build_instance
+
+
+if TYPE_CHECKING:
+    from bulk_tracker.outbox.models import OutboxEvent
+
+logger = logging.getLogger("bulk_tracker.outbox")
+
+# the fields of `TrackingInfo` that are kept as references to their rows
+_REFERENCE_FIELDS = ("user", "reason")
+# the fields of `TrackingInfo` that aren't kept, how the signal is dispatched only matters when the operation runs
+_SKIPPED_FIELDS = ("dispatch",)
+
+
+class OutboxDispatcher(Dispatcher):
+    """
+    Writes the signals to the `OutboxEvent` table in the transaction of their operation instead of sending them,
+    so they are committed or rolled back with it, and survive the process dying after the commit.
+    They are sent by `drain_outbox()`, i.e. with `manage.py drain_outbox`.
+    """
+
+    transactional = True
+
+    def dispatch(self, signal, model, objects, tracking_info_, changeset=None, using=DEFAULT_DB_ALIAS) -> None:
+        # imported here since this app may be imported before the models are loaded
+        from bulk_tracker.outbox.models import OutboxEvent
+
+        # the ChangeSet isn't stored, it is built back from the objects when the event is sent
+        event = OutboxEvent(
+            signal=get_signal_name(signal),
+            model=model._meta.label,
+            modified_objects=[serialize_modified_object(modified_object) for modified_object in objects],
+            tracking_info=serialize_tracking_info(tracking_info_),
+        )
+        OutboxEvent.objects.using(using).bulk_create([event])
+
+
+def serialize_modified_object(modified_object: ModifiedObject) -> dict[str, Any]:
+    """The loaded values of the concrete fields of the instance keyed by attname, and the changed values"""
+    values = modified_object.instance.__dict__
+    return {
+        "values": {
+            field.attname: values[field.attname]
+            for field in modified_object.instance._meta.concrete_fields
+            if field.attname in values
+        },
+        "changed_values": modified_object.changed_values,
+    }
+
+
+def deserialize_modified_object(model: type[Model], using: str, data: dict[str, Any]) -> ModifiedObject:
+    values = {attname: model._meta.get_field(attname).to_python(value) for attname, value in data["values"].items()}
+    changed_values = {key: model._meta.get_field(key).to_python(value) for key, value in data["changed_values"].items()}
+    return ModifiedObject(build_instance(model, using, values), changed_values)
+
+
+def serialize_tracking_info(tracking_info_: TrackingInfo | None) -> dict[str, Any] | None:
+    """
+    The fields of the `TrackingInfo` but `dispatch`, `user` and `reason` are kept as references to their rows,
+    and are loaded back as instances holding only their pk.
+    """
+    if tracking_info_ is None:
+        return None
+    data = {
+        field.name: getattr(tracking_info_, field.name)
+        for field in fields(TrackingInfo)
+        if field.name not in _SKIPPED_FIELDS
+    }
+    for name in _REFERENCE_FIELDS:
+        instance = getattr(tracking_info_, name)
+        data[name] = None if instance is None else {"model": instance._meta.label, "pk": instance.pk}
+    return data
+
+
+def deserialize_tracking_info(using: str, data: dict[str, Any] | None) -> TrackingInfo | None:
+    if data is None:
+        return None
+    # the events written by another version may lack some fields, or have fields this one doesn't know
+    names = {field.name for field in fields(TrackingInfo)}
+    data = {name: value for name, value in data.items() if name in names}
+    for name in _REFERENCE_FIELDS:
+        if data.get(name) is not None:
+            model = global_apps.get_model(data[name]["model"])
+            pk = model._meta.pk.to_python(data[name]["pk"])
+            data[name] = build_instance(model, using, {model._meta.pk.attname: pk})
+    return TrackingInfo(**data)
+
+
+def send_event(event: OutboxEvent, using: str) -> None:
+    """Send the signal of `event`, its id is passed to the receivers as `event_id`"""
+    from bulk_tracker import signals
+
+    signal: Signal = getattr(signals, event.signal)
+    model = global_apps.get_model(event.model)
+    objects = [deserialize_modified_object(model, using, data) for data in event.modified_objects]
+    tracking_info_ = deserialize_tracking_info(using, event.tracking_info)
+    responses = send_signal(signal, model, objects, tracking_info_, event_id=event.pk)
+    if tracking_info_ and tracking_info_.is_robust:
+        for receiver, response in responses:
+            if isinstance(response, Exception):
+                logger.error("Error sending outbox event %s to %r", event.pk, receiver, exc_info=response)
+
+
+def drain_outbox(batch_size: int = 100, using: str = DEFAULT_DB_ALIAS, limit: int | None = None) -> int:
+    """
+    Send the events of the outbox in id order, `batch_size` events per transaction, and delete them once sent.
+    The events of a batch are locked with `select_for_update(skip_locked=True)` where supported, so several workers
+    can drain the same outbox, each one skipping the batches the others are sending.
+    If a receiver raises, its batch is rolled back and will be sent again, so receivers must be idempotent,
+    i.e. by remembering the `event_id` they processed.
+    Stops when the outbox is empty or after `limit` events, returns the number of sent events.
+    """
+    from bulk_tracker.outbox.models import OutboxEvent
+
+    if batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer.")
+    sent = 0
+    while limit is None or sent < limit:
+        size = batch_size if limit is None else min(batch_size, limit - sent)
+        with transaction.atomic(using=using):
+            events = list(OutboxEvent.objects.using(using).select_for_update(skip_locked=True).order_by("id")[:size])
+            if not events:
+                break
+            for event in events:
+                send_event(event, using)
+            OutboxEvent.objects.using(using).filter(id__in=[event.id for event in events]).delete()
+        sent += len(events)
+    return sent
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class OutboxConfig(AppConfig):
+    """The opt-in app of the `OutboxEvent` table, needed by `TrackingInfo(dispatch="outbox")`"""
+
+    name = "bulk_tracker.outbox"
+    label = "bulk_tracker_outbox"
+    verbose_name = "Bulk tracker outbox"
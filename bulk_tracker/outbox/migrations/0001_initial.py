@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:45
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("signal", models.CharField(max_length=32)),
+                ("model", models.CharField(max_length=255)),
+                ("modified_objects", models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ("tracking_info", models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ("id",),
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    A tracking signal written in the transaction of its operation with `TrackingInfo(dispatch="outbox")`,
+    and sent later by `drain_outbox()`. Its id is the event id the receivers get.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    signal = models.CharField(max_length=32)
+    model = models.CharField(max_length=255)
+    modified_objects = models.JSONField(encoder=DjangoJSONEncoder)
+    tracking_info = models.JSONField(encoder=DjangoJSONEncoder, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("id",)
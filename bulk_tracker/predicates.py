@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Model, Q
+
+
+OLD = "old"
+NEW = "new"
+# the value of a field that isn't known where the predicate is evaluated
+UNKNOWN = object()
+
+
+def _compare(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    # like in SQL, NULL is neither greater nor lower than anything
+    return lambda value, other: value is not None and compare(value, other)
+
+
+def _text(compare: Callable[[str, str], bool], lower: bool = False) -> Callable[[Any, Any], bool]:
+    if lower:
+        return lambda value, other: value is not None and compare(str(value).lower(), str(other).lower())
+    return lambda value, other: value is not None and compare(str(value), str(other))
+
+
+# the lookups a predicate can use, evaluated in Python the same way the database does
+LOOKUPS: dict[str, Callable[[Any, Any], bool]] = {
+    "exact": lambda value, other: value is None if other is None else value == other,
+    "iexact": _text(operator.eq, lower=True),
+    "in": lambda value, other: value is not None and value in other,
+    "gt": _compare(operator.gt),
+    "gte": _compare(operator.ge),
+    "lt": _compare(operator.lt),
+    "lte": _compare(operator.le),
+    "range": lambda value, other: value is not None and other[0] <= value <= other[1],
+    "isnull": lambda value, other: (value is None) == bool(other),
+    "contains": _text(operator.contains),
+    "icontains": _text(operator.contains, lower=True),
+    "startswith": _text(str.startswith),
+    "istartswith": _text(str.startswith, lower=True),
+    "endswith": _text(str.endswith),
+    "iendswith": _text(str.endswith, lower=True),
+}
+
+
+class Condition:
+    """A single lookup of a predicate, on the old or the new value of a field"""
+
+    __slots__ = ("side", "attname", "lookup", "value", "python_value")
+
+    def __init__(self, model: type[Model], key: str, value: Any):
+        side, _, path = key.partition("__")
+        name, _, lookup = path.partition("__")
+        lookup = lookup or "exact"
+        if lookup not in LOOKUPS:
+            raise ValueError(f"Unsupported lookup {lookup!r} in the predicate {key!r}.")
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ValueError(f"{model.__name__} has no field {name!r}, used in the predicate {key!r}.") from None
+        if not field.concrete:
+            raise ValueError(f"The predicate {key!r} can only use the concrete fields of {model.__name__}.")
+        self.side = side
+        self.attname = field.attname
+        self.lookup = lookup
+        self.value = value
+        self.python_value = self._to_python(field, value)
+
+    @staticmethod
+    def _to_python(field, value: Any) -> Any:
+        if isinstance(value, Model):  # foreign keys can be compared with an instance
+            return getattr(value, field.target_field.attname)
+        if isinstance(value, (bool, type(None))) or hasattr(value, "resolve_expression"):
+            return value
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return [Condition._to_python(field, item) for item in value]
+        try:
+            return field.to_python(value)
+        except ValidationError:
+            return value
+
+    def matches(self, value: Any) -> bool:
+        return LOOKUPS[self.lookup](value, self.python_value)
+
+    def to_q(self) -> Q:
+        """The lookup on the current values of the rows"""
+        return Q(**{f"{self.attname}__{self.lookup}": self.value})
+
+
+class Node:
+    """The conditions of a predicate, combined like in its Q object"""
+
+    __slots__ = ("connector", "negated", "children")
+
+    def __init__(self, model: type[Model], q: Q):
+        self.connector = q.connector
+        self.negated = q.negated
+        self.children = [
+            Node(model, child) if isinstance(child, Q) else Condition(model, *child) for child in q.children
+        ]
+
+
+class Predicate:
+    """
+    A Q object over the old and the new values of the rows of an operation, prefixed with `old__` and `new__`,
+    i.e. `Q(old__status="pending", new__status="shipped")`, see `TrackerSignal.connect(predicate=...)`.
+    The values that didn't change are both the old and the new ones.
+    """
+
+    def __init__(self, q: Q):
+        if not isinstance(q, Q):
+            raise TypeError(f"predicate must be a Q object, got {q!r}.")
+        for key in self._flatten_keys(q):
+            if key.partition("__")[0] not in (OLD, NEW):
+                raise ValueError(f"The lookups of a predicate must start with old__ or new__, got {key!r}.")
+        self.q = q
+        self.compiled: dict[type[Model], Node] = {}
+
+    def __repr__(self):
+        return f"Predicate({self.q!r})"
+
+    @classmethod
+    def _flatten_keys(cls, q: Q) -> list[str]:
+        keys = []
+        for child in q.children:
+            keys.extend(cls._flatten_keys(child) if isinstance(child, Q) else [child[0]])
+        return keys
+
+    def compile(self, model: type[Model]) -> Node:
+        """The conditions of the predicate for the fields of `model`, raises ValueError if it lacks any of them"""
+        try:
+            return self.compiled[model]
+        except KeyError:
+            node = self.compiled[model] = Node(model, self.q)
+            return node
+
+    def applies_to(self, model: type[Model]) -> bool:
+        """Whether `model` has the fields of the predicate, the rows of the other models never match it"""
+        try:
+            self.compile(model)
+        except ValueError:
+            return False
+        return True
+
+    def get_attnames(self, model: type[Model]) -> set[str]:
+        """The attnames of the fields the predicate reads"""
+        attnames = set()
+        nodes = [self.compile(model)]
+        while nodes:
+            for child in nodes.pop().children:
+                if isinstance(child, Node):
+                    nodes.append(child)
+                else:
+                    attnames.add(child.attname)
+        return attnames
+
+    def evaluate(self, model: type[Model], get_value: Callable[[str, str], Any]) -> bool | None:
+        """
+        Whether a row matches, `get_value(side, attname)` returns its old or new value, or `UNKNOWN`.
+        Returns None if it depends on unknown values.
+        """
+        return _evaluate(self.compile(model), get_value)
+
+    def get_capture_filter(self, model: type[Model], kwargs: dict[str, Any]) -> Q | bool:
+        """
+        A filter on the rows before `update(**kwargs)` keeping every row that may match, True to keep all of them,
+        or False if none can match.
+        The new values of the fields that aren't updated are the current ones, and the ones updated with a literal
+        are known already, only the ones updated with an expression aren't known before the update.
+        """
+        updated = {}
+        for key, value in kwargs.items():
+            field = model._meta.get_field(key)
+            if hasattr(value, "resolve_expression"):
+                updated[field.attname] = UNKNOWN
+            else:
+                updated[field.attname] = Condition._to_python(field, value)
+        return _to_capture_filter(self.compile(model), updated, negated=False)
+
+
+def _evaluate(node: Node, get_value: Callable[[str, str], Any]) -> bool | None:
+    results = []
+    for child in node.children:
+        if isinstance(child, Node):
+            results.append(_evaluate(child, get_value))
+        else:
+            value = get_value(child.side, child.attname)
+            results.append(None if value is UNKNOWN else child.matches(value))
+    if node.connector == Q.AND:
+        result = False if False in results else (None if None in results else True)
+    else:
+        result = True if True in results else (None if None in results else False)
+    if node.negated and result is not None:
+        result = not result
+    return result
+
+
+def _to_capture_filter(node: Node, updated: dict[str, Any], negated: bool) -> Q | bool:
+    # `negated` is whether the node is under an odd number of negations, where an unknown condition has to be
+    # replaced by False instead of True, so the filter still keeps every row that may match
+    negated ^= node.negated
+    children = []
+    for child in node.children:
+        if isinstance(child, Node):
+            children.append(_to_capture_filter(child, updated, negated))
+        elif child.side == OLD or child.attname not in updated:
+            children.append(child.to_q())
+        elif updated[child.attname] is UNKNOWN:
+            children.append(not negated)
+        else:
+            children.append(child.matches(updated[child.attname]))
+
+    if node.connector == Q.AND:
+        if False in children:
+            result = False
+        else:
+            queries = [child for child in children if child is not True]
+            result = _combine(queries, operator.and_) if queries else True
+    else:
+        if True in children:
+            result = True
+        else:
+            queries = [child for child in children if child is not False]
+            result = _combine(queries, operator.or_) if queries else False
+    if node.negated:
+        return (not result) if isinstance(result, bool) else ~result
+    return result
+
+
+def _combine(queries: list[Q], combine: Callable[[Q, Q], Q]) -> Q:
+    result = queries[0]
+    for query in queries[1:]:
+        result = combine(result, query)
+    return result
+
+
+def get_capture_filter(predicates: tuple[Predicate, ...], model: type[Model], kwargs: dict[str, Any]) -> Q | bool:
+    """The union of the capture filters of `predicates`, see `Predicate.get_capture_filter()`"""
+    queries = []
+    for predicate in predicates:
+        capture_filter = predicate.get_capture_filter(model, kwargs)
+        if capture_filter is True:
+            return True
+        if capture_filter is not False:
+            queries.append(capture_filter)
+    return _combine(queries, operator.or_) if queries else False
+
+
+def may_match(predicates: tuple[Predicate, ...], model: type[Model], get_value: Callable[[str, str], Any]) -> bool:
+    """Whether any of `predicates` matches a row or depends on its unknown values"""
+    return any(predicate.evaluate(model, get_value) is not False for predicate in predicates)
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+from uuid import uuid4
+
+from django.db import connections, transaction
+from django.db.models import Field, Model, Q, QuerySet, sql
+from django.db.models.expressions import RawSQL
+from django.db.models.sql.constants import CURSOR
+
+from bulk_tracker.utils import get_update_fields
+
+
+# Up to this number of pks a plain `pk__in` list is used.
+# (capped by the backend's maximum number of query parameters, i.e. 999 on SQLite)
+IN_LIST_THRESHOLD = 1000
+# Up to this number of pks a VALUES list is joined on PostgreSQL, beyond it the pks are staged in a temporary table.
+VALUES_THRESHOLD = 10000
+# The maximum number of parameters of a query on PostgreSQL, whose backend doesn't declare `max_query_params`.
+POSTGRESQL_MAX_QUERY_PARAMS = 65535
+
+
+def get_max_query_params(connection) -> int:
+    """The maximum number of parameters of a single query, IN_LIST_THRESHOLD if the backend doesn't tell"""
+    if connection.features.max_query_params:
+        return connection.features.max_query_params
+    if connection.vendor == "postgresql":
+        return POSTGRESQL_MAX_QUERY_PARAMS
+    return IN_LIST_THRESHOLD
+
+
+def supports_update_returning(connection) -> bool:
+    """
+    `UPDATE ... RETURNING` that can also return the pre-update image of the row is only possible on
+    PostgreSQL and SQLite 3.35+.
+    MariaDB supports RETURNING for INSERT and DELETE only, so it is not listed here.
+    """
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 35, 0)
+    return False
+
+
+def can_update_returning(queryset: QuerySet, kwargs: dict[str, Any]) -> bool:
+    if not supports_update_returning(connections[queryset.db]):
+        return False
+    # multi-table inheritance updates touch more than one table, which can't be done in a single statement
+    concrete_model = queryset.model._meta.concrete_model
+    return all(
+        field.model._meta.concrete_model is concrete_model
+        for field in get_update_fields(queryset.model, kwargs).values()
+    )
+
+
+def _materialized(connection) -> str:
+    # Before PostgreSQL 12 CTEs were always materialized and the keyword didn't exist.
+    if connection.vendor == "postgresql" and connection.pg_version < 120000:
+        return ""
+    return "MATERIALIZED "
+
+
+def update_returning(
+    queryset: QuerySet, kwargs: dict[str, Any], old_fields: list[Field], new_fields: list[Field]
+) -> list[tuple[Any, tuple, tuple]]:
+    """
+    Update `queryset` with `kwargs` in a single statement, returning `(pk, old_values, new_values)` for every
+    updated row, where `old_values` are the values of `old_fields` before the update,
+    and `new_values` the values of `new_fields` after it.
+
+    The rows to update are captured in a materialized CTE which is evaluated before the UPDATE runs,
+    so it holds the pre-update image of each row, and the UPDATE only touches the captured rows:
+        WITH old (pk, c0, ...) AS MATERIALIZED (SELECT pk, col0, ... FROM table WHERE ...)
+        UPDATE table SET ... WHERE pk IN (SELECT pk FROM old)
+        RETURNING pk, (SELECT c0 FROM old WHERE old.pk = table.pk), ..., col0, ...
+    `queryset` may be sliced, in which case only the rows of the slice are updated.
+    On PostgreSQL the captured rows are locked with `FOR UPDATE`, so no concurrent write can slip in between the
+    capture and the UPDATE.
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+    qn = connection.ops.quote_name
+
+    if not queryset.query.is_sliced:
+        queryset = queryset.order_by()
+    capture = queryset.values_list("pk", *(field.attname for field in old_fields))
+    if connection.features.has_select_for_update:
+        capture = capture.select_for_update(
+            **({"of": ("self",)} if connection.features.has_select_for_update_of else {})
+        )
+    capture_compiler = capture.query.get_compiler(queryset.db)
+    capture_sql, capture_params = capture_compiler.as_sql()
+
+    update_query = sql.UpdateQuery(model)
+    update_query.add_update_values(kwargs)
+    update_sql, update_params = update_query.get_compiler(queryset.db).as_sql()
+
+    table = qn(model._meta.db_table)
+    pk_column = f"{table}.{qn(model._meta.pk.column)}"
+    old = qn("bulk_tracker_old")
+    old_pk = qn("pk")
+    old_columns = [qn(f"c{i}") for i in range(len(old_fields))]
+    returning = [
+        pk_column,
+        *(f"(SELECT {old}.{column} FROM {old} WHERE {old}.{old_pk} = {pk_column})" for column in old_columns),
+        *(f"{table}.{qn(field.column)}" for field in new_fields),
+    ]
+    query = (
+        f"WITH {old} ({', '.join([old_pk, *old_columns])}) AS {_materialized(connection)}({capture_sql}) "
+        f"{update_sql} WHERE {pk_column} IN (SELECT {old_pk} FROM {old}) "
+        f"RETURNING {', '.join(returning)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(query, (*capture_params, *update_params))
+        rows = cursor.fetchall()
+
+    rows = _convert_rows(capture_compiler, rows, [model._meta.pk, *old_fields, *new_fields])
+    split = len(old_fields) + 1
+    return [(row[0], tuple(row[1:split]), tuple(row[split:])) for row in rows]
+
+
+def supports_update_from(connection) -> bool:
+    """`UPDATE ... FROM` joining another table or a VALUES list is only possible on PostgreSQL and SQLite 3.33+"""
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 33, 0)
+    return False
+
+
+def update_from_values(
+    model: type[Model], using: str, fields: list[Field], rows: Sequence[tuple[Any, Sequence]]
+) -> int:
+    """
+    Set `fields` of each row of `rows`, given as `(pk, values)`, to its own values in a single statement,
+    returns the number of updated rows:
+        UPDATE table SET col0 = v.c0, ... FROM (VALUES (%s, %s, ...), ...) AS v (pk, c0, ...) WHERE table.pk = v.pk
+    Unlike a CASE/WHEN per field the statement grows with the number of rows only, and the rows are joined by
+    their pk instead of each of them being matched against every WHEN.
+    The number of parameters, `len(rows) * (len(fields) + 1)`, has to fit in the backend's limit.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    pk_field = model._meta.pk
+    values = qn("bulk_tracker_values")
+    if connection.vendor == "postgresql":
+        # the parameters of a VALUES list have no type, so they are cast to the type of their column
+        placeholders = ", ".join(f"%s::{field.cast_db_type(connection)}" for field in [pk_field, *fields])
+        pk_column, *columns = [qn("pk"), *(qn(f"c{i}") for i in range(len(fields)))]
+        alias = f"{values} ({', '.join([pk_column, *columns])})"
+    else:
+        # SQLite doesn't accept column aliases, the columns of a VALUES list are named column1, column2...
+        placeholders = ", ".join(["%s"] * (len(fields) + 1))
+        pk_column, *columns = [f"column{i + 1}" for i in range(len(fields) + 1)]
+        alias = values
+    table = qn(model._meta.db_table)
+    assignments = ", ".join(f"{qn(field.column)} = {values}.{column}" for field, column in zip(fields, columns))
+    query = (
+        f"UPDATE {table} SET {assignments} FROM (VALUES {', '.join([f'({placeholders})'] * len(rows))}) AS {alias} "
+        f"WHERE {table}.{qn(pk_field.column)} = {values}.{pk_column}"
+    )
+    params = []
+    for pk, row in rows:
+        params.append(pk_field.get_db_prep_value(pk, connection, prepared=False))
+        params.extend(field.get_db_prep_save(value, connection) for field, value in zip(fields, row))
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return cursor.rowcount
+
+
+def _convert_rows(compiler: sql.compiler.SQLCompiler, rows: list[tuple], fields: list[Field]) -> list:
+    """Convert the raw database values of `fields` the same way the ORM does when it reads these columns"""
+    converters = compiler.get_converters([field.get_col(field.model._meta.db_table) for field in fields])
+    if converters:
+        return list(compiler.apply_converters(rows, converters))
+    return rows
+
+
+def pk_staging_strategy(connection, count: int) -> str:
+    """
+    Pick how a list of `count` pks is passed to the database:
+    - "in": a plain `pk IN (%s, ...)` list
+    - "values": `pk IN (SELECT pk FROM (VALUES (%s), ...))`, which PostgreSQL plans as a hash join instead of
+       evaluating a huge IN list
+    - "temp_table": the pks are inserted in a temporary table, then `pk IN (SELECT pk FROM temp_table)`
+    - "chunked": several `pk IN (%s, ...)` lists that each fit in the query parameter limit,
+       for Oracle where staging in a temporary table requires DDL that commits the transaction
+    """
+    max_query_params = connection.features.max_query_params or IN_LIST_THRESHOLD
+    if count <= min(IN_LIST_THRESHOLD, max_query_params):
+        return "in"
+    if connection.vendor == "oracle":
+        return "chunked"
+    if connection.vendor == "postgresql" and count <= VALUES_THRESHOLD:
+        return "values"
+    return "temp_table"
+
+
+@contextmanager
+def staged_pks(using: str, model: type[Model], pks: Sequence[Any]) -> Iterator[list[Any]]:
+    """
+    Stage `pks` in the database according to `pk_staging_strategy()`.
+    Yields a list of values to be used as `filter(pk__in=value)`, the results for all of them together
+    are the rows of `pks`. Most of the strategies yield a single value.
+    """
+    connection = connections[using]
+    strategy = pk_staging_strategy(connection, len(pks))
+    if strategy == "in":
+        yield [pks]
+        return
+    if strategy == "chunked":
+        size = min(IN_LIST_THRESHOLD, connection.features.max_query_params or IN_LIST_THRESHOLD)
+        yield [pks[i : i + size] for i in range(0, len(pks), size)]
+        return
+
+    qn = connection.ops.quote_name
+    pk_field = model._meta.pk
+    column = qn("pk")
+    params = [pk_field.get_db_prep_value(pk, connection, prepared=False) for pk in pks]
+    if strategy == "values":
+        cast = f"::{pk_field.rel_db_type(connection)}"
+        rows = ", ".join([f"(%s{cast})"] * len(params))
+        yield [RawSQL(f"SELECT {column} FROM (VALUES {rows}) AS {qn('bulk_tracker_pks')} ({column})", params)]
+        return
+
+    table = qn(f"bulk_tracker_pks_{uuid4().hex}")
+    # a multi-row INSERT per batch, instead of `executemany()` which is a round trip per pk on most drivers
+    batch_size = min(get_max_query_params(connection), connection.ops.bulk_batch_size([pk_field], params))
+    try:
+        # if anything fails the savepoint is rolled back, which also drops the temporary table on databases with
+        # transactional DDL
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                cursor.execute(f"CREATE TEMPORARY TABLE {table} ({column} {pk_field.rel_db_type(connection)})")
+                for i in range(0, len(params), batch_size):
+                    batch = params[i : i + batch_size]
+                    cursor.execute(f"INSERT INTO {table} ({column}) VALUES {', '.join(['(%s)'] * len(batch))}", batch)
+            yield [RawSQL(f"SELECT {column} FROM {table}", ())]
+    finally:
+        # once the savepoint is released or rolled back, so the connection is usable even after an error
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def fetch_by_pks(queryset: QuerySet, pks: Sequence[Any]) -> list[Model]:
+    """Evaluate `queryset.filter(pk__in=pks)`, staging `pks` according to `pk_staging_strategy()`"""
+    with staged_pks(queryset.db, queryset.model, pks) as lookups:
+        return [obj for lookup in lookups for obj in queryset.filter(pk__in=lookup)]
+
+
+def fetch_values_by_pks(queryset: QuerySet, pks: Sequence[Any], attnames: Sequence[str]) -> dict[Any, dict[str, Any]]:
+    """The values of `attnames` of the rows of `pks` as `{pk: {attname: value}}`, without building any instance"""
+    values = {}
+    with staged_pks(queryset.db, queryset.model, pks) as lookups:
+        for lookup in lookups:
+            for pk, *row in queryset.filter(pk__in=lookup).order_by().values_list("pk", *attnames):
+                values[pk] = dict(zip(attnames, row))
+    return values
+
+
+def fetch_values_by_keys(
+    queryset: QuerySet, key: Sequence[str], key_values: Sequence[tuple], attnames: Sequence[str]
+) -> dict[tuple, tuple[Any, dict[str, Any]]]:
+    """
+    The pk and the values of `attnames` of the rows whose fields of `key` have one of the tuples of `key_values`,
+    as `{key_value: (pk, {attname: value})}`, without building any instance.
+    The lookups are split to fit in the query parameter limit.
+    """
+    connection = connections[queryset.db]
+    size = max((connection.features.max_query_params or IN_LIST_THRESHOLD) // len(key), 1)
+    queryset = queryset.order_by().values_list("pk", *key, *attnames)
+    values = {}
+    for i in range(0, len(key_values), size):
+        chunk = key_values[i : i + size]
+        if len(key) == 1:
+            lookup = Q(**{f"{key[0]}__in": [value for (value,) in chunk]})
+        else:
+            lookup = Q(*(Q(**dict(zip(key, value))) for value in chunk), _connector=Q.OR)
+        for pk, *row in queryset.filter(lookup):
+            values[tuple(row[: len(key)])] = (pk, dict(zip(attnames, row[len(key) :])))
+    return values
+
+
+def update_by_pks(model: type[Model], pks: Sequence[Any], values: dict[str, Any], using: str) -> int:
+    """The equivalent of `sql.UpdateQuery(model).update_batch(pks, values, using)` for any number of pks"""
+    if pk_staging_strategy(connections[using], len(pks)) in ("in", "chunked"):
+        return sql.UpdateQuery(model).update_batch(pks, values, using)
+    updated = 0
+    with staged_pks(using, model, pks) as lookups:
+        for lookup in lookups:
+            query = sql.UpdateQuery(model)
+            query.add_update_values(values)
+            query.add_q(Q(pk__in=lookup))
+            updated += query.get_compiler(using).execute_sql(CURSOR)
+    return updated
+
+
+def delete_by_pks(model: type[Model], pks: Sequence[Any], using: str) -> int:
+    """The equivalent of `sql.DeleteQuery(model).delete_batch(pks, using)` for any number of pks"""
+    if pk_staging_strategy(connections[using], len(pks)) in ("in", "chunked"):
+        return sql.DeleteQuery(model).delete_batch(pks, using)
+    deleted = 0
+    with staged_pks(using, model, pks) as lookups:
+        for lookup in lookups:
+            query = sql.DeleteQuery(model)
+            query.add_q(Q(pk__in=lookup))
+            cursor = query.get_compiler(using).execute_sql(CURSOR)
+            if cursor:
+                with cursor:
+                    deleted += cursor.rowcount
+    return deleted
+
+
+def supports_delete_returning(connection) -> bool:
+    """
+    `DELETE ... RETURNING` is available on PostgreSQL and SQLite 3.35+.
+    MariaDB supports it too, but Django deletes with a multi-table `DELETE ... JOIN` there when filtering on
+    relations, which can't return rows.
+    """
+    return supports_update_returning(connection)
+
+
+def raw_delete_capturing(queryset: QuerySet, attnames: list[str], using: str) -> tuple[int, list]:
+    """
+    `queryset._raw_delete(using)` which also returns the values of `attnames` for each deleted row.
+    This is a single `DELETE ... RETURNING` statement where supported,
+    otherwise the values are read by a SELECT of these columns only before the DELETE.
+    """
+    model = queryset.model
+    connection = connections[using]
+    if not supports_delete_returning(connection):
+        rows = list(queryset.using(using).order_by().values_list(*attnames))
+        return queryset._raw_delete(using=using), rows
+
+    qn = connection.ops.quote_name
+    fields = [model._meta.get_field(attname) for attname in attnames]
+    query = queryset.query.clone()
+    query.__class__ = sql.DeleteQuery
+    compiler = query.get_compiler(using)
+    delete_sql, delete_params = compiler.as_sql()
+    table = qn(model._meta.db_table)
+    returning = ", ".join(f"{table}.{qn(field.column)}" for field in fields)
+    with connection.cursor() as cursor:
+        cursor.execute(f"{delete_sql} RETURNING {returning}", delete_params)
+        rows = cursor.fetchall()
+    rows = _convert_rows(compiler, rows, fields)
+    return len(rows), rows
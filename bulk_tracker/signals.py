@@ -1,17 +1,244 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from typing import TYPE_CHECKING, Any
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from functools import partial, wraps
+from inspect import iscoroutinefunction
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from django.db import transaction
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Model, QuerySet
 from django.dispatch import Signal
+from django.dispatch.dispatcher import _make_id
 
-from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.changeset import ChangeSet
+from bulk_tracker.coalescing import CREATE, DELETE, UPDATE, CoalescingBuffer
+from bulk_tracker.dispatch import (
+    SIGNAL_KINDS,
+    InlineDispatcher,
+    asend_signal,
+    get_dispatcher,
+    get_signal_name,
+)
+from bulk_tracker.helper_objects import (
+    PAYLOAD_DIFF,
+    PAYLOAD_PKS,
+    PAYLOADS,
+    ModifiedObject,
+    Subscription,
+    TrackingInfo,
+)
+from bulk_tracker.instrumentation import DIFF, ROWS_CAPTURED, ROWS_CHANGED, registry
+from bulk_tracker.loaders import DatabaseLoader, ValuesLoader
+from bulk_tracker.predicates import OLD, UNKNOWN, Predicate, may_match
+from bulk_tracker.queries import fetch_values_by_pks
 
 
 if TYPE_CHECKING:
     from bulk_tracker.models import BulkTrackerModel
 
+_R = TypeVar("_R")
+
+# the dispatches collected while the sync part of an async operation runs, see `run_and_asend()`
+_collected_dispatches: ContextVar[list | None] = ContextVar("bulk_tracker_collected_dispatches", default=None)
+
+
+class TrackerSignal(Signal):
+    """
+    A Signal whose receivers can declare the fields they need and the payload they expect,
+    so the tracker doesn't capture what nobody is going to read.
+    i.e. `@receiver(post_update_signal, sender=MyModel, fields=["status"], payload="diff")`
+    A receiver of `post_update_signal` can also only get the rows matching a predicate over their old and new values,
+    i.e. `predicate=Q(old__status="pending", new__status="shipped")`, see `Predicate`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.receivers_declarations: dict[tuple, tuple[tuple[str, ...] | None, str, bool, Predicate | None]] = {}
+        self.subscriptions: dict[type[Model], Subscription | None] = {}
+        # bumped whenever the subscriptions are cleared, so what is derived from them can be cached by version
+        self.version = 0
+
+    def connect(
+        self,
+        receiver,
+        sender=None,
+        weak=True,
+        dispatch_uid=None,
+        fields=None,
+        payload=PAYLOAD_DIFF,
+        changeset=False,
+        predicate=None,
+    ):
+        if payload not in PAYLOADS:
+            raise ValueError(f"payload must be one of {', '.join(PAYLOADS)}, got {payload!r}.")
+        lookup_id = dispatch_uid or _make_id(receiver)
+        if predicate is not None:
+            if payload == PAYLOAD_PKS:
+                raise ValueError(
+                    "A receiver with a predicate needs the values of the rows, it can't use payload='pks'."
+                )
+            predicate = Predicate(predicate)
+            # the receiver is wrapped under its own id, so disconnecting it disconnects the wrapper,
+            # which is held strongly since nothing else references it
+            receiver, weak, dispatch_uid = _filtering_receiver(receiver, predicate), False, lookup_id
+        super().connect(receiver, sender=sender, weak=weak, dispatch_uid=dispatch_uid)
+        lookup_key = (lookup_id, _make_id(sender))
+        self.receivers_declarations[lookup_key] = (
+            None if fields is None else tuple(fields),
+            payload,
+            changeset,
+            predicate,
+        )
+        self.clear_subscriptions()
+
+    def disconnect(self, receiver=None, sender=None, dispatch_uid=None):
+        disconnected = super().disconnect(receiver, sender=sender, dispatch_uid=dispatch_uid)
+        self.receivers_declarations.pop((dispatch_uid or _make_id(receiver), _make_id(sender)), None)
+        self.clear_subscriptions()
+        return disconnected
+
+    def _remove_receiver(self, *args, **kwargs):
+        # called when a receiver connected with a weak reference is garbage collected
+        super()._remove_receiver(*args, **kwargs)
+        self.clear_subscriptions()
+
+    def clear_subscriptions(self) -> None:
+        """Compute the subscriptions again, i.e. once the receivers changed"""
+        self.subscriptions.clear()
+        self.version += 1
+
+    def get_subscription(self, sender: type[Model]) -> Subscription | None:
+        """
+        What the receivers of `sender` declared they need, or None if it has no receivers.
+        It is computed once per sender, until a receiver is connected or disconnected.
+        """
+        try:
+            return self.subscriptions[sender]
+        except KeyError:
+            subscription = self.subscriptions[sender] = self._build_subscription(sender)
+            return subscription
+
+    def _build_subscription(self, sender: type[Model]) -> Subscription | None:
+        sender_keys = (_make_id(None), _make_id(sender))
+        with self.lock:
+            self._clear_dead_receivers()
+            lookup_keys = [entry[0] for entry in self.receivers if entry[0][1] in sender_keys]
+        if not lookup_keys:
+            return None
+
+        attnames = set()
+        all_fields = False
+        payload = PAYLOADS[0]
+        changeset = False
+        predicates = []
+        unfiltered = False
+        for lookup_key in lookup_keys:
+            fields, receiver_payload, receiver_changeset, predicate = self.receivers_declarations.get(
+                lookup_key, (None, PAYLOAD_DIFF, False, None)
+            )
+            if predicate is None:
+                unfiltered = True
+            elif predicate.applies_to(sender):
+                predicates.append(predicate)
+                attnames.update(predicate.get_attnames(sender))
+            else:  # a receiver of all the senders never gets the rows of the models lacking the fields it filters on
+                continue
+            payload = max(payload, receiver_payload, key=PAYLOADS.index)
+            changeset = changeset or receiver_changeset
+            if fields is None:
+                all_fields = True
+                continue
+            for name in fields:
+                try:
+                    attnames.add(sender._meta.get_field(name).attname)
+                except FieldDoesNotExist:  # a receiver of all the senders may declare fields of other models
+                    pass
+        return Subscription(
+            None if all_fields else frozenset(attnames),
+            payload,
+            changeset,
+            None if unfiltered else tuple(predicates),
+        )
+
+
+def _filtering_receiver(receiver: Callable, predicate: Predicate) -> Callable:
+    """`receiver`, called only with the objects matching `predicate`, and not called at all if none of them does"""
+
+    def filter_kwargs(signal: Signal, sender: type[Model], objects: list[ModifiedObject], kwargs: dict) -> bool:
+        objects = _filter_objects(predicate, sender, objects)
+        if not objects:
+            return False
+        kwargs["objects"] = objects
+        if kwargs.get("changeset") is not None:
+            kwargs["changeset"] = ChangeSet.from_objects(sender, objects, SIGNAL_KINDS[get_signal_name(signal)])
+        return True
+
+    if iscoroutinefunction(receiver):
+
+        @wraps(receiver)
+        async def filtering_receiver(signal, sender, objects, **kwargs):
+            if filter_kwargs(signal, sender, objects, kwargs):
+                return await receiver(signal=signal, sender=sender, **kwargs)
+            return None
+
+    else:
+
+        @wraps(receiver)
+        def filtering_receiver(signal, sender, objects, **kwargs):
+            if filter_kwargs(signal, sender, objects, kwargs):
+                return receiver(signal=signal, sender=sender, **kwargs)
+            return None
+
+    return filtering_receiver
+
+
+def _filter_objects(predicate: Predicate, model: type[Model], objects: list[ModifiedObject]) -> list[ModifiedObject]:
+    """
+    The objects matching `predicate`, their new values are the ones of their instances,
+    the values of the fields it reads that the instances don't hold are fetched in a single query.
+    """
+    if not predicate.applies_to(model):
+        return []
+    attnames = predicate.get_attnames(model)
+    instances = [modified_object.instance for modified_object in objects]
+    missing = {instance.pk: instance for instance in instances if not attnames <= instance.__dict__.keys()}
+    if missing:
+        queryset = model._base_manager.using(next(iter(missing.values()))._state.db)
+        for pk, values in fetch_values_by_pks(queryset, list(missing), sorted(attnames)).items():
+            for attname, value in values.items():
+                missing[pk].__dict__.setdefault(attname, value)
+
+    def get_value(modified_object: ModifiedObject, side: str, attname: str) -> Any:
+        if side == OLD:
+            changed_values = modified_object.changed_values
+            if attname in changed_values:
+                return changed_values[attname]
+            name = model._meta.get_field(attname).name  # the foreign keys may be keyed by name
+            if name in changed_values:
+                return changed_values[name]
+        return modified_object.instance.__dict__.get(attname, UNKNOWN)
+
+    return [
+        modified_object
+        for modified_object in objects
+        if predicate.evaluate(model, partial(get_value, modified_object)) is True
+    ]
+
+
+def _get_predicates(model: type[Model], tracking_info_: TrackingInfo | None) -> tuple[Predicate, ...] | None:
+    """
+    The predicates of the receivers of `post_update_signal` if they all have one, the rows matching none of them
+    don't need to be sent.
+    The coalesced rows are all kept, their net change may match even if none of their updates does.
+    """
+    subscription = post_update_signal.get_subscription(model)
+    if subscription is None or (tracking_info_ and tracking_info_.coalesce):
+        return None
+    return subscription.predicates
+
 
 """
 Signals that will be emitted when a bulk operations are used.
@@ -28,8 +255,12 @@ def i_am_a_receiver_function(
     **kwargs,
 ):
     do_stuff()
+
+receivers can declare the fields they need, and the payload they expect ("pks", "diff" or "instances"),
+updates of other fields are not tracked, and only what is needed is captured.
+@receiver(post_update_signal, sender=MyModel, fields=["status"], payload="diff")
 """
-post_update_signal = Signal()  # custom signal for bulk and single update
+post_update_signal = TrackerSignal()  # custom signal for bulk and single update
 
 
 """
@@ -42,7 +273,7 @@ def i_am_a_receiver_function(
 ):
     do_stuff()
 """
-post_create_signal = Signal()  # custom signal for bulk and single create
+post_create_signal = TrackerSignal()  # custom signal for bulk and single create
 
 """
 @receiver(post_delete_signal, sender=MyModel)
@@ -53,26 +284,91 @@ def i_am_a_receiver_function(
     **kwargs,
 ):
     do_stuff()
+
+receivers can declare the fields they need, then the deleted objects will only hold the values of these fields,
+or `payload="pks"` to only get the pks of the deleted objects
+@receiver(post_delete_signal, sender=MyModel, fields=["title"])
 """
-post_delete_signal = Signal()  # custom signal for bulk and single delete
+post_delete_signal = TrackerSignal()  # custom signal for bulk and single delete
+
+
+def _send_on_commit(
+    kind: str,
+    signal: Signal,
+    model: type[BulkTrackerModel],
+    modified_objects: list[ModifiedObject],
+    tracking_info_: TrackingInfo | None,
+    changeset: ChangeSet | None = None,
+    using: str | None = None,
+) -> None:
+    """Send the signal once the transaction of `using`, the database of the operation, is committed"""
+    using = using or DEFAULT_DB_ALIAS
+    dispatcher = get_dispatcher(tracking_info_)
+    if dispatcher.transactional:
+        # i.e. the outbox, written in the transaction of the operation so it is committed or rolled back with it
+        dispatcher.dispatch(signal, model, modified_objects, tracking_info_, changeset, using=using)
+        return
+
+    if tracking_info_ and tracking_info_.coalesce and transaction.get_connection(using).in_atomic_block:
+        CoalescingBuffer.get(using).add(kind, signal, model, modified_objects, tracking_info_)
+        return
+
+    collected = _collected_dispatches.get()
+    if collected is not None and isinstance(dispatcher, InlineDispatcher):
+        # the async operation running this sends the signal itself with `asend()` once it is committed
+        transaction.on_commit(
+            partial(collected.append, (signal, model, modified_objects, tracking_info_, changeset)), using=using
+        )
+        return
+
+    transaction.on_commit(
+        partial(dispatcher.dispatch, signal, model, modified_objects, tracking_info_, changeset), using=using
+    )
+
+
+async def run_and_asend(using: str, func: Callable[..., _R], /, *args, **kwargs) -> _R:
+    """
+    Run the sync tracked operation `func(*args, **kwargs)` in a worker thread, then send its signals
+    from the event loop with `asend()`, so async receivers run concurrently instead of one by one in the thread.
+    If it runs inside a transaction of `using`, its signals are sent on commit just like the sync operations.
+    """
+    result, collected = await sync_to_async(_collecting_dispatches)(using, func, *args, **kwargs)
+    for signal, model, modified_objects, tracking_info_, changeset in collected:
+        await asend_signal(signal, model, modified_objects, tracking_info_, changeset)
+    return result
+
+
+def _collecting_dispatches(using: str, func: Callable[..., _R], /, *args, **kwargs) -> tuple[_R, list]:
+    if transaction.get_connection(using).in_atomic_block:
+        return func(*args, **kwargs), []
+    collected = []
+    token = _collected_dispatches.set(collected)
+    try:
+        return func(*args, **kwargs), collected
+    finally:
+        _collected_dispatches.reset(token)
+
+
+def _wants_changeset(signal: TrackerSignal, model: type[BulkTrackerModel]) -> bool:
+    subscription = signal.get_subscription(model)
+    return subscription is not None and subscription.changeset
 
 
 def send_post_create_signal(
-    objs: Iterable[BulkTrackerModel], model: type[BulkTrackerModel], tracking_info_: TrackingInfo | None = None
+    objs: Iterable[BulkTrackerModel],
+    model: type[BulkTrackerModel],
+    tracking_info_: TrackingInfo | None = None,
+    using: str | None = None,
 ):
+    using = using or DEFAULT_DB_ALIAS
     modified_objects = [ModifiedObject(ob, {}) for ob in objs]
+    if registry.enabled:
+        registry.record(ROWS_CHANGED, len(modified_objects), model, CREATE, database=using)
     if modified_objects:
-        if tracking_info_ and tracking_info_.is_robust:
-            method = post_create_signal.send_robust
-        else:
-            method = post_create_signal.send
-        transaction.on_commit(
-            lambda: method(
-                objects=modified_objects,
-                sender=model,
-                tracking_info_=tracking_info_,
-            )
-        )
+        changeset = None
+        if _wants_changeset(post_create_signal, model):
+            changeset = ChangeSet.from_objects(model, modified_objects, CREATE)
+        _send_on_commit(CREATE, post_create_signal, model, modified_objects, tracking_info_, changeset, using)
 
 
 def send_post_update_signal(
@@ -80,46 +376,121 @@ def send_post_update_signal(
     model: type[BulkTrackerModel],
     old_values: dict[int, [dict[str, Any]]],  # {pk: changed_values}
     tracking_info_: TrackingInfo | None = None,
+    send_unchanged: bool = False,
+    using: str | None = None,
 ) -> None:
+    """
+    Send `post_update_signal` with the objects whose values changed.
+    With `send_unchanged` every object is sent, even without any changed value, which is what the receivers
+    of `payload="pks"` get.
+    """
+    using = using or DEFAULT_DB_ALIAS
     modified_objects = []
-    for obj in queryset:
-        changed = old_values[obj.pk]
-        diff_dict = {}
-        for key, old_value in changed.items():
-            if getattr(obj, key) != old_value:  # if new_values != old_value
-                diff_dict[key] = old_value
-        if diff_dict:
-            modified_objects.append(ModifiedObject(obj, diff_dict))
+    with registry.phase(DIFF, model, UPDATE, using, count_queries=False):
+        for obj in queryset:
+            changed = old_values[obj.pk]
+            diff_dict = {}
+            for key, old_value in changed.items():
+                if getattr(obj, model._meta.get_field(key).attname) != old_value:  # if new_values != old_value
+                    diff_dict[key] = old_value
+            if diff_dict or send_unchanged:
+                modified_objects.append(ModifiedObject(obj, diff_dict))
+        predicates = _get_predicates(model, tracking_info_)
+        if predicates is not None:
+
+            def get_value(modified_object: ModifiedObject, side: str, attname: str) -> Any:
+                if side == OLD and attname in modified_object.changed_values:
+                    return modified_object.changed_values[attname]
+                return modified_object.instance.__dict__.get(attname, UNKNOWN)
+
+            modified_objects = [
+                modified_object
+                for modified_object in modified_objects
+                if may_match(predicates, model, partial(get_value, modified_object))
+            ]
+    if registry.enabled:
+        registry.record(ROWS_CAPTURED, len(old_values), model, UPDATE, database=using)
+        registry.record(ROWS_CHANGED, len(modified_objects), model, UPDATE, database=using)
 
     if modified_objects:
-        if tracking_info_ and tracking_info_.is_robust:
-            method = post_update_signal.send_robust
-        else:
-            method = post_update_signal.send
-        transaction.on_commit(
-            lambda: method(
-                sender=model,
-                objects=modified_objects,
-                tracking_info_=tracking_info_,
-            )
+        _send_on_commit(UPDATE, post_update_signal, model, modified_objects, tracking_info_, using=using)
+
+
+def send_post_update_signal_from_values(
+    model: type[BulkTrackerModel],
+    using: str,
+    old_values: dict[Any, dict[str, Any]],  # {pk: {key: old_value}}
+    new_values: dict[Any, dict[str, Any]],  # {pk: {attname: new_value}}
+    tracking_info_: TrackingInfo | None = None,
+    send_unchanged: bool = False,
+    queryset: QuerySet | None = None,
+) -> None:
+    """
+    Send `post_update_signal` with the rows whose values changed, diffed from their old and new values.
+    The objects only hold their pk and `changed_values`, their instances are built from `new_values` when they are
+    accessed, or fetched from `queryset` in a single query if given.
+    """
+    attnames = {key: model._meta.get_field(key).attname for key in next(iter(old_values.values()), {})}
+    changed = {}
+    with registry.phase(DIFF, model, UPDATE, using, count_queries=False):
+        for pk, old in old_values.items():
+            new = new_values.get(pk)
+            if new is None:  # the row was deleted in the meantime
+                continue
+            diff_dict = {key: old_value for key, old_value in old.items() if new[attnames[key]] != old_value}
+            if diff_dict or send_unchanged:
+                changed[pk] = diff_dict
+        predicates = _get_predicates(model, tracking_info_)
+        if predicates is not None:
+            keys = {attname: key for key, attname in attnames.items()}
+
+            def get_value(pk: Any, side: str, attname: str) -> Any:
+                if side == OLD:
+                    return old_values[pk][keys[attname]] if attname in keys else UNKNOWN
+                return new_values[pk].get(attname, UNKNOWN)
+
+            changed = {
+                pk: diff_dict
+                for pk, diff_dict in changed.items()
+                if may_match(predicates, model, partial(get_value, pk))
+            }
+    if registry.enabled:
+        registry.record(ROWS_CAPTURED, len(old_values), model, UPDATE, database=using)
+        registry.record(ROWS_CHANGED, len(changed), model, UPDATE, database=using)
+    if not changed:
+        return
+
+    if queryset is None:
+        loader = ValuesLoader(model, using, {pk: new_values[pk] for pk in changed})
+    else:
+        loader = DatabaseLoader(queryset, list(changed))
+    modified_objects = [
+        ModifiedObject(pk=pk, changed_values=diff_dict, loader=loader) for pk, diff_dict in changed.items()
+    ]
+    changeset = None
+    if _wants_changeset(post_update_signal, model):
+        # built from the columns as they are, without materializing the instances
+        pks = list(changed)
+        changeset = ChangeSet(
+            model,
+            pks,
+            old={key: [old_values[pk][key] for pk in pks] for key in attnames},
+            new={key: [new_values[pk][attname] for pk in pks] for key, attname in attnames.items()},
+            changed={key: [row for row, pk in enumerate(pks) if key in changed[pk]] for key in attnames},
         )
+    _send_on_commit(UPDATE, post_update_signal, model, modified_objects, tracking_info_, changeset, using)
 
 
 def send_post_delete_signal(
     objs: Iterable[BulkTrackerModel],
     model: type[BulkTrackerModel],
     tracking_info_: TrackingInfo | None = None,
+    using: str | None = None,
 ):
+    using = using or DEFAULT_DB_ALIAS
     modified_objects = [ModifiedObject(ob, {}) for ob in objs]
+    if registry.enabled:
+        registry.record(ROWS_CAPTURED, len(modified_objects), model, DELETE, database=using)
+        registry.record(ROWS_CHANGED, len(modified_objects), model, DELETE, database=using)
     if modified_objects:
-        if tracking_info_ and tracking_info_.is_robust:
-            method = post_delete_signal.send_robust
-        else:
-            method = post_delete_signal.send
-        transaction.on_commit(
-            lambda: method(
-                objects=modified_objects,
-                sender=model,
-                tracking_info_=tracking_info_,
-            )
-        )
+        _send_on_commit(DELETE, post_delete_signal, model, modified_objects, tracking_info_, using=using)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from functools import wraps
+from typing import Any
+
+from django.db.models import JSONField, Model
+from django.db.models.signals import class_prepared
+from django.test.signals import setting_changed
+
+from bulk_tracker.changelog import uses_changelog
+from bulk_tracker.signals import post_update_signal
+
+
+# the key of the saved values of an instance in its `__dict__`, only set once a tracked field is assigned
+_SAVED = "_bulk_tracker_saved"
+# the key of the attnames assigned while they weren't tracked, they may have changed without being in `changed()`
+_UNTRACKED = "_bulk_tracker_untracked"
+# the saved value of a deferred field assigned before being loaded, it is read from the database when needed
+_UNKNOWN = object()
+# the fields whose values may be mutated in place, their saved value is read from the database once they were read
+_MUTABLE_FIELDS = {"JSONField", "ArrayField", "HStoreField"}
+
+
+def _reset_tracked(setting: str, **kwargs) -> None:
+    # the models of `BULK_TRACKER_CHANGELOG_MODELS` aren't tracked, i.e. with `override_settings()`
+    if setting == "BULK_TRACKER_CHANGELOG_MODELS":
+        post_update_signal.clear_subscriptions()
+
+
+setting_changed.connect(_reset_tracked)
+
+
+class FieldTracker:
+    """
+    A lightweight replacement of django-model-utils' `FieldTracker` for `BulkTrackerModel.save()`,
+    `tracker = FieldTracker()`, with the same `changed()`: the attnames of the fields that changed since the instance
+    was loaded or saved, with their saved values.
+
+    Nothing is stored when an instance is built or loaded, the saved value of a field is kept the first time
+    another value is assigned to it, in a dict holding only the assigned fields.
+    Only the fields the receivers of `post_update_signal` need are tracked, none while it has no receivers,
+    and only the ones of `fields` if given.
+    A tracker declared on an abstract model gets its own copy for each concrete subclass.
+    The saved value of a field that may be mutated in place, i.e. a JSONField, is copied when another value is
+    assigned to it, and read from the database by `changed()` once its value was read, since it may have been mutated.
+    """
+
+    def __init__(self, fields: list[str] | None = None):
+        self.fields = fields
+        self.model: type[Model] | None = None
+        self.name = ""
+        self.attnames: frozenset[str] = frozenset()
+        # the tracked fields whose values may be mutated in place, their saved values are deep copies
+        self.mutable_attnames: frozenset[str] = frozenset()
+        self._declared_on: type[Model] | None = None
+        # the attnames tracked for each model, i.e. a proxy, with the version of the subscriptions they were resolved for
+        self._tracked: dict[type[Model], tuple[int, frozenset[str]]] = {}
+
+    def contribute_to_class(self, cls: type[Model], name: str) -> None:
+        self.name = name
+        self._declared_on = cls
+        # the subclasses of an abstract model inherit the tracker without contributing it again
+        class_prepared.connect(self.prepare_class)
+        setattr(cls, name, self)
+
+    def prepare_class(self, sender: type[Model], **kwargs) -> None:
+        if not issubclass(sender, self._declared_on) or sender._meta.abstract or sender._meta.proxy:
+            return
+        if sender is self._declared_on:
+            self.finalize_class(sender)
+        elif self.name not in sender.__dict__:  # the subclasses declaring their own tracker are left to it
+            tracker = self.__class__(self.fields)
+            tracker.name = self.name
+            tracker._declared_on = sender
+            setattr(sender, self.name, tracker)
+            tracker.finalize_class(sender)
+
+    def finalize_class(self, sender: type[Model], **kwargs) -> None:
+        self.model = sender
+        if self.fields is None:
+            self.attnames = frozenset(field.attname for field in sender._meta.concrete_fields)
+        else:
+            self.attnames = frozenset(sender._meta.get_field(name).attname for name in self.fields)
+        self.mutable_attnames = frozenset(
+            field.attname
+            for field in sender._meta.concrete_fields
+            if field.attname in self.attnames
+            and (isinstance(field, JSONField) or field.get_internal_type() in _MUTABLE_FIELDS)
+        )
+        for attname in self.mutable_attnames:
+            setattr(sender, attname, _MutableAttribute(self, attname, getattr(sender, attname)))
+        self._patch_setattr(sender)
+        self._patch(sender, "save_base", "update_fields")
+        self._patch(sender, "refresh_from_db", "fields")
+
+    def __get__(self, instance: Model | None, owner: type[Model]) -> FieldTracker | FieldInstanceTracker:
+        if instance is None:
+            return self
+        return FieldInstanceTracker(instance, self)
+
+    def get_tracked(self, model: type[Model]) -> frozenset[str]:
+        """
+        The attnames tracked for the instances of `model`, the ones the receivers of `post_update_signal` need.
+        They are resolved once per model until a receiver is connected or disconnected.
+        """
+        version = post_update_signal.version
+        cached = self._tracked.get(model)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        subscription = post_update_signal.get_subscription(model)
+        if subscription is None or uses_changelog(model):  # the changelog triggers capture its changes
+            tracked = frozenset()
+        elif subscription.fields is None:
+            tracked = self.attnames
+        else:
+            tracked = self.attnames & subscription.fields
+        self._tracked[model] = (version, tracked)
+        return tracked
+
+    def keep_saved_value(self, instance: Model, attname: str, read: bool = False) -> None:
+        """
+        Keep the saved value of `attname` before another value is assigned to it, or before a mutable field is read,
+        if it's tracked, otherwise remember it may change without being in `changed()`, so `save()` can't skip it.
+        """
+        values = instance.__dict__
+        if attname not in self.get_tracked(type(instance)):
+            values.setdefault(_UNTRACKED, set()).add(attname)
+            return
+        saved = values.setdefault(_SAVED, {})
+        if read or attname not in values:
+            # a deferred field is loaded by `refresh_from_db()`, which discards this, and a mutable field may be
+            # mutated once read, their saved values are read from the database if `changed()` is called
+            saved[attname] = _UNKNOWN
+        elif attname in self.mutable_attnames:
+            # the value may be shared with, and mutated by, something else
+            saved[attname] = deepcopy(values[attname])
+        else:
+            saved[attname] = values[attname]
+
+    def _patch_setattr(self, model: type[Model]) -> None:
+        original = model.__setattr__
+        tracker = self
+        attnames = self.attnames
+        # the fields whose descriptor doesn't handle the assignment, i.e. not the foreign keys, are set directly
+        direct = frozenset(
+            attname for attname in attnames if not hasattr(type(getattr(model, attname, None)), "__set__")
+        )
+
+        def __setattr__(instance: Model, name: str, value: Any) -> None:
+            if name in attnames:
+                values = instance.__dict__
+                # the values set while the instance is built aren't in its `__dict__` yet, so this is skipped for them
+                if name in values or instance._state.db is not None:
+                    saved = values.get(_SAVED)
+                    if (saved is None or name not in saved) and name not in values.get(_UNTRACKED, ()):
+                        tracker.keep_saved_value(instance, name)
+                if name in direct:
+                    values[name] = value
+                    return
+            original(instance, name, value)
+
+        model.__setattr__ = __setattr__
+
+    def _patch(self, model: type[Model], method: str, fields_kwarg: str) -> None:
+        """Forget the saved values of the fields written by `method`, they are the saved ones now"""
+        original = getattr(model, method)
+        tracker = self
+
+        @wraps(original)
+        def inner(instance: Model, *args, **kwargs):
+            result = original(instance, *args, **kwargs)
+            FieldInstanceTracker(instance, tracker).set_saved_fields(kwargs.get(fields_kwarg))
+            return result
+
+        setattr(model, method, inner)
+
+
+class FieldInstanceTracker:
+    """The tracker of one instance, `instance.tracker`"""
+
+    __slots__ = ("instance", "tracker")
+
+    def __init__(self, instance: Model, tracker: FieldTracker):
+        self.instance = instance
+        self.tracker = tracker
+
+    def changed(self) -> dict[str, Any]:
+        """The attnames of the fields that changed since the instance was loaded or saved, with their saved values"""
+        values = self.instance.__dict__
+        saved = values.get(_SAVED)
+        if not saved:
+            return {}
+        unknown = [attname for attname, value in saved.items() if value is _UNKNOWN]
+        if unknown:
+            self._load_saved(saved, unknown)
+        return {attname: value for attname, value in saved.items() if values.get(attname) != value}
+
+    def has_changed(self, field: str) -> bool:
+        return self._get_attname(field) in self.changed()
+
+    def previous(self, field: str) -> Any:
+        """The saved value of `field`, its current value if it didn't change"""
+        attname = self._get_attname(field)
+        return self.changed().get(attname, self.instance.__dict__.get(attname))
+
+    def get_untracked(self) -> set[str]:
+        """The attnames assigned while they weren't tracked since the instance was loaded or saved"""
+        return self.instance.__dict__.get(_UNTRACKED, set())
+
+    def set_saved_fields(self, fields: list[str] | None = None) -> None:
+        """Consider the current values of `fields`, or of all the fields, as the saved ones"""
+        values = self.instance.__dict__
+        saved = values.get(_SAVED)
+        untracked = values.get(_UNTRACKED)
+        if not saved and not untracked:
+            return
+        if fields is None:
+            values.pop(_SAVED, None)
+            values.pop(_UNTRACKED, None)
+            return
+        for field in fields:
+            attname = self._get_attname(field)
+            if saved:
+                saved.pop(attname, None)
+            if untracked:
+                untracked.discard(attname)
+
+    def _get_attname(self, field: str) -> str:
+        return self.instance._meta.get_field(field).attname
+
+    def _load_saved(self, saved: dict[str, Any], attnames: list[str]) -> None:
+        instance = self.instance
+        row = (
+            instance.__class__._base_manager.using(instance._state.db).filter(pk=instance.pk).values(*attnames).first()
+        )
+        for attname in attnames:
+            saved[attname] = None if row is None else row[attname]
+
+
+class _MutableAttribute:
+    """
+    Wraps the descriptor of a field whose value may be mutated in place, i.e. the dict of a JSONField,
+    to mark its saved value as unknown the first time it is read, so `changed()` reads it from the database and sees
+    the mutations. Nothing is copied, the instances whose value isn't read or saved don't pay for it.
+    """
+
+    def __init__(self, tracker: FieldTracker, attname: str, descriptor: Any):
+        self.tracker = tracker
+        self.attname = attname
+        self.descriptor = descriptor
+
+    def __get__(self, instance: Model | None, owner: type[Model]) -> Any:
+        if instance is None:
+            return self.descriptor
+        value = self.descriptor.__get__(instance, owner)
+        values = instance.__dict__
+        saved = values.get(_SAVED)
+        # the value of an instance that isn't saved yet has nothing to be compared to
+        if (
+            (saved is None or self.attname not in saved)
+            and self.attname not in values.get(_UNTRACKED, ())
+            and not instance._state.adding
+        ):
+            self.tracker.keep_saved_value(instance, self.attname, read=True)
+        return value
+
+    def __set__(self, instance: Model, value: Any) -> None:
+        instance.__dict__[self.attname] = value
@@ -1,5 +1,140 @@
 from __future__ import annotations
 
+from collections.abc import Collection, Sequence
+from decimal import Decimal
+from typing import Any
 
-def get_old_values(obj, kwargs):
-    return {key: getattr(obj, key) for key, value in kwargs.items()}
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import DateTimeField, DecimalField, Field, Model, QuerySet
+from django.db.models.base import ModelState
+from django.utils import timezone
+
+
+def get_update_fields(model: type[Model], kwargs: dict[str, Any]) -> dict[str, Field]:
+    # `update()` accepts both the name and the attname of a field, i.e. `author` and `author_id`
+    return {key: model._meta.get_field(key) for key in kwargs}
+
+
+def get_old_values(queryset: QuerySet, kwargs: dict[str, Any]) -> dict[Any, dict[str, Any]]:
+    """
+    Capture the current values of the fields that are about to be updated as `{pk: {attname: old_value}}`.
+    Only the updated columns are selected, without the model's default ordering unless the queryset is sliced,
+    and no instances are built.
+    Foreign keys are captured and keyed by their attname, so they hold and are compared by their raw value.
+    """
+    attnames = [field.attname for field in get_update_fields(queryset.model, kwargs).values()]
+    if not queryset.query.is_sliced:
+        queryset = queryset.order_by()
+    rows = queryset.values_list("pk", *attnames)
+    return {pk: dict(zip(attnames, values)) for pk, *values in rows}
+
+
+def get_new_values(model: type[Model], kwargs: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    The values the updated fields will have after `update(**kwargs)` keyed by attname,
+    or None if any of them is an expression (`F()`, `Case()`, subqueries...) that is only known to the database,
+    or a value the database stores differently, i.e. a decimal with more places than its field.
+    """
+    new_values = {}
+    for key, value in kwargs.items():
+        if hasattr(value, "resolve_expression"):
+            return None
+        field = model._meta.get_field(key)
+        if isinstance(value, Model):  # foreign keys can be updated with an instance
+            value = getattr(value, field.target_field.attname)
+        try:
+            value = field.to_python(value)
+        except ValidationError:
+            # the database may still accept the value, let it tell us what it stored
+            return None
+        if isinstance(field, DateTimeField) and settings.USE_TZ and value is not None and timezone.is_naive(value):
+            # the same conversion DateTimeField.get_prep_value() does before saving a naive datetime
+            value = timezone.make_aware(value, timezone.get_default_timezone())
+        if isinstance(field, DecimalField) and value is not None:
+            places = Decimal(1).scaleb(-field.decimal_places)
+            if value != value.quantize(places):
+                # each database rounds it its own way, let it tell us what it stored
+                return None
+            # the value as it's read back, i.e. `Decimal("2.50")` for `Decimal("2.5")`
+            value = value.quantize(places)
+        new_values[field.attname] = value
+    return new_values
+
+
+def get_unique_keys(model: type[Model]) -> list[tuple[str, ...]]:
+    """
+    The attnames of every set of fields whose values identify a row: the pk, the unique fields, `unique_together`
+    and the unique constraints without a condition nor expressions.
+    """
+    opts = model._meta
+    keys = [(opts.pk.attname,)]
+    keys.extend((field.attname,) for field in opts.concrete_fields if field.unique and not field.primary_key)
+    names = [*opts.unique_together, *(constraint.fields for constraint in opts.total_unique_constraints)]
+    keys.extend(tuple(opts.get_field(name).attname for name in fields) for fields in names)
+    return list(dict.fromkeys(keys))
+
+
+def get_key_values(instance: Model, key: Sequence[str]) -> tuple | None:
+    """
+    The values of the fields of `key` of `instance`, as they are read from the database,
+    or None if any of them is None, since such a row can't conflict with another one.
+    """
+    values = []
+    for attname in key:
+        value = getattr(instance, attname)
+        if value is None:
+            return None
+        try:
+            value = instance._meta.get_field(attname).to_python(value)
+        except ValidationError:
+            pass
+        values.append(value)
+    return tuple(values)
+
+
+def build_instance(model: type[Model], using: str, values: dict[str, Any]) -> Model:
+    """
+    Build an instance from the database values of some of its fields, keyed by attname.
+    The fields that are not in `values` are deferred, the same way as `.only()` does.
+    """
+    field_names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db(using, field_names, [values[attname] for attname in field_names])
+
+
+def snapshot_instance(instance: Model, attnames: Collection[str] | None = None) -> Model:
+    """
+    A detached copy of `instance` that only holds the loaded values of its concrete fields,
+    or only the values of `attnames` and of the pk when given.
+    Unlike `deepcopy()`, the related objects cache and the state of the trackers aren't copied,
+    and `__init__()` isn't called.
+    """
+    model = instance.__class__
+    values = instance.__dict__
+    return build_detached_instance(
+        model,
+        instance._state.db,
+        {attname: values[attname] for attname in get_snapshot_attnames(model, attnames) if attname in values},
+    )
+
+
+def get_snapshot_attnames(model: type[Model], attnames: Collection[str] | None) -> list[str]:
+    """The attnames a snapshot holds for the requested `attnames`: all of them if None, always including the pk"""
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if attnames is None or field.attname in attnames or field.primary_key
+    ]
+
+
+def build_detached_instance(model: type[Model], using: str | None, values: dict[str, Any]) -> Model:
+    """
+    An instance holding `values` keyed by attname, built without calling `__init__()`,
+    so no `pre_init`/`post_init` signals are sent and no tracker is initialized.
+    """
+    instance = model.__new__(model)
+    instance._state = ModelState()
+    instance._state.db = using
+    instance._state.adding = False
+    instance.__dict__.update(values)
+    return instance
@@ -3,11 +3,15 @@ import os
 import sys
 
 from django.core.management import execute_from_command_line
+from django.core.management.commands.test import Command as TestCommand
 
 
 def runtests():
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
     argv = sys.argv[:1] + ["test"] + sys.argv[1:]
+    # only the `tests` package by default, `benchmarks` needs its own settings (see benchmarks/README.md)
+    if not TestCommand().create_parser(argv[0], "test").parse_args(sys.argv[1:]).args:
+        argv.append("tests")
     execute_from_command_line(argv)
 
 
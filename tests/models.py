@@ -1,7 +1,8 @@
 from django.db import models
-from model_utils import FieldTracker
+from model_utils import FieldTracker as ModelUtilsFieldTracker
 
 from bulk_tracker.models import BulkTrackerModel
+from bulk_tracker.tracker import FieldTracker
 
 
 class Author(BulkTrackerModel):
@@ -17,3 +18,44 @@ class Post(BulkTrackerModel):
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="posts")
 
     tracker = FieldTracker()
+
+
+class Comment(BulkTrackerModel):
+    text = models.CharField(max_length=255)
+    author = models.ForeignKey(Author, null=True, on_delete=models.SET_NULL, related_name="comments")
+
+    tracker = FieldTracker()
+
+
+class Product(BulkTrackerModel):
+    name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=8, decimal_places=2)
+
+    tracker = FieldTracker()
+
+
+class Attachment(BulkTrackerModel):
+    name = models.CharField(max_length=255)
+    content = models.BinaryField()
+
+    tracker = FieldTracker()
+
+
+class TrackedModel(BulkTrackerModel):
+    tracker = FieldTracker()
+
+    class Meta:
+        abstract = True
+
+
+class Profile(TrackedModel):
+    name = models.CharField(max_length=255)
+    settings = models.JSONField(default=dict)
+
+
+class Tag(BulkTrackerModel):
+    name = models.CharField(max_length=100, unique=True)
+    usage_count = models.IntegerField(default=0)
+
+    # django-model-utils' tracker still works with `save()`
+    tracker = ModelUtilsFieldTracker()
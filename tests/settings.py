@@ -1,5 +1,7 @@
 INSTALLED_APPS = (
     "bulk_tracker",
+    "bulk_tracker.outbox",
+    "bulk_tracker.changelog",
     "tests",
 )
 DATABASES = {
@@ -7,6 +9,10 @@ DATABASES = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
     },
+    "other": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
 }
 SECRET_KEY = "dummy"
 
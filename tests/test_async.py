@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+
+from django.test import TransactionTestCase
+
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.signals import (
+    post_create_signal,
+    post_delete_signal,
+    post_update_signal,
+)
+from tests.models import Author, Post
+
+
+class TestAsync(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        Post.objects.create(title="Defend the Lie", publish_date="1999-05-19", author=self.author_john)
+        Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+
+        self.signals_called_with = []
+        self.titles_sent = []
+
+        async def receiver(
+            sender,
+            signal,
+            objects: list[ModifiedObject[Post]],
+            tracking_info_: TrackingInfo | None = None,
+            **kwargs,
+        ):
+            self.signals_called_with.append((signal, objects, tracking_info_))
+            # the instances may be modified after the signal, i.e. when the same instance is saved again
+            self.titles_sent.append((signal, objects[0].instance.title))
+
+        self.receiver = receiver
+        for signal in (post_create_signal, post_update_signal, post_delete_signal):
+            signal.connect(receiver, sender=Post)
+
+    def tearDown(self):
+        for signal in (post_create_signal, post_update_signal, post_delete_signal):
+            signal.disconnect(self.receiver, sender=Post)
+
+    async def test_aupdate_should_run_async_receivers_concurrently(self):
+        # Arrange
+        started = asyncio.Event()
+        finished = []
+
+        async def waiting_receiver(sender, **kwargs):
+            # only returns if the other receiver runs while this one is waiting
+            await asyncio.wait_for(started.wait(), timeout=1)
+            finished.append("waiting")
+
+        async def starting_receiver(sender, **kwargs):
+            started.set()
+            finished.append("starting")
+
+        post_update_signal.connect(waiting_receiver, sender=Post)
+        post_update_signal.connect(starting_receiver, sender=Post)
+        tracking_info = TrackingInfo(comment="async")
+
+        # Act
+        updated = await Post.objects.filter(title="Cold Vice").aupdate(title="Hot Vice", tracking_info_=tracking_info)
+
+        # Assert
+        post_update_signal.disconnect(waiting_receiver, sender=Post)
+        post_update_signal.disconnect(starting_receiver, sender=Post)
+        self.assertEqual(1, updated)
+        self.assertEqual(["starting", "waiting"], finished)
+        ((signal, objects, info),) = self.signals_called_with
+        self.assertEqual(post_update_signal, signal)
+        self.assertIs(tracking_info, info)
+        self.assertEqual({"title": "Cold Vice"}, objects[0].changed_values)
+
+    async def test_async_operations_should_emit_their_signals(self):
+        # Act
+        (created,) = await Post.objects.abulk_create(
+            [Post(title="Prince's Advent", publish_date="1999-05-19", author=self.author_john)]
+        )
+        created.title = "Prince's Return"
+        await Post.objects.abulk_update([created], fields=["title"])
+        await Post.objects.filter(pk=created.pk).adelete()
+
+        post = Post(title="The Midnight Wolf", publish_date="2002-01-12", author=self.author_john)
+        await post.asave()
+        post.title = "The Sunset Wolf"
+        await post.asave()
+        await post.adelete()
+
+        # Assert
+        self.assertEqual(
+            [
+                (post_create_signal, "Prince's Advent"),
+                (post_update_signal, "Prince's Return"),
+                (post_delete_signal, "Prince's Return"),
+                (post_create_signal, "The Midnight Wolf"),
+                (post_update_signal, "The Sunset Wolf"),
+                (post_delete_signal, "The Sunset Wolf"),
+            ],
+            self.titles_sent,
+        )
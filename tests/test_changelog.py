@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import datetime
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.migrations.state import ProjectState
+from django.test import TransactionTestCase, override_settings
+
+from bulk_tracker.changelog import decode_values, drain_changelog
+from bulk_tracker.changelog.models import ChangeLogEntry
+from bulk_tracker.helper_objects import ModifiedObject
+from bulk_tracker.operations import InstallChangeLogTriggers
+from bulk_tracker.signals import (
+    post_create_signal,
+    post_delete_signal,
+    post_update_signal,
+)
+from tests.models import Attachment, Author, Post
+
+
+@override_settings(BULK_TRACKER_CHANGELOG_MODELS=["tests.Post"])
+class TestChangeLog(TransactionTestCase):
+    def setUp(self):
+        self.operation = InstallChangeLogTriggers("Post")
+        self.state = ProjectState.from_apps(apps)
+        with connection.schema_editor() as editor:
+            self.operation.database_forwards("tests", editor, self.state, self.state)
+
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        self.cold_vice = Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+        self.untitled = Post.objects.create(title="Untitled", publish_date="2000-09-12", author=self.author_john)
+        self.sent = []
+
+        def receiver(signal, sender, objects: list[ModifiedObject[Post]], **kwargs):
+            self.sent.append((signal, objects))
+
+        self.receiver = receiver
+        for signal in (post_create_signal, post_update_signal, post_delete_signal):
+            signal.connect(receiver, sender=Post)
+
+    def tearDown(self):
+        for signal in (post_create_signal, post_update_signal, post_delete_signal):
+            signal.disconnect(self.receiver, sender=Post)
+        with connection.schema_editor() as editor:
+            self.operation.database_backwards("tests", editor, self.state, self.state)
+
+    def test_update_should_be_sent_from_the_changelog_once_committed(self):
+        # Act
+        with transaction.atomic():
+            with self.assertNumQueries(1):  # the UPDATE alone, the rows are captured by the triggers
+                Post.objects.filter(author=self.author_john).update(title="Untitled")
+            self.assertEqual([], self.sent)
+
+        # Assert
+        signal, objects = self.sent[0]
+        self.assertIs(post_update_signal, signal)
+        self.assertEqual([self.cold_vice.pk], [modified_object.pk for modified_object in objects])
+        self.assertEqual({"title": "Cold Vice"}, objects[0].changed_values)
+        self.assertEqual(datetime.date(2001, 7, 22), objects[0].instance.publish_date)
+        self.assertFalse(ChangeLogEntry.objects.exists())
+
+    def test_raw_sql_should_be_sent_by_the_next_drain(self):
+        # Arrange
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE tests_post SET title = 'Hot Vice' WHERE id = %s", [self.cold_vice.pk])
+
+        # Act
+        sent = drain_changelog()
+
+        # Assert
+        self.assertEqual(1, sent)
+        signal, objects = self.sent[0]
+        self.assertIs(post_update_signal, signal)
+        self.assertEqual("Hot Vice", objects[0].instance.title)
+        self.assertEqual({"title": "Cold Vice"}, objects[0].changed_values)
+
+    def test_raw_delete_should_send_the_deleted_rows(self):
+        # Act
+        Post.objects.filter(author=self.author_john)._raw_delete(using="default")
+        drain_changelog()
+
+        # Assert
+        signal, objects = self.sent[0]
+        self.assertIs(post_delete_signal, signal)
+        self.assertEqual(["Cold Vice", "Untitled"], [modified_object.instance.title for modified_object in objects])
+
+    def test_create_save_and_delete_should_be_sent_in_order(self):
+        # Act
+        post = Post.objects.create(title="Defend the Lie", publish_date="1999-05-19", author=self.author_john)
+        post.title = "Defend the Truth"
+        post.save()
+        Post.objects.filter(pk=post.pk).delete()
+
+        # Assert
+        self.assertEqual(
+            [post_create_signal, post_update_signal, post_delete_signal], [signal for signal, _objects in self.sent]
+        )
+        self.assertEqual({"title": "Defend the Lie"}, self.sent[1][1][0].changed_values)
+
+    def test_rolled_back_operation_should_not_be_sent(self):
+        # Act
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                Post.objects.update(title="Hot Vice")
+                raise ValueError
+
+        # Assert
+        self.assertEqual([], self.sent)
+        self.assertFalse(ChangeLogEntry.objects.exists())
+
+    def test_receiver_fields_should_only_get_the_changes_of_their_fields(self):
+        # Arrange
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        post_update_signal.connect(self.receiver, sender=Post, fields=["publish_date"])
+
+        # Act
+        Post.objects.filter(pk=self.cold_vice.pk).update(title="Hot Vice")
+        Post.objects.filter(pk=self.cold_vice.pk).update(publish_date="2002-07-22")
+
+        # Assert
+        ((_signal, objects),) = self.sent
+        self.assertEqual({"publish_date": datetime.date(2001, 7, 22)}, objects[0].changed_values)
+
+    def test_removed_triggers_should_not_write_the_changelog(self):
+        # Arrange
+        with connection.schema_editor() as editor:
+            self.operation.database_backwards("tests", editor, self.state, self.state)
+
+        # Act
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE tests_post SET title = 'Hot Vice'")
+
+        # Assert
+        self.assertFalse(ChangeLogEntry.objects.exists())
+
+    def test_decode_values_should_skip_the_columns_without_a_field(self):
+        # Arrange
+        columns = {field.column: field for field in Post._meta.concrete_fields}
+
+        # Act
+        values = decode_values(columns, {"id": self.cold_vice.pk, "title": "Cold Vice", "subtitle": "Dropped"})
+
+        # Assert
+        self.assertEqual({"id": self.cold_vice.pk, "title": "Cold Vice"}, values)
+
+    @override_settings(BULK_TRACKER_CHANGELOG_MODELS=["tests.Post", "tests.Attachment"])
+    def test_binary_fields_should_be_left_out_of_the_changelog(self):
+        # Arrange
+        operation = InstallChangeLogTriggers("Attachment")
+        with connection.schema_editor() as editor:
+            operation.database_forwards("tests", editor, self.state, self.state)
+        sent = []
+
+        def receiver(sender, objects: list[ModifiedObject[Attachment]], **kwargs):
+            sent.extend(objects)
+
+        post_update_signal.connect(receiver, sender=Attachment)
+
+        # Act
+        attachment = Attachment.objects.create(name="cover.png", content=b"\x89PNG")
+        Attachment.objects.filter(pk=attachment.pk).update(name="cover-v2.png", content=b"\x89PNG2")
+
+        # Assert
+        post_update_signal.disconnect(receiver, sender=Attachment)
+        with connection.schema_editor() as editor:
+            operation.database_backwards("tests", editor, self.state, self.state)
+        self.assertEqual({"name": "cover.png"}, sent[0].changed_values)
+        self.assertEqual({"content"}, sent[0].instance.get_deferred_fields())
+        self.assertEqual(b"\x89PNG2", bytes(sent[0].instance.content))
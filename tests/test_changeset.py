@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import importlib.util
+from unittest import skipIf, skipUnless
+
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from bulk_tracker.changeset import ChangeSet
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.signals import post_create_signal, post_update_signal
+from tests.models import Author, Post
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
+
+
+class TestChangeSet(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        self.author_jane = Author.objects.create(first_name="Jane", last_name="Doe")
+        self.cold_vice = Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+        self.sound_of_winter = Post.objects.create(
+            title="Sound of Winter", publish_date="2000-09-12", author=self.author_jane
+        )
+        self.signal_called_with = {}
+
+        def receiver(sender, objects: list[ModifiedObject[Post]], changeset: ChangeSet | None = None, **kwargs):
+            self.signal_called_with["objects"] = objects
+            self.signal_called_with["changeset"] = changeset
+
+        self.receiver = receiver
+
+    def test_update_should_send_the_changeset_to_the_receivers_that_want_it(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post, changeset=True)
+
+        # Act
+        Post.objects.filter(pk__in=[self.cold_vice.pk, self.sound_of_winter.pk]).update(author=self.author_jane)
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        changeset = self.signal_called_with["changeset"]
+        self.assertEqual([self.cold_vice.pk], changeset.pks)  # the unchanged row isn't sent
+        self.assertEqual({"author_id": [self.author_john.pk]}, changeset.old)
+        self.assertEqual({"author_id": [self.author_jane.pk]}, changeset.new)
+        self.assertEqual([self.cold_vice.pk], changeset.changed_pks("author"))
+        self.assertEqual(
+            {
+                "pk": [self.cold_vice.pk],
+                "old__author_id": [self.author_john.pk],
+                "new__author_id": [self.author_jane.pk],
+            },
+            changeset.columns(),
+        )
+        self.assertFalse(self.signal_called_with["objects"][0].is_loaded)
+
+    def test_update_should_not_send_a_changeset_if_no_receiver_wants_it(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post)
+
+        # Act
+        Post.objects.filter(pk=self.cold_vice.pk).update(title="Hot Vice")
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        self.assertIsNone(self.signal_called_with["changeset"])
+
+    def test_create_should_send_the_new_values(self):
+        # Arrange
+        post_create_signal.connect(self.receiver, sender=Post, changeset=True)
+
+        # Act
+        post = Post.objects.create(title="Defend the Lie", publish_date="1999-05-19", author=self.author_john)
+
+        # Assert
+        post_create_signal.disconnect(self.receiver, sender=Post)
+        changeset = self.signal_called_with["changeset"]
+        self.assertEqual([post.pk], changeset.pks)
+        self.assertEqual({}, changeset.old)
+        self.assertEqual(["Defend the Lie"], changeset.new["title"])
+        self.assertEqual([0], changeset.changed_rows("title"))
+
+    def test_coalesced_update_should_send_the_changeset_of_the_net_effect(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post, changeset=True)
+        tracking_info = TrackingInfo(coalesce=True)
+
+        # Act
+        with transaction.atomic():
+            Post.objects.filter(pk=self.cold_vice.pk).update(title="Hot Vice", tracking_info_=tracking_info)
+            Post.objects.filter(pk=self.cold_vice.pk).update(title="Warm Vice", tracking_info_=tracking_info)
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        changeset = self.signal_called_with["changeset"]
+        self.assertEqual([self.cold_vice.pk], changeset.pks)
+        self.assertEqual({"title": ["Cold Vice"]}, changeset.old)
+        self.assertEqual({"title": ["Warm Vice"]}, changeset.new)
+
+    @skipIf(HAS_NUMPY, "numpy is installed")
+    def test_to_numpy_should_raise_if_numpy_is_not_installed(self):
+        changeset = ChangeSet(Post, [1], {}, {}, {})
+        with self.assertRaisesMessage(ImportError, "requires numpy"):
+            changeset.to_numpy()
+
+    @skipUnless(HAS_PANDAS, "pandas isn't installed")
+    def test_to_pandas_should_index_the_columns_by_pk(self):
+        changeset = ChangeSet(Post, [1, 2], {"title": ["a", "b"]}, {"title": ["c", "b"]}, {"title": [0]})
+        dataframe = changeset.to_pandas()
+        self.assertEqual(["old__title", "new__title"], list(dataframe.columns))
+        self.assertEqual("c", dataframe.loc[1, "new__title"])
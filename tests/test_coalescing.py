@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.signals import (
+    post_create_signal,
+    post_delete_signal,
+    post_update_signal,
+)
+from tests.models import Author, Post
+
+
+class TestCoalescing(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        self.defend_the_lie = Post.objects.create(
+            title="Defend the Lie", publish_date="1999-05-19", author=self.author_john
+        )
+        self.cold_vice = Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+        self.sound_of_winter = Post.objects.create(
+            title="Sound of Winter", publish_date="2000-09-12", author=self.author_john
+        )
+
+        self.signals_called_with = []
+
+        def receiver(
+            sender,
+            signal,
+            objects: list[ModifiedObject[Post]],
+            tracking_info_: TrackingInfo | None = None,
+            **kwargs,
+        ):
+            self.signals_called_with.append((signal, objects, tracking_info_))
+
+        self.receiver = receiver
+        for signal in (post_create_signal, post_update_signal, post_delete_signal):
+            signal.connect(receiver, sender=Post)
+
+    def tearDown(self):
+        for signal in (post_create_signal, post_update_signal, post_delete_signal):
+            signal.disconnect(self.receiver, sender=Post)
+
+    def test_coalesce_should_send_the_net_effect_of_the_transaction_once_per_signal(self):
+        # Arrange
+        tracking_info = TrackingInfo(coalesce=True)
+
+        # Act
+        with transaction.atomic():
+            created, created_then_deleted = Post.objects.bulk_create(
+                [
+                    Post(title="Prince's Advent", publish_date="1999-05-19", author=self.author_john),
+                    Post(title="The Midnight Wolf", publish_date="2002-01-12", author=self.author_john),
+                ],
+                tracking_info_=tracking_info,
+            )
+            Post.objects.filter(pk=created.pk).update(title="The Sunset Wolf", tracking_info_=tracking_info)
+            Post.objects.filter(pk=created_then_deleted.pk).delete(tracking_info_=tracking_info)
+
+            Post.objects.filter(pk=self.defend_the_lie.pk).update(
+                title="Defend the Truth", tracking_info_=tracking_info
+            )
+            Post.objects.filter(pk=self.defend_the_lie.pk).update(
+                title="Defend Nothing", publish_date="2000-01-01", tracking_info_=tracking_info
+            )
+            Post.objects.filter(pk=self.cold_vice.pk).update(title="Hot Vice", tracking_info_=tracking_info)
+            Post.objects.filter(pk=self.cold_vice.pk).update(title="Cold Vice", tracking_info_=tracking_info)
+            Post.objects.filter(pk=self.sound_of_winter.pk).update(
+                title="Sound of Summer", tracking_info_=tracking_info
+            )
+            Post.objects.filter(pk=self.sound_of_winter.pk).delete(tracking_info_=tracking_info)
+
+            self.assertEqual([], self.signals_called_with)
+
+        # Assert
+        self.assertEqual(
+            [post_create_signal, post_update_signal, post_delete_signal],
+            [signal for signal, _objects, _tracking_info in self.signals_called_with],
+        )
+        self.assertTrue(all(info is tracking_info for _signal, _objects, info in self.signals_called_with))
+        (_, created_objects, _), (_, updated_objects, _), (_, deleted_objects, _) = self.signals_called_with
+
+        self.assertEqual([created.pk], [o.instance.pk for o in created_objects])
+        self.assertEqual("The Sunset Wolf", created_objects[0].instance.title)
+        self.assertEqual({}, created_objects[0].changed_values)
+
+        self.assertEqual([self.defend_the_lie.pk], [o.instance.pk for o in updated_objects])
+        self.assertEqual("Defend Nothing", updated_objects[0].instance.title)
+        self.assertEqual(
+            {"title": "Defend the Lie", "publish_date": self.defend_the_lie.publish_date},
+            {key: str(value) for key, value in updated_objects[0].changed_values.items()},
+        )
+
+        self.assertEqual([self.sound_of_winter.pk], [o.instance.pk for o in deleted_objects])
+
+    def test_coalesce_should_drop_operations_rolled_back_with_a_savepoint(self):
+        # Arrange
+        tracking_info = TrackingInfo(coalesce=True)
+
+        # Act
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Post.objects.filter(pk=self.cold_vice.pk).update(title="Hot Vice", tracking_info_=tracking_info)
+                    raise ValueError
+            except ValueError:
+                pass
+            Post.objects.filter(pk=self.defend_the_lie.pk).update(
+                title="Defend the Truth", tracking_info_=tracking_info
+            )
+
+        # Assert
+        self.assertEqual(1, len(self.signals_called_with))
+        signal, objects, _tracking_info = self.signals_called_with[0]
+        self.assertEqual(post_update_signal, signal)
+        self.assertEqual([self.defend_the_lie.pk], [o.instance.pk for o in objects])
+
+    def test_coalesce_should_not_send_anything_when_the_transaction_is_rolled_back(self):
+        # Arrange
+        tracking_info = TrackingInfo(coalesce=True)
+
+        # Act
+        try:
+            with transaction.atomic():
+                Post.objects.filter(pk=self.cold_vice.pk).update(title="Hot Vice", tracking_info_=tracking_info)
+                raise ValueError
+        except ValueError:
+            pass
+        with transaction.atomic():
+            Post.objects.filter(pk=self.defend_the_lie.pk).update(
+                title="Defend the Truth", tracking_info_=tracking_info
+            )
+
+        # Assert
+        self.assertEqual(1, len(self.signals_called_with))
+        _signal, objects, _tracking_info = self.signals_called_with[0]
+        self.assertEqual([self.defend_the_lie.pk], [o.instance.pk for o in objects])
+
+    def test_coalesce_should_send_the_created_instance_with_the_updated_values(self):
+        # Arrange
+        tracking_info = TrackingInfo(coalesce=True)
+
+        # Act
+        with transaction.atomic():
+            (created,) = Post.objects.bulk_create(
+                [Post(title="The Midnight Wolf", publish_date="2002-01-12", author=self.author_john)],
+                tracking_info_=tracking_info,
+            )
+            Post.objects.filter(pk=created.pk).update(title="The Sunset Wolf", tracking_info_=tracking_info)
+
+        # Assert
+        ((signal, objects, _tracking_info),) = self.signals_called_with
+        self.assertEqual(post_create_signal, signal)
+        with self.assertNumQueries(0):
+            instance = objects[0].instance
+            self.assertEqual(
+                (created.pk, "The Sunset Wolf", "2002-01-12", self.author_john.pk),
+                (instance.pk, instance.title, str(instance.publish_date), instance.author_id),
+            )
+        self.assertEqual("The Midnight Wolf", created.title)
+
+    def test_coalesce_should_merge_the_operations_of_each_tracking_info_separately(self):
+        # Arrange
+        import_tracking_info = TrackingInfo(coalesce=True, comment="import")
+        fix_tracking_info = TrackingInfo(coalesce=True, comment="fix")
+
+        # Act
+        with transaction.atomic():
+            Post.objects.filter(pk=self.cold_vice.pk).update(title="Hot Vice", tracking_info_=import_tracking_info)
+            Post.objects.filter(pk=self.cold_vice.pk).update(title="Warm Vice", tracking_info_=fix_tracking_info)
+            Post.objects.filter(pk=self.cold_vice.pk).update(
+                publish_date="2001-07-23", tracking_info_=import_tracking_info
+            )
+
+        # Assert
+        self.assertEqual(
+            [
+                (import_tracking_info, {"title": "Cold Vice", "publish_date": "2001-07-22"}),
+                (fix_tracking_info, {"title": "Hot Vice"}),
+            ],
+            [
+                (info, {key: str(value) for key, value in objects[0].changed_values.items()})
+                for _signal, objects, info in self.signals_called_with
+            ],
+        )
+
+    def test_coalesce_should_merge_the_operations_given_equal_tracking_infos(self):
+        # Act
+        with transaction.atomic():
+            Post.objects.filter(pk=self.cold_vice.pk).update(
+                title="Hot Vice", tracking_info_=TrackingInfo(coalesce=True, comment="import")
+            )
+            Post.objects.filter(pk=self.cold_vice.pk).update(
+                title="Warm Vice", tracking_info_=TrackingInfo(coalesce=True, comment="import")
+            )
+
+        # Assert
+        ((signal, objects, info),) = self.signals_called_with
+        self.assertEqual(post_update_signal, signal)
+        self.assertEqual("import", info.comment)
+        self.assertEqual({"title": "Cold Vice"}, objects[0].changed_values)
+        self.assertEqual("Warm Vice", objects[0].instance.title)
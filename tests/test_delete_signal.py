@@ -3,12 +3,14 @@ from __future__ import annotations
 from datetime import datetime
 from unittest.mock import patch
 
+from django.db import connection
 from django.db.models.signals import pre_delete
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
 from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
 from bulk_tracker.signals import post_delete_signal
-from tests.models import Author, Post
+from tests.models import Author, Comment, Post
 
 
 class TestDeleteSignal(TransactionTestCase):
@@ -368,3 +370,140 @@ class TestDeleteSignal(TransactionTestCase):
         self.assertEqual(self.author_john.last_name, modified_objects[0].instance.last_name)
         self.assertEqual("This is a comment", signal_called_with_author["tracking_info_"].comment)
         self.assertEqual(1, signal_called_with_author["times_called"])
+
+    @patch("bulk_tracker.queries.IN_LIST_THRESHOLD", 1)
+    def test_queryset_delete_should_stage_pks_in_a_temporary_table_when_there_are_many(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_delete_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        def pre_delete_receiver(sender, instance, **kwargs):
+            # having a pre_delete receiver prevents django from using fast deletes
+            pass
+
+        post_delete_signal.connect(post_delete_receiver, sender=Post)
+        pre_delete.connect(pre_delete_receiver, sender=Post)
+        Post.objects.bulk_create(
+            [
+                Post(title="Sound of Winter", publish_date="1998-01-08", author=self.author_john),
+                Post(title="Sound of Summer", publish_date="1998-06-08", author=self.author_john),
+            ]
+        )
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            deleted, _rows_count = Post.objects.all().delete()
+
+        # Assert
+        pre_delete.disconnect(pre_delete_receiver, sender=Post)
+        self.assertEqual(2, deleted)
+        self.assertTrue(any("bulk_tracker_pks_" in query["sql"] for query in queries.captured_queries))
+        self.assertEqual(
+            {"Sound of Winter", "Sound of Summer"}, {o.instance.title for o in signal_called_with["objects"]}
+        )
+        self.assertFalse(Post.objects.exists())
+
+    def test_delete_should_only_snapshot_the_fields_declared_by_the_receivers(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_delete_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_delete_signal.connect(post_delete_receiver, sender=Post, fields=["title", "author"])
+        post = Post.objects.create(title="Sound of Winter", publish_date="1998-01-08", author=self.author_john)
+        post_id = post.id
+
+        # Act
+        post.delete()
+
+        # Assert
+        post_delete_signal.disconnect(post_delete_receiver, sender=Post)
+        deleted: Post = signal_called_with["objects"][0].instance
+        self.assertEqual(
+            {"id": post_id, "title": "Sound of Winter", "author_id": self.author_john.id},
+            {attname: deleted.__dict__[attname] for attname in deleted.__dict__ if attname != "_state"},
+        )
+        self.assertEqual(self.author_john, deleted.author)
+        self.assertIsNone(post.pk)
+
+    def test_fast_delete_should_keep_a_single_statement_when_tracked(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_delete_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_delete_signal.connect(post_delete_receiver, sender=Post)
+
+        for supports_returning in (True, False):
+            with self.subTest(supports_returning=supports_returning):
+                author = Author.objects.create(first_name="Jane", last_name="Doe")
+                Post.objects.create(title="Sound of Winter", publish_date="1998-01-08", author=author)
+                Post.objects.create(title="Sound of Summer", publish_date="1998-06-08", author=author)
+
+                # Act
+                with patch("bulk_tracker.queries.supports_delete_returning", return_value=supports_returning):
+                    with CaptureQueriesContext(connection) as queries:
+                        author.delete()
+
+                # Assert
+                post_queries = [query["sql"] for query in queries.captured_queries if '"tests_post"' in query["sql"]]
+                if supports_returning:
+                    self.assertEqual(1, len(post_queries))
+                    self.assertTrue(post_queries[0].startswith('DELETE FROM "tests_post"'))
+                    self.assertIn("RETURNING", post_queries[0])
+                else:
+                    self.assertEqual(2, len(post_queries))
+                    self.assertTrue(post_queries[0].startswith('SELECT "tests_post"."id", "tests_post"."title"'))
+                    self.assertTrue(post_queries[1].startswith('DELETE FROM "tests_post"'))
+                self.assertEqual(
+                    {"Sound of Winter", "Sound of Summer"}, {o.instance.title for o in signal_called_with["objects"]}
+                )
+                self.assertEqual(
+                    {datetime(1998, 1, 8).date(), datetime(1998, 6, 8).date()},
+                    {o.instance.publish_date for o in signal_called_with["objects"]},
+                )
+
+    def test_delete_with_pks_payload_should_only_send_the_pks(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_delete_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_delete_signal.connect(post_delete_receiver, sender=Post, payload="pks")
+        post = Post.objects.create(title="Sound of Winter", publish_date="1998-01-08", author=self.author_john)
+        post_id = post.id
+
+        # Act
+        Post.objects.filter(pk=post_id).delete()
+
+        # Assert
+        post_delete_signal.disconnect(post_delete_receiver, sender=Post)
+        deleted: Post = signal_called_with["objects"][0].instance
+        self.assertEqual({"id": post_id}, {key: value for key, value in deleted.__dict__.items() if key != "_state"})
+
+    def test_delete_should_set_null_the_foreign_keys_with_set_null(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_delete_receiver(sender, objects: list[ModifiedObject[Author]], **kwargs):
+            signal_called_with.setdefault("objects", []).extend(objects)
+
+        post_delete_signal.connect(post_delete_receiver, sender=Author)
+        author_jane = Author.objects.create(first_name="Jane", last_name="Doe")
+        comment = Comment.objects.create(text="Great", author=self.author_john)
+        other_comment = Comment.objects.create(text="Meh", author=author_jane)
+
+        # Act
+        self.author_john.delete()
+        Author.objects.filter(pk=author_jane.pk).delete()
+
+        # Assert
+        post_delete_signal.disconnect(post_delete_receiver, sender=Author)
+        self.assertEqual(["John", "Jane"], [o.instance.first_name for o in signal_called_with["objects"]])
+        self.assertIsNone(Comment.objects.get(pk=comment.pk).author_id)
+        self.assertIsNone(Comment.objects.get(pk=other_comment.pk).author_id)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import TransactionTestCase
+
+from bulk_tracker.dispatch import (
+    OVERFLOW_DROP,
+    OVERFLOW_INLINE,
+    AsyncioDispatcher,
+    ProcessDispatcher,
+    ProfilingDispatcher,
+    ThreadDispatcher,
+    get_receiver_name,
+)
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.signals import post_update_signal
+from tests.models import Author, Post
+
+
+class TestDispatch(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        self.post = Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+        self.dispatchers = []
+
+    def tearDown(self):
+        for dispatcher in self.dispatchers:
+            dispatcher.shutdown()
+
+    def make(self, dispatcher_class, **options):
+        dispatcher = dispatcher_class(**options)
+        self.dispatchers.append(dispatcher)
+        return dispatcher
+
+    def test_thread_dispatch_should_send_the_signal_in_a_worker_thread(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+            signal_called_with["thread"] = threading.current_thread()
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        dispatcher = self.make(ThreadDispatcher, max_workers=1)
+
+        # Act
+        Post.objects.filter(pk=self.post.pk).update(title="Hot Vice", tracking_info_=TrackingInfo(dispatch=dispatcher))
+        self.assertTrue(dispatcher.drain(timeout=5))
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        self.assertEqual({"title": "Cold Vice"}, signal_called_with["objects"][0].changed_values)
+        self.assertIsNot(threading.current_thread(), signal_called_with["thread"])
+
+    def test_asyncio_dispatch_should_send_the_signal_on_the_event_loop(self):
+        # Arrange
+        signal_called_with = {}
+
+        async def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+            signal_called_with["thread"] = threading.current_thread()
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        dispatcher = self.make(AsyncioDispatcher)
+
+        # Act
+        Post.objects.filter(pk=self.post.pk).update(title="Hot Vice", tracking_info_=TrackingInfo(dispatch=dispatcher))
+        self.assertTrue(dispatcher.drain(timeout=5))
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        self.assertEqual({"title": "Cold Vice"}, signal_called_with["objects"][0].changed_values)
+        self.assertIs(dispatcher.thread, signal_called_with["thread"])
+
+    def test_full_dispatcher_should_drop_or_send_inline_according_to_overflow(self):
+        # Arrange
+        release = threading.Event()
+        threads = []
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            threads.append(threading.current_thread())
+            if threading.current_thread() is not threading.main_thread():
+                release.wait(timeout=5)
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        for overflow in (OVERFLOW_DROP, OVERFLOW_INLINE):
+            with self.subTest(overflow=overflow):
+                release.clear()
+                threads.clear()
+                dispatcher = self.make(ThreadDispatcher, max_workers=1, max_pending=1, overflow=overflow)
+                tracking_info = TrackingInfo(dispatch=dispatcher)
+
+                # Act
+                with patch("bulk_tracker.dispatch.logger") as logger:
+                    Post.objects.filter(pk=self.post.pk).update(title="Hot Vice", tracking_info_=tracking_info)
+                    Post.objects.filter(pk=self.post.pk).update(title="Cold Vice", tracking_info_=tracking_info)
+                release.set()
+                self.assertTrue(dispatcher.drain(timeout=5))
+
+                # Assert
+                if overflow == OVERFLOW_DROP:
+                    self.assertEqual(1, len(threads))
+                    logger.warning.assert_called_once()
+                else:
+                    self.assertEqual(2, len(threads))
+                    self.assertIn(threading.main_thread(), threads)
+
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+
+    def test_process_dispatch_should_send_the_signal_in_a_worker_process(self):
+        # Arrange
+        dispatcher = self.make(ProcessDispatcher, max_workers=1)
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            pass
+
+        # the update is only tracked with a receiver, the worker processes only have the ones connected on startup
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        # Act
+        with patch("bulk_tracker.dispatch.logger") as logger:
+            Post.objects.filter(pk=self.post.pk).update(
+                title="Hot Vice", tracking_info_=TrackingInfo(dispatch=dispatcher, comment="moved")
+            )
+            self.assertTrue(dispatcher.drain(timeout=60))
+
+        # Assert
+        # so only check that the objects, the signal and the TrackingInfo made it there
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        logger.error.assert_not_called()
+
+    def test_unknown_dispatch_should_raise(self):
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            pass
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        with self.assertRaises(ValueError):
+            Post.objects.filter(pk=self.post.pk).update(
+                title="Hot Vice", tracking_info_=TrackingInfo(dispatch="carrier pigeon")
+            )
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+
+    def test_profile_dispatch_should_time_each_receiver_and_report_the_slow_ones(self):
+        # Arrange
+        def fast_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            pass
+
+        def slow_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            time.sleep(0.02)
+
+        post_update_signal.connect(fast_receiver, sender=Post)
+        post_update_signal.connect(slow_receiver, sender=Post)
+        slow_calls = []
+        dispatcher = ProfilingDispatcher(
+            budget=0.01, on_slow=lambda name, duration, *args: slow_calls.append(name), profile=True
+        )
+        tracking_info = TrackingInfo(dispatch=dispatcher)
+
+        # Act
+        Post.objects.filter(pk=self.post.pk).update(title="Hot Vice", tracking_info_=tracking_info)
+        Post.objects.filter(pk=self.post.pk).update(title="Cold Vice", tracking_info_=tracking_info)
+
+        # Assert
+        post_update_signal.disconnect(fast_receiver, sender=Post)
+        post_update_signal.disconnect(slow_receiver, sender=Post)
+        slow_name = get_receiver_name(slow_receiver)
+        fast_name = get_receiver_name(fast_receiver)
+        self.assertEqual([slow_name, slow_name], slow_calls)
+        self.assertEqual(2, dispatcher.histograms[fast_name].count)
+        self.assertEqual(2, dispatcher.histograms[slow_name].count)
+        self.assertGreaterEqual(dispatcher.histograms[slow_name].max, 0.02)
+        # only the second call of the slow receiver is profiled, once it was known to be slow
+        self.assertEqual([slow_name], list(dispatcher.profiles))
+
+    def test_profile_dispatch_should_log_the_slow_receivers_without_callback(self):
+        # Arrange
+        def slow_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            time.sleep(0.02)
+
+        post_update_signal.connect(slow_receiver, sender=Post)
+        dispatcher = ProfilingDispatcher(budget=0.01)
+
+        # Act
+        with self.assertLogs("bulk_tracker.dispatch", level="WARNING") as logs:
+            Post.objects.filter(pk=self.post.pk).update(
+                title="Hot Vice", tracking_info_=TrackingInfo(dispatch=dispatcher)
+            )
+
+        # Assert
+        post_update_signal.disconnect(slow_receiver, sender=Post)
+        self.assertIn(f"{get_receiver_name(slow_receiver)} took", logs.output[0])
+        self.assertIn("over the budget of 0.010s", logs.output[0])
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import socket
+
+from django.test import TransactionTestCase
+
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.instrumentation import (
+    LoggingSink,
+    MemorySink,
+    PrometheusSink,
+    StatsdSink,
+    registry,
+)
+from bulk_tracker.signals import post_delete_signal, post_update_signal
+from tests.models import Author, Post
+
+
+class TestInstrumentation(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        Post.objects.create(title="Defend the Lie", publish_date="1999-05-19", author=self.author_john)
+        Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+        Post.objects.create(title="Untitled", publish_date="2000-09-12", author=self.author_john)
+
+        def receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            pass
+
+        self.receiver = receiver
+        post_update_signal.connect(receiver, sender=Post)
+        post_delete_signal.connect(receiver, sender=Post)
+        self.sink = MemorySink()
+        registry.add_sink(self.sink)
+
+    def tearDown(self):
+        registry.remove_sink(self.sink)
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        post_delete_signal.disconnect(self.receiver, sender=Post)
+
+    def test_update_should_record_its_metrics(self):
+        # Act
+        Post.objects.filter(author=self.author_john).update(title="Untitled")
+
+        # Assert
+        tags = {"model": "tests.Post", "operation": "update"}
+        self.assertEqual(1, self.sink.total("queries", **tags))  # the capture of the old values
+        self.assertEqual(3, self.sink.total("rows_captured", **tags))
+        self.assertEqual(2, self.sink.total("rows_changed", **tags))
+        self.assertEqual(2, self.sink.total("payload_objects", **tags))
+        self.assertEqual(2, self.sink.total("payload_values", **tags))
+        # the dispatch runs after the commit, it isn't tagged with the database of the operation
+        database_tags = {**tags, "database": "default"}
+        for phase, phase_tags in (("capture", database_tags), ("diff", database_tags), ("dispatch", tags)):
+            self.assertEqual(1, self.sink.counts[(f"{phase}_seconds", tuple(sorted(phase_tags.items())))])
+
+    def test_update_with_returning_should_record_its_capture_without_extra_queries(self):
+        # Act
+        Post.objects.filter(author=self.author_john).update(
+            title="Untitled", tracking_info_=TrackingInfo(use_returning=True)
+        )
+
+        # Assert
+        tags = {"model": "tests.Post", "operation": "update", "database": "default"}
+        self.assertEqual(1, self.sink.counts[("capture_seconds", tuple(sorted(tags.items())))])
+        self.assertEqual(0, self.sink.total("queries", model="tests.Post", operation="update"))
+        self.assertEqual(3, self.sink.total("rows_captured", model="tests.Post", operation="update"))
+
+    def test_delete_should_record_its_metrics(self):
+        # Act
+        Post.objects.filter(author=self.author_john).delete()
+
+        # Assert
+        self.assertEqual(3, self.sink.total("rows_changed", model="tests.Post", operation="delete"))
+        self.assertEqual(3, self.sink.total("payload_objects", operation="delete"))
+
+    def test_nothing_should_be_recorded_without_sinks(self):
+        # Arrange
+        registry.remove_sink(self.sink)
+
+        # Act
+        Post.objects.filter(author=self.author_john).update(title="Untitled")
+
+        # Assert
+        registry.add_sink(self.sink)
+        self.assertFalse(self.sink.sums)
+
+    def test_prometheus_sink_should_render_counters_and_summaries(self):
+        sink = PrometheusSink()
+        tags = {"model": "tests.Post", "operation": "update"}
+        sink.record("rows_changed", 2, tags)
+        sink.record("rows_changed", 3, tags)
+        sink.record("dispatch_seconds", 0.5, tags)
+
+        self.assertEqual(
+            "# TYPE bulk_tracker_dispatch_seconds summary\n"
+            'bulk_tracker_dispatch_seconds_sum{model="tests.Post",operation="update"} 0.5\n'
+            'bulk_tracker_dispatch_seconds_count{model="tests.Post",operation="update"} 1\n'
+            "# TYPE bulk_tracker_rows_changed_total counter\n"
+            'bulk_tracker_rows_changed_total{model="tests.Post",operation="update"} 5\n',
+            sink.render(),
+        )
+
+    def test_statsd_sink_should_send_timers_and_counters(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(5)
+        sink = StatsdSink(*server.getsockname())
+        tags = {"model": "tests.Post", "operation": "update"}
+
+        sink.record("rows_changed", 2, tags)
+        sink.record("dispatch_seconds", 0.5, tags)
+
+        self.assertEqual(b"bulk_tracker.rows_changed:2|c|#model:tests.Post,operation:update", server.recv(1024))
+        self.assertEqual(b"bulk_tracker.dispatch:500.000|ms|#model:tests.Post,operation:update", server.recv(1024))
+        server.close()
+
+    def test_logging_sink_should_log_every_value(self):
+        with self.assertLogs("bulk_tracker.metrics", level="DEBUG") as logs:
+            LoggingSink().record("rows_changed", 2, {"model": "tests.Post", "operation": "update"})
+
+        self.assertEqual(["DEBUG:bulk_tracker.metrics:rows_changed=2 model=tests.Post operation=update"], logs.output)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.db import transaction
+from django.db.models.functions import Upper
+from django.test import TransactionTestCase, override_settings
+
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.instrumentation import MemorySink, registry
+from bulk_tracker.signals import (
+    post_create_signal,
+    post_delete_signal,
+    post_update_signal,
+)
+from tests.models import Author, Post
+
+
+class ReplicaRouter:
+    """Reads from the "other" database, as if it was a read replica, and writes to the default one"""
+
+    def db_for_read(self, model, **hints):
+        return "other"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+
+class TestMultiDatabase(TransactionTestCase):
+    databases = {"default", "other"}
+
+    def setUp(self):
+        self.author_john = Author.objects.using("other").create(first_name="John", last_name="Doe")
+        self.cold_vice = Post.objects.using("other").create(
+            title="Cold Vice", publish_date="2001-07-22", author=self.author_john
+        )
+        self.signal_called_with = []
+
+        def receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            self.signal_called_with.append(objects)
+
+        self.receiver = receiver
+
+    def test_update_should_send_the_signal_on_commit_of_its_database(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post)
+
+        # Act
+        with transaction.atomic():
+            with transaction.atomic(using="other"):
+                Post.objects.using("other").filter(pk=self.cold_vice.pk).update(title="Hot Vice")
+                self.assertEqual([], self.signal_called_with)
+            sent_before_default_commit = len(self.signal_called_with)
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        self.assertEqual(1, sent_before_default_commit)
+        self.assertEqual({"title": "Cold Vice"}, self.signal_called_with[0][0].changed_values)
+
+    def test_update_rolled_back_on_its_database_should_not_send_the_signal(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post)
+
+        # Act
+        with transaction.atomic():
+            try:
+                with transaction.atomic(using="other"):
+                    Post.objects.using("other").filter(pk=self.cold_vice.pk).update(title="Hot Vice")
+                    raise ValueError
+            except ValueError:
+                pass
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        self.assertEqual([], self.signal_called_with)
+
+    def test_update_should_read_the_new_values_from_its_database(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post, payload="instances")
+
+        # Act
+        Post.objects.using("other").filter(pk=self.cold_vice.pk).update(title=Upper("title"))
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        modified_object = self.signal_called_with[0][0]
+        self.assertEqual({"title": "Cold Vice"}, modified_object.changed_values)
+        self.assertEqual("COLD VICE", modified_object.instance.title)
+        self.assertEqual("other", modified_object.instance._state.db)
+
+    def test_save_and_delete_should_send_their_signals_on_commit_of_their_database(self):
+        # Arrange
+        post_create_signal.connect(self.receiver, sender=Post)
+        post_delete_signal.connect(self.receiver, sender=Post)
+
+        # Act
+        with transaction.atomic():
+            with transaction.atomic(using="other"):
+                post = Post(title="Sound of Winter", publish_date="2000-09-12", author=self.author_john)
+                post.save(using="other")
+                Post.objects.using("other").filter(pk=self.cold_vice.pk).delete()
+            sent_before_default_commit = len(self.signal_called_with)
+
+        # Assert
+        post_create_signal.disconnect(self.receiver, sender=Post)
+        post_delete_signal.disconnect(self.receiver, sender=Post)
+        self.assertEqual(2, sent_before_default_commit)
+        self.assertEqual(post.pk, self.signal_called_with[0][0].instance.pk)
+        self.assertEqual(self.cold_vice.pk, self.signal_called_with[1][0].instance.pk)
+
+    def test_coalesce_should_buffer_each_database_on_its_own(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post)
+        tracking_info = TrackingInfo(coalesce=True)
+        author_jane = Author.objects.create(first_name="Jane", last_name="Doe")
+        post = Post.objects.create(title="Untitled", publish_date="2000-09-12", author=author_jane)
+
+        # Act
+        with transaction.atomic():
+            Post.objects.filter(pk=post.pk).update(title="Defend the Lie", tracking_info_=tracking_info)
+            with transaction.atomic(using="other"):
+                Post.objects.using("other").filter(pk=self.cold_vice.pk).update(
+                    title="Hot Vice", tracking_info_=tracking_info
+                )
+                Post.objects.using("other").filter(pk=self.cold_vice.pk).update(
+                    title="Warm Vice", tracking_info_=tracking_info
+                )
+            sent_before_default_commit = list(self.signal_called_with)
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        self.assertEqual(1, len(sent_before_default_commit))
+        self.assertEqual({"title": "Cold Vice"}, sent_before_default_commit[0][0].changed_values)
+        self.assertEqual(2, len(self.signal_called_with))
+        self.assertEqual({"title": "Untitled"}, self.signal_called_with[1][0].changed_values)
+
+    def test_metrics_should_be_tagged_with_the_database(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Post)
+        sink = MemorySink()
+        registry.add_sink(sink)
+
+        # Act
+        Post.objects.using("other").filter(pk=self.cold_vice.pk).update(title="Hot Vice")
+
+        # Assert
+        registry.remove_sink(sink)
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        self.assertEqual(1, sink.total("rows_changed", database="other"))
+        self.assertEqual(1, sink.total("queries", database="other"))
+        self.assertEqual(0, sink.total("rows_changed", database="default"))
+
+    @override_settings(DATABASE_ROUTERS=[ReplicaRouter()])
+    def test_update_should_capture_the_rows_from_the_database_written_to(self):
+        # Arrange
+        Author.objects.using("default").create(pk=self.author_john.pk, first_name="John", last_name="Doe")
+        Post.objects.using("default").create(
+            pk=self.cold_vice.pk, title="Primary", publish_date="2001-07-22", author_id=self.author_john.pk
+        )
+        Post.objects.using("other").filter(pk=self.cold_vice.pk).update(title="Stale replica")
+        post_update_signal.connect(self.receiver, sender=Post)
+
+        # Act
+        with mock.patch.object(transaction, "atomic", wraps=transaction.atomic) as atomic:
+            Post.objects.filter(pk=self.cold_vice.pk).update(
+                title="Hot Vice", tracking_info_=TrackingInfo(chunk_size=10)
+            )
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        self.assertEqual({"title": "Primary"}, self.signal_called_with[0][0].changed_values)
+        self.assertEqual("Hot Vice", Post.objects.using("default").get(pk=self.cold_vice.pk).title)
+        self.assertEqual({"default"}, {call.kwargs.get("using") for call in atomic.call_args_list})
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.outbox import (
+    deserialize_tracking_info,
+    drain_outbox,
+    serialize_tracking_info,
+)
+from bulk_tracker.outbox.models import OutboxEvent
+from bulk_tracker.signals import post_create_signal, post_update_signal
+from tests.models import Author, Post
+
+
+class TestOutbox(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        self.cold_vice = Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+
+        self.signals_called_with = []
+
+        def receiver(sender, signal, objects: list[ModifiedObject[Post]], tracking_info_=None, **kwargs):
+            self.signals_called_with.append((signal, objects, tracking_info_, kwargs.get("event_id")))
+
+        self.receiver = receiver
+        for signal in (post_create_signal, post_update_signal):
+            signal.connect(receiver, sender=Post)
+
+    def tearDown(self):
+        for signal in (post_create_signal, post_update_signal):
+            signal.disconnect(self.receiver, sender=Post)
+
+    def test_outbox_should_write_the_events_in_the_transaction_and_drain_should_send_them(self):
+        # Arrange
+        tracking_info = TrackingInfo(dispatch="outbox", comment="moved", user=self.author_john)
+
+        # Act
+        with transaction.atomic():
+            Post.objects.filter(pk=self.cold_vice.pk).update(
+                title="Hot Vice", publish_date="2002-02-02", tracking_info_=tracking_info
+            )
+            Post.objects.bulk_create(
+                [Post(title="Sound of Winter", publish_date="2000-09-12", author=self.author_john)],
+                tracking_info_=tracking_info,
+            )
+        try:
+            with transaction.atomic():
+                Post.objects.filter(pk=self.cold_vice.pk).update(title="Lost Vice", tracking_info_=tracking_info)
+                raise ValueError
+        except ValueError:
+            pass
+
+        # Assert
+        self.assertEqual([], self.signals_called_with)
+        event_ids = list(OutboxEvent.objects.values_list("id", flat=True))
+        self.assertEqual(2, len(event_ids))
+
+        self.assertEqual(2, drain_outbox(batch_size=1))
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(
+            [(post_update_signal, event_ids[0]), (post_create_signal, event_ids[1])],
+            [(signal, event_id) for signal, _objects, _info, event_id in self.signals_called_with],
+        )
+        _signal, (updated,), info, _event_id = self.signals_called_with[0]
+        self.assertEqual(self.cold_vice.pk, updated.instance.pk)
+        self.assertEqual("Hot Vice", updated.instance.title)
+        self.assertEqual(
+            {"title": "Cold Vice", "publish_date": self.cold_vice.publish_date},
+            {key: str(value) if key == "publish_date" else value for key, value in updated.changed_values.items()},
+        )
+        self.assertEqual("moved", info.comment)
+        self.assertEqual(self.author_john.pk, info.user.pk)
+        self.assertEqual("John", info.user.first_name)
+
+        _signal, (created,), _info, _event_id = self.signals_called_with[1]
+        self.assertEqual("Sound of Winter", created.instance.title)
+        self.assertEqual(self.author_john, created.instance.author)
+
+    def test_drain_should_keep_the_events_when_a_receiver_raises(self):
+        # Arrange
+        def failing_receiver(sender, **kwargs):
+            raise RuntimeError
+
+        post_update_signal.connect(failing_receiver, sender=Post)
+        Post.objects.filter(pk=self.cold_vice.pk).update(
+            title="Hot Vice", tracking_info_=TrackingInfo(dispatch="outbox")
+        )
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            drain_outbox()
+
+        # Assert
+        post_update_signal.disconnect(failing_receiver, sender=Post)
+        self.assertEqual(1, OutboxEvent.objects.count())
+        out = StringIO()
+        call_command("drain_outbox", stdout=out)
+        self.assertEqual("Sent 1 events.\n", out.getvalue())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_tracking_info_should_keep_all_its_fields_but_dispatch(self):
+        # Arrange
+        tracking_info = TrackingInfo(
+            user=self.author_john,
+            comment="import",
+            kwargs={"batch": 7},
+            is_robust=True,
+            use_returning=True,
+            chunk_size=500,
+            transaction_per_chunk=True,
+            coalesce=True,
+            dispatch="outbox",
+            use_update_from=True,
+        )
+
+        # Act
+        data = json.loads(json.dumps(serialize_tracking_info(tracking_info)))
+        loaded = deserialize_tracking_info("default", {**data, "removed_since": True})
+
+        # Assert
+        self.assertEqual(self.author_john.pk, loaded.user.pk)
+        loaded.user = self.author_john
+        self.assertEqual(TrackingInfo(**{**tracking_info.__dict__, "dispatch": None}), loaded)
+
+    def test_bulk_tracker_should_not_need_the_outbox_nor_the_changelog_app(self):
+        # Arrange
+        code = (
+            "import django\n"
+            "from django.conf import settings\n"
+            "settings.configure(INSTALLED_APPS=['bulk_tracker'])\n"
+            "django.setup()\n"
+            "from bulk_tracker.models import BulkTrackerModel\n"
+            "from django.apps import apps\n"
+            "print(len(apps.get_models()))\n"
+        )
+
+        # Act
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True
+        )
+
+        # Assert
+        self.assertEqual("", result.stderr)
+        self.assertEqual("0", result.stdout.strip())
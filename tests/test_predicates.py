@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from django.db.models import F, Q
+from django.test import TransactionTestCase
+
+from bulk_tracker.changeset import ChangeSet
+from bulk_tracker.helper_objects import ModifiedObject
+from bulk_tracker.instrumentation import MemorySink, registry
+from bulk_tracker.signals import post_update_signal
+from tests.models import Author, Post, Tag
+
+
+class TestPredicates(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        self.draft = Post.objects.create(title="Draft", publish_date="1999-05-19", author=self.author_john)
+        self.cold_vice = Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+        self.untitled = Post.objects.create(title="Untitled", publish_date="2000-09-12", author=self.author_john)
+        self.published = []
+
+        def receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            self.published.extend(objects)
+
+        self.receiver = receiver
+        post_update_signal.connect(receiver, sender=Post, predicate=Q(old__title="Draft", new__title="Published"))
+
+    def tearDown(self):
+        post_update_signal.disconnect(self.receiver, sender=Post)
+
+    def test_receiver_should_only_get_the_rows_matching_its_predicate(self):
+        # Arrange
+        updated = []
+
+        def receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            updated.extend(objects)
+
+        post_update_signal.connect(receiver, sender=Post)
+
+        # Act
+        Post.objects.filter(author=self.author_john).update(title="Published")
+
+        # Assert
+        post_update_signal.disconnect(receiver, sender=Post)
+        self.assertEqual([self.draft.pk], [modified_object.pk for modified_object in self.published])
+        self.assertEqual({"title": "Draft"}, self.published[0].changed_values)
+        self.assertEqual(3, len(updated))
+
+    def test_only_the_rows_that_may_match_should_be_captured(self):
+        # Arrange
+        sink = MemorySink()
+        registry.add_sink(sink)
+
+        # Act
+        Post.objects.filter(author=self.author_john).update(title="Published")
+
+        # Assert
+        registry.remove_sink(sink)
+        self.assertEqual(1, sink.total("rows_captured", model="tests.Post"))
+        self.assertEqual(3, Post.objects.filter(title="Published").count())
+
+    def test_update_that_cannot_match_should_not_be_tracked(self):
+        # Act
+        with self.assertNumQueries(1):
+            Post.objects.filter(author=self.author_john).update(title="Archived")
+
+        # Assert
+        self.assertEqual([], self.published)
+        self.assertEqual(3, Post.objects.filter(title="Archived").count())
+
+    def test_save_should_only_send_the_matching_changes(self):
+        # Act
+        self.cold_vice.title = "Published"
+        self.cold_vice.save()
+        self.draft.title = "Published"
+        self.draft.save()
+
+        # Assert
+        self.assertEqual([self.draft.pk], [modified_object.pk for modified_object in self.published])
+
+    def test_predicate_on_an_expression_should_be_evaluated_after_the_update(self):
+        # Arrange
+        Tag.objects.create(name="python", usage_count=9)
+        Tag.objects.create(name="django", usage_count=3)
+        crossed = []
+
+        def receiver(sender, objects: list[ModifiedObject[Tag]], changeset: ChangeSet, **kwargs):
+            crossed.extend(objects)
+            self.assertEqual([objects[0].pk], changeset.pks)
+
+        post_update_signal.connect(
+            receiver, sender=Tag, changeset=True, predicate=Q(old__usage_count__lt=10, new__usage_count__gte=10)
+        )
+
+        # Act
+        Tag.objects.update(usage_count=F("usage_count") + 1)
+
+        # Assert
+        post_update_signal.disconnect(receiver, sender=Tag)
+        self.assertEqual(["python"], [modified_object.instance.name for modified_object in crossed])
+
+    def test_disconnecting_the_receiver_should_disconnect_its_predicate(self):
+        # Act
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        Post.objects.filter(pk=self.draft.pk).update(title="Published")
+
+        # Assert
+        self.assertEqual([], self.published)
+        self.assertIsNone(post_update_signal.get_subscription(Post))
+
+    def test_invalid_predicates_should_raise(self):
+        with self.assertRaises(ValueError):
+            post_update_signal.connect(self.receiver, sender=Post, payload="pks", predicate=Q(new__title="Published"))
+        with self.assertRaises(ValueError):
+            post_update_signal.connect(self.receiver, sender=Post, predicate=Q(title="Published"))
+        with self.assertRaises(TypeError):
+            post_update_signal.connect(self.receiver, sender=Post, predicate={"new__title": "Published"})
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from django.test import TransactionTestCase
+
+from bulk_tracker.helper_objects import ModifiedObject
+from bulk_tracker.signals import post_update_signal
+from tests.models import Author, Post, Profile, TrackedModel
+
+
+class TestFieldTracker(TransactionTestCase):
+    def setUp(self):
+        self.author_john = Author.objects.create(first_name="John", last_name="Doe")
+        self.author_jane = Author.objects.create(first_name="Jane", last_name="Doe")
+        self.cold_vice = Post.objects.create(title="Cold Vice", publish_date="2001-07-22", author=self.author_john)
+
+        def receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            pass
+
+        self.receiver = receiver
+        post_update_signal.connect(receiver, sender=Post)
+
+    def tearDown(self):
+        post_update_signal.disconnect(self.receiver, sender=Post)
+
+    def test_loading_an_instance_should_not_store_anything(self):
+        post = Post.objects.get(pk=self.cold_vice.pk)
+
+        self.assertNotIn("_bulk_tracker_saved", post.__dict__)
+        self.assertEqual({}, post.tracker.changed())
+
+    def test_changed_should_return_the_saved_values_of_the_assigned_fields(self):
+        # Arrange
+        post = Post.objects.get(pk=self.cold_vice.pk)
+
+        # Act
+        post.title = "Hot Vice"
+        post.title = "Warm Vice"
+        post.author = self.author_jane
+        post.publish_date = post.publish_date  # assigned without changing
+
+        # Assert
+        self.assertEqual({"title": "Cold Vice", "author_id": self.author_john.pk}, post.tracker.changed())
+        self.assertTrue(post.tracker.has_changed("author"))
+        self.assertFalse(post.tracker.has_changed("publish_date"))
+        self.assertEqual("Cold Vice", post.tracker.previous("title"))
+
+    def test_should_only_track_the_fields_the_receivers_need(self):
+        # Arrange
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        post_update_signal.connect(self.receiver, sender=Post, fields=["title"])
+        post = Post.objects.get(pk=self.cold_vice.pk)
+
+        # Act
+        post.title = "Hot Vice"
+        post.author = self.author_jane
+
+        # Assert
+        self.assertEqual({"title": "Cold Vice"}, post.tracker.changed())
+
+    def test_should_not_track_anything_without_receivers(self):
+        # Arrange
+        post_update_signal.disconnect(self.receiver, sender=Post)
+        post = Post.objects.get(pk=self.cold_vice.pk)
+
+        # Act
+        post.title = "Hot Vice"
+
+        # Assert
+        self.assertNotIn("_bulk_tracker_saved", post.__dict__)
+
+    def test_save_and_refresh_from_db_should_reset_the_saved_values(self):
+        # Arrange
+        post = Post.objects.get(pk=self.cold_vice.pk)
+        post.title = "Hot Vice"
+        post.author = self.author_jane
+
+        # Act
+        post.save(update_fields=["title"])
+
+        # Assert
+        self.assertEqual({"author_id": self.author_john.pk}, post.tracker.changed())
+        post.refresh_from_db()
+        self.assertEqual({}, post.tracker.changed())
+        self.assertEqual(self.author_john.pk, post.author_id)
+
+    def test_assigning_a_deferred_field_should_read_its_saved_value_from_the_database(self):
+        # Arrange
+        post = Post.objects.only("pk").get(pk=self.cold_vice.pk)
+
+        # Act
+        post.title = "Hot Vice"
+
+        # Assert
+        with self.assertNumQueries(1):
+            self.assertEqual({"title": "Cold Vice"}, post.tracker.changed())
+
+    def test_loading_a_deferred_field_should_not_be_seen_as_a_change(self):
+        post = Post.objects.only("pk").get(pk=self.cold_vice.pk)
+
+        self.assertEqual("Cold Vice", post.title)
+        self.assertEqual({}, post.tracker.changed())
+
+    def test_tracker_declared_on_an_abstract_model_should_track_its_subclasses(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Profile)
+        profile = Profile.objects.create(name="John", settings={"theme": "dark"})
+
+        # Act
+        profile.name = "Jane"
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Profile)
+        self.assertIsNot(TrackedModel.tracker, Profile.tracker)
+        self.assertEqual(Profile, Profile.tracker.model)
+        self.assertEqual({"name": "John"}, profile.tracker.changed())
+
+    def test_assigning_a_mutable_field_should_keep_a_copy_of_its_saved_value(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Profile)
+        settings = {"theme": "dark"}
+        profile = Profile.objects.create(name="John", settings=settings)
+
+        # Act
+        profile.settings = {"theme": "blue"}
+        settings["theme"] = "light"
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Profile)
+        self.assertEqual({"settings": {"theme": "dark"}}, profile.tracker.changed())
+
+    def test_mutating_a_mutable_field_should_read_its_saved_value_from_the_database(self):
+        # Arrange
+        post_update_signal.connect(self.receiver, sender=Profile)
+        profile = Profile.objects.get(pk=Profile.objects.create(name="John", settings={"theme": "dark"}).pk)
+
+        # Act
+        with patch("bulk_tracker.tracker.deepcopy") as mocked_deepcopy:
+            profile.settings["theme"] = "light"
+
+        # Assert
+        post_update_signal.disconnect(self.receiver, sender=Profile)
+        mocked_deepcopy.assert_not_called()
+        with self.assertNumQueries(1):
+            self.assertEqual({"settings": {"theme": "dark"}}, profile.tracker.changed())
+
+    def test_tracked_fields_should_be_resolved_once_until_a_receiver_changes(self):
+        # Arrange
+        posts = list(Post.objects.all())
+        Post.tracker.get_tracked(Post)
+
+        # Act
+        with patch.object(post_update_signal, "get_subscription", wraps=post_update_signal.get_subscription) as mocked:
+            for post in posts:
+                post.title = "Hot Vice"
+            post_update_signal.connect(self.receiver, sender=Post, fields=["author"])
+            tracked = Post.tracker.get_tracked(Post)
+
+        # Assert
+        mocked.assert_called_once_with(Post)
+        self.assertEqual({"author_id"}, tracked)
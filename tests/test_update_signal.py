@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import pickle
 from datetime import datetime
+from decimal import Decimal
 from unittest.mock import patch
 
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Concat
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
 from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.queries import get_max_query_params, staged_pks
 from bulk_tracker.signals import post_update_signal
-from tests.models import Author, Post
+from bulk_tracker.tracker import FieldInstanceTracker
+from tests.models import Author, Post, Product, Tag
 
 
 class TestUpdateSignal(TransactionTestCase):
@@ -113,6 +121,90 @@ class TestUpdateSignal(TransactionTestCase):
         self.assertEqual("Sound of Summer", modified_objects[0].instance.title)
         self.assertEqual("Sound of Winter", modified_objects[0].changed_values["title"])
 
+    def test_model_save_with_update_fields_should_only_send_these_fields(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        post = Post.objects.get(title="Sound of Winter")
+        post.title = "Sound of Summer"
+        post.author = self.author_soha
+
+        # Act
+        post.save(update_fields=["title"])
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        self.assertEqual({"title": "Sound of Winter"}, signal_called_with["objects"][0].changed_values)
+        self.assertEqual(self.author_john.pk, Post.objects.get(pk=post.pk).author_id)
+
+    def test_model_save_should_skip_the_update_if_none_of_the_update_fields_changed(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        post = Post.objects.get(title="Sound of Winter")
+        post.title = "Sound of Winter"
+
+        # Act
+        with self.assertNumQueries(0):
+            post.save(update_fields=["title"])
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        self.assertEqual({}, signal_called_with)
+
+    def test_model_save_should_not_skip_the_update_of_fields_the_receivers_did_not_declare(self):
+        # Arrange
+        def post_update_receiver(sender, objects: list[ModifiedObject[Tag]], **kwargs):
+            pass
+
+        post_update_signal.connect(post_update_receiver, sender=Tag, fields=["name"])
+        tag = Tag.objects.create(name="python", usage_count=1)
+        tag.usage_count = 2
+
+        # Act
+        tag.save(update_fields=["usage_count"])
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Tag)
+        self.assertEqual(2, Tag.objects.get(pk=tag.pk).usage_count)
+
+    def test_model_save_should_not_skip_the_update_of_fields_assigned_before_they_were_tracked(self):
+        # Arrange
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            pass
+
+        post = Post.objects.get(title="Sound of Winter")
+        post.title = "Sound of Summer"
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        # Act
+        post.save(update_fields=["title"])
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        self.assertEqual("Sound of Summer", Post.objects.get(pk=post.pk).title)
+
+    def test_model_save_should_not_read_the_tracker_without_receivers(self):
+        # Arrange
+        post = Post.objects.get(title="Sound of Winter")
+        post.title = "Sound of Summer"
+
+        # Act
+        with patch.object(FieldInstanceTracker, "changed") as changed:
+            post.save()
+
+        # Assert
+        changed.assert_not_called()
+        self.assertEqual("Sound of Summer", Post.objects.get(pk=post.pk).title)
+
     def test_queryset_update_should_emit_post_update_signal(self):
         # Arrange
         signal_called_with = {}
@@ -175,11 +267,492 @@ class TestUpdateSignal(TransactionTestCase):
     @patch("bulk_tracker.signals.post_update_signal.send_robust")
     def test_should_use_robust_send_if_is_robust_is_true_in_tracking_info(self, mocked_signal_robust, mocked_signal):
         # Arrange
+        def post_update_receiver(sender, **kwargs):
+            pass
+
+        # the fields are only tracked while the signal has receivers
+        post_update_signal.connect(post_update_receiver, sender=Author)
         self.author_john.first_name = "Johny"
 
         # Act
         self.author_john.save(tracking_info_=TrackingInfo(is_robust=True))
 
         # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Author)
         mocked_signal.assert_not_called()
         mocked_signal_robust.assert_called_once()
+
+    def test_queryset_update_with_returning_should_emit_post_update_signal_in_a_single_query(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(
+            sender,
+            objects: list[ModifiedObject[Post]],
+            tracking_info_: TrackingInfo | None = None,
+            **kwargs,
+        ):
+            signal_called_with["objects"] = objects
+            signal_called_with["tracking_info_"] = tracking_info_
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        tracking_info = TrackingInfo(use_returning=True)
+
+        # Act
+        with self.assertNumQueries(1):
+            count = Post.objects.filter(title="The Midnight Wolf").update(
+                title="The Sunset Wolf", author=self.author_john, tracking_info_=tracking_info
+            )
+
+        # Assert
+        self.assertEqual(1, count)
+        self.assertEqual(1, len(signal_called_with["objects"]))
+        self.assertIs(tracking_info, signal_called_with["tracking_info_"])
+
+        modified_objects: list[ModifiedObject[Post]] = signal_called_with["objects"]
+        self.assertEqual("The Sunset Wolf", modified_objects[0].instance.title)
+        self.assertEqual(self.author_john.pk, modified_objects[0].instance.author_id)
+        self.assertEqual(
+            {"title": "The Midnight Wolf", "author_id": self.author_soha.pk}, modified_objects[0].changed_values
+        )
+        self.assertEqual("The Sunset Wolf", Post.objects.get(pk=modified_objects[0].instance.pk).title)
+
+    def test_queryset_update_with_returning_should_support_expressions(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        # Act
+        Post.objects.filter(author=self.author_soha).update(
+            title=Concat(F("title"), Value("!")), tracking_info_=TrackingInfo(use_returning=True)
+        )
+
+        # Assert
+        modified_objects = sorted(signal_called_with["objects"], key=lambda o: o.instance.pk)
+        self.assertEqual(["Prince's Advent!", "The Midnight Wolf!"], [o.instance.title for o in modified_objects])
+        self.assertEqual(
+            ["Prince's Advent", "The Midnight Wolf"], [o.changed_values["title"] for o in modified_objects]
+        )
+
+    def test_queryset_update_should_only_select_updated_fields_to_capture_old_values(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.filter(author=self.author_john).order_by("title").update(title="Untitled")
+
+        # Assert
+        capture_sql = queries.captured_queries[0]["sql"]
+        self.assertIn('"tests_post"."title"', capture_sql)
+        self.assertNotIn("publish_date", capture_sql)
+        self.assertNotIn("ORDER BY", capture_sql)
+        self.assertEqual(3, len(signal_called_with["objects"]))
+        self.assertEqual(
+            {"Defend the Lie", "Cold Vice", "Sound of Winter"},
+            {o.changed_values["title"] for o in signal_called_with["objects"]},
+        )
+
+    def test_queryset_update_in_chunks_should_emit_one_post_update_signal_per_chunk(self):
+        # Arrange
+        signals_objects = []
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signals_objects.append(objects)
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        Post.objects.filter(title="Cold Vice").update(publish_date="2000-01-01")
+
+        for tracking_info in (
+            TrackingInfo(chunk_size=2),
+            TrackingInfo(chunk_size=2, transaction_per_chunk=True),
+            TrackingInfo(chunk_size=2, use_returning=True),
+        ):
+            with self.subTest(tracking_info=tracking_info):
+                signals_objects.clear()
+                Post.objects.update(publish_date="1999-05-19")
+                signals_objects.clear()
+
+                # Act
+                # the updated value is part of the filter, the chunks must still cover every row only once
+                count = Post.objects.filter(publish_date="1999-05-19").update(
+                    publish_date="2010-10-10", tracking_info_=tracking_info
+                )
+
+                # Assert
+                self.assertEqual(5, count)
+                self.assertEqual([2, 2, 1], [len(objects) for objects in signals_objects])
+                pks = [o.instance.pk for objects in signals_objects for o in objects]
+                self.assertEqual(sorted(Post.objects.values_list("pk", flat=True)), sorted(pks))
+                self.assertFalse(Post.objects.exclude(publish_date="2010-10-10").exists())
+
+    def test_queryset_update_in_chunks_should_reject_non_positive_chunk_size(self):
+        post_update_signal.connect(lambda sender, **kwargs: None, sender=Post, weak=False, dispatch_uid="noop")
+
+        with self.assertRaises(ValueError):
+            Post.objects.update(title="Untitled", tracking_info_=TrackingInfo(chunk_size=0))
+
+        post_update_signal.disconnect(sender=Post, dispatch_uid="noop")
+
+    @patch("bulk_tracker.queries.IN_LIST_THRESHOLD", 1)
+    def test_queryset_update_should_stage_pks_in_a_temporary_table_when_there_are_many(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.filter(author=self.author_john).update(title=Concat(F("title"), Value("!")))
+
+        # Assert
+        inserts = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(1, len(inserts))  # a single INSERT of the 3 pks
+        self.assertIn("bulk_tracker_pks_", inserts[0])
+        self.assertEqual(
+            {"Defend the Lie!", "Cold Vice!", "Sound of Winter!"},
+            {o.instance.title for o in signal_called_with["objects"]},
+        )
+
+    def test_queryset_update_with_literal_values_should_not_refetch_the_updated_rows(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        # Act
+        # 1 query to capture the old values and 1 for the update
+        with self.assertNumQueries(2):
+            Post.objects.filter(publish_date="1999-05-19").update(publish_date="2000-01-01", author=self.author_john)
+
+        # Assert
+        modified_objects = sorted(signal_called_with["objects"], key=lambda o: o.instance.pk)
+        self.assertEqual(["Defend the Lie", "Prince's Advent"], [o.instance.title for o in modified_objects])
+        self.assertEqual(
+            [datetime.strptime("2000-01-01", "%Y-%m-%d").date()] * 2,
+            [o.instance.publish_date for o in modified_objects],
+        )
+        self.assertEqual(
+            {"publish_date": datetime.strptime("1999-05-19", "%Y-%m-%d").date()}, modified_objects[0].changed_values
+        )
+        self.assertEqual(
+            {"publish_date": datetime.strptime("1999-05-19", "%Y-%m-%d").date(), "author_id": self.author_soha.pk},
+            modified_objects[1].changed_values,
+        )
+
+    def test_queryset_update_should_send_the_decimals_as_they_are_stored(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Product]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Product)
+        product = Product.objects.create(name="Lamp", price=Decimal("10.00"))
+
+        for price, stored_price in ((Decimal("1.234"), Decimal("1.23")), (Decimal("2.5"), Decimal("2.50"))):
+            with self.subTest(price=price):
+                # Act
+                Product.objects.filter(pk=product.pk).update(price=price)
+
+                # Assert
+                instance = signal_called_with["objects"][0].instance
+                self.assertEqual(str(stored_price), str(instance.price))
+                self.assertEqual(str(Product.objects.get(pk=product.pk).price), str(instance.price))
+
+        post_update_signal.disconnect(post_update_receiver, sender=Product)
+
+    def test_queryset_update_should_not_track_fields_the_receivers_did_not_declare(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post, fields=["title"])
+
+        # Act
+        with self.assertNumQueries(1):
+            Post.objects.filter(publish_date="1999-05-19").update(publish_date="2000-01-01")
+        Post.objects.filter(publish_date="2000-01-01").update(title="Untitled", publish_date="2000-02-02")
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        modified_objects = signal_called_with["objects"]
+        self.assertEqual(2, len(modified_objects))
+        self.assertEqual({"Defend the Lie", "Prince's Advent"}, {o.changed_values["title"] for o in modified_objects})
+        self.assertTrue(all(o.changed_values.keys() == {"title"} for o in modified_objects))
+
+    def test_queryset_update_with_pks_payload_should_only_send_the_pks(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post, payload="pks")
+        pks = set(Post.objects.filter(author=self.author_john).values_list("pk", flat=True))
+
+        # Act
+        # rows whose value doesn't change are sent too, since nothing is diffed
+        Post.objects.filter(author=self.author_john).update(title=F("title"))
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        self.assertEqual(pks, {o.instance.pk for o in signal_called_with["objects"]})
+        for modified_object in signal_called_with["objects"]:
+            self.assertEqual({}, modified_object.changed_values)
+            self.assertEqual({"title", "publish_date", "author_id"}, modified_object.instance.get_deferred_fields())
+
+    def test_queryset_update_with_instances_payload_should_send_full_instances(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post, payload="instances")
+
+        for use_returning in (False, True):
+            with self.subTest(use_returning=use_returning):
+                # Act
+                Post.objects.filter(title="Cold Vice").update(
+                    publish_date="2005-05-05", tracking_info_=TrackingInfo(use_returning=use_returning)
+                )
+
+                # Assert
+                (modified_object,) = signal_called_with.pop("objects")
+                self.assertEqual(
+                    {"publish_date": datetime.strptime("2001-07-22", "%Y-%m-%d").date()},
+                    modified_object.changed_values,
+                )
+                instance = modified_object.instance
+                self.assertEqual(set(), instance.get_deferred_fields())
+                self.assertEqual(
+                    ("Cold Vice", datetime.strptime("2005-05-05", "%Y-%m-%d").date(), self.author_john.pk),
+                    (instance.title, instance.publish_date, instance.author_id),
+                )
+                Post.objects.filter(title="Cold Vice").update(publish_date="2001-07-22")
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+
+    def test_connect_should_reject_unknown_payloads(self):
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            pass
+
+        with self.assertRaises(ValueError):
+            post_update_signal.connect(post_update_receiver, sender=Post, payload="everything")
+        self.assertFalse(post_update_signal.has_listeners(sender=Post))
+
+    def test_queryset_update_should_only_build_the_instances_when_they_are_accessed(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+
+        # Act
+        Post.objects.filter(author=self.author_john).update(title=Concat(F("title"), Value("!")))
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        modified_objects = sorted(signal_called_with["objects"], key=lambda o: o.pk)
+        self.assertEqual(
+            ["Defend the Lie", "Cold Vice", "Sound of Winter"], [o.changed_values["title"] for o in modified_objects]
+        )
+        self.assertFalse(any(o.is_loaded for o in modified_objects))
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                ["Defend the Lie!", "Cold Vice!", "Sound of Winter!"], [o.instance.title for o in modified_objects]
+            )
+        self.assertEqual([o.pk for o in modified_objects], [o.instance.pk for o in modified_objects])
+
+    def test_queryset_update_with_instances_payload_should_load_all_the_instances_in_one_query(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post, payload="instances")
+
+        # Act
+        Post.objects.filter(author=self.author_john).update(publish_date="2010-10-10")
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        modified_objects = signal_called_with["objects"]
+        self.assertEqual(3, len(modified_objects))
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                {"Defend the Lie", "Cold Vice", "Sound of Winter"}, {o.instance.title for o in modified_objects}
+            )
+
+    def test_modified_object_should_keep_its_dataclass_behaviour(self):
+        post = Post.objects.get(title="Cold Vice")
+
+        modified_object = ModifiedObject(post, {"title": "Hot Vice"})
+
+        self.assertEqual(ModifiedObject(instance=post, changed_values={"title": "Hot Vice"}), modified_object)
+        self.assertEqual(post.pk, modified_object.pk)
+        self.assertEqual(modified_object, pickle.loads(pickle.dumps(modified_object)))
+        self.assertFalse(hasattr(modified_object, "__dict__"))
+        with self.assertRaises(TypeError):
+            ModifiedObject()
+
+    def test_bulk_update_should_prefetch_once_and_only_write_the_changed_rows(self):
+        # Arrange
+        signals_called_with = []
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signals_called_with.append(objects)
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        posts = list(Post.objects.filter(author=self.author_john).order_by("title"))  # Cold, Defend, Sound
+        posts[0].title = "Hot Vice"
+        posts[2].publish_date = "2000-12-21"
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.bulk_update(posts, fields=["title", "publish_date"], batch_size=1)
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        statements = [
+            query["sql"] for query in queries.captured_queries if query["sql"].startswith(("SELECT", "UPDATE"))
+        ]
+        self.assertEqual(["SELECT", "UPDATE", "UPDATE"], [sql.split(" ")[0] for sql in statements])
+        self.assertNotIn("publish_date", statements[1])  # only the title of Cold Vice changed
+        self.assertNotIn('"title"', statements[2])
+        self.assertEqual(1, len(signals_called_with))
+        objects = {o.pk: o for o in signals_called_with[0]}
+        self.assertEqual({posts[0].pk, posts[2].pk}, set(objects))
+        self.assertEqual({"title": "Cold Vice"}, objects[posts[0].pk].changed_values)
+        self.assertEqual(
+            {"publish_date": datetime.strptime("2000-09-12", "%Y-%m-%d").date()},
+            objects[posts[2].pk].changed_values,
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual("Hot Vice", objects[posts[0].pk].instance.title)
+        self.assertEqual(
+            {("Hot Vice", "2001-07-22"), ("Defend the Lie", "1999-05-19"), ("Sound of Winter", "2000-12-21")},
+            {(p.title, str(p.publish_date)) for p in Post.objects.filter(author=self.author_john)},
+        )
+
+    def test_bulk_update_with_expressions_should_fall_back_to_tracked_updates(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        post = Post.objects.get(title="Cold Vice")
+        post.title = Concat(F("title"), Value("!"))
+
+        # Act
+        Post.objects.bulk_update([post], fields=["title"])
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        self.assertEqual({"title": "Cold Vice"}, signal_called_with["objects"][0].changed_values)
+        self.assertEqual("Cold Vice!", signal_called_with["objects"][0].instance.title)
+
+    def test_bulk_update_from_values_should_update_the_changed_rows_in_one_statement(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        posts = list(Post.objects.filter(author=self.author_john).order_by("title"))  # Cold, Defend, Sound
+        posts[0].title = "Hot Vice"
+        posts[2].author = self.author_soha
+        posts[2].publish_date = "2000-12-21"
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.bulk_update(
+                posts, fields=["title", "author", "publish_date"], tracking_info_=TrackingInfo(use_update_from=True)
+            )
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(1, len(updates))
+        self.assertIn("FROM (VALUES", updates[0])
+        self.assertEqual(
+            {
+                ("Hot Vice", self.author_john.pk, "2001-07-22"),
+                ("Defend the Lie", self.author_john.pk, "1999-05-19"),
+                ("Sound of Winter", self.author_soha.pk, "2000-12-21"),
+            },
+            {(p.title, p.author_id, str(p.publish_date)) for p in Post.objects.filter(pk__in=[p.pk for p in posts])},
+        )
+        objects = {o.pk: o for o in signal_called_with["objects"]}
+        self.assertEqual({"title": "Cold Vice"}, objects[posts[0].pk].changed_values)
+        self.assertEqual(
+            {"author_id": self.author_john.pk, "publish_date": datetime.strptime("2000-09-12", "%Y-%m-%d").date()},
+            objects[posts[2].pk].changed_values,
+        )
+
+    def test_bulk_update_from_values_batches_should_fit_the_query_parameter_limit_of_the_database(self):
+        # Arrange
+        signal_called_with = {}
+
+        def post_update_receiver(sender, objects: list[ModifiedObject[Post]], **kwargs):
+            signal_called_with["objects"] = objects
+
+        post_update_signal.connect(post_update_receiver, sender=Post)
+        posts = list(Post.objects.order_by("pk"))
+        for post in posts:
+            post.title += "!"
+
+        # Act
+        with patch.object(connection.features, "max_query_params", 8):
+            with CaptureQueriesContext(connection) as queries:
+                Post.objects.bulk_update(posts, fields=["title"], tracking_info_=TrackingInfo(use_update_from=True))
+
+        # Assert
+        post_update_signal.disconnect(post_update_receiver, sender=Post)
+        updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(2, len(updates))  # 4 rows of a pk and a title per batch
+        self.assertTrue(all(post.title.endswith("!") for post in Post.objects.all()))
+        self.assertEqual(5, len(signal_called_with["objects"]))
+        with patch.object(connection.features, "max_query_params", None), patch.object(
+            connection, "vendor", "postgresql"
+        ):
+            self.assertEqual(65535, get_max_query_params(connection))
+
+    @patch("bulk_tracker.queries.IN_LIST_THRESHOLD", 1)
+    def test_staged_pks_should_drop_the_temporary_table_when_the_operation_fails(self):
+        # Arrange
+        pks = list(Post.objects.values_list("pk", flat=True))
+
+        # Act
+        with self.assertRaises(ValueError):
+            with staged_pks("default", Post, pks) as lookups:
+                self.assertEqual(len(pks), Post.objects.filter(pk__in=lookups[0]).count())
+                raise ValueError
+
+        # Assert
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_temp_master WHERE name LIKE 'bulk_tracker_pks_%%'")
+            self.assertEqual([], cursor.fetchall())
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from bulk_tracker.helper_objects import ModifiedObject, TrackingInfo
+from bulk_tracker.signals import post_create_signal, post_update_signal
+from tests.models import Tag
+
+
+class TestUpsert(TransactionTestCase):
+    def setUp(self):
+        self.django = Tag.objects.create(name="django", usage_count=3)
+        self.python = Tag.objects.create(name="python", usage_count=5)
+        self.signals_called_with = {}
+
+        def receiver(
+            sender, signal, objects: list[ModifiedObject[Tag]], tracking_info_: TrackingInfo | None = None, **kwargs
+        ):
+            self.signals_called_with[signal] = objects
+
+        self.receiver = receiver
+        post_create_signal.connect(receiver, sender=Tag)
+        post_update_signal.connect(receiver, sender=Tag)
+
+    def tearDown(self):
+        post_create_signal.disconnect(self.receiver, sender=Tag)
+        post_update_signal.disconnect(self.receiver, sender=Tag)
+
+    def test_update_conflicts_should_send_the_inserted_and_the_updated_objects_apart(self):
+        # Arrange
+        tags = [Tag(name="django", usage_count=4), Tag(name="orm", usage_count=1), Tag(name="python", usage_count=5)]
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            Tag.objects.bulk_create(tags, update_conflicts=True, update_fields=["usage_count"], unique_fields=["name"])
+
+        # Assert
+        selects = [query for query in queries.captured_queries if query["sql"].startswith("SELECT")]
+        self.assertEqual(1, len(selects))
+        created = self.signals_called_with[post_create_signal]
+        self.assertEqual(["orm"], [o.instance.name for o in created])
+        self.assertEqual(Tag.objects.get(name="orm").pk, created[0].pk)
+        updated = self.signals_called_with[post_update_signal]
+        self.assertEqual(1, len(updated))  # python kept its count
+        self.assertEqual(self.django.pk, updated[0].pk)
+        self.assertEqual({"usage_count": 3}, updated[0].changed_values)
+        self.assertEqual(4, updated[0].instance.usage_count)
+
+    def test_ignore_conflicts_should_only_send_the_inserted_objects(self):
+        # Arrange
+        tags = [Tag(name="django", usage_count=4), Tag(name="orm", usage_count=1)]
+
+        # Act
+        Tag.objects.bulk_create(tags, ignore_conflicts=True)
+
+        # Assert
+        created = self.signals_called_with[post_create_signal]
+        self.assertEqual(["orm"], [o.instance.name for o in created])
+        self.assertEqual(Tag.objects.get(name="orm").pk, created[0].pk)
+        self.assertNotIn(post_update_signal, self.signals_called_with)
+        self.assertEqual(3, Tag.objects.get(name="django").usage_count)